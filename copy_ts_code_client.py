@@ -0,0 +1,6 @@
+# Holt ein Bundle vom laufenden Collector-Daemon (starten mit: python copy_ts_code.py serve).
+# Weitere Optionen: python copy_ts_code_client.py --help
+from ts_collector.client import main
+
+if __name__ == "__main__":
+    main()
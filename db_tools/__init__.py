@@ -0,0 +1,45 @@
+"""
+Werkzeuge für das Datenbank-Setup (setup_rbac.py, migrate.py, seed_rbac.py).
+
+Die Untermodule werden erst beim ersten Zugriff auf einen der Namen unten
+geladen; requests bzw. psycopg braucht nur, wer das jeweilige Backend nutzt.
+"""
+import importlib
+
+# Öffentlicher Name -> Untermodul, das ihn definiert
+_EXPORTS = {
+    "BatchResult": "executor",
+    "Column": "schema",
+    "ForeignKey": "schema",
+    "MigrationError": "migrations",
+    "PostgresExecutor": "pg",
+    "RpcExecutor": "executor",
+    "SeedError": "seed",
+    "SqlError": "executor",
+    "SqlExecutor": "executor",
+    "Step": "executor",
+    "TableSpec": "schema",
+    "catalog_query": "schema",
+    "diff_schema": "schema",
+    "load_migrations": "migrations",
+    "load_seed_files": "seed",
+    "make_rerunnable": "migrations",
+    "open_executor": "executor",
+    "run_migrations": "migrations",
+    "seed": "seed",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,255 @@
+"""
+Ausführung von SQL mit austauschbarem Backend.
+
+- rpc (RpcExecutor): über die RPC-Funktion execute_sql von Supabase. Alle
+  Aufrufe laufen über eine requests.Session mit Connection-Pool, sodass
+  TCP- und TLS-Verbindung zwischen den Aufrufen bestehen bleiben (Keep-Alive).
+- postgres (pg.PostgresExecutor): direkt über das Postgres-Protokoll, z.B.
+  gegen die lokale Datenbank aus docker-compose.yml.
+
+Mehrere Schritte (z.B. DDL und Seed-Daten) werden zu einem Batch
+zusammengefasst und in einem einzigen Aufruf geschickt. Beide Backends
+führen jeden Aufruf in einer eigenen Transaktion aus (PostgREST pro
+RPC-Aufruf): Schlägt eine Anweisung fehl, wird der ganze Batch
+zurückgerollt und das Schema bleibt nicht halb angelegt. Bei mehreren
+Batches (batch_size) gilt das pro Batch; bereits abgeschlossene Batches
+bleiben bestehen.
+
+requests bzw. psycopg werden erst beim Erzeugen des jeweiligen Backends
+importiert; für das andere Backend muss das Paket nicht installiert sein.
+"""
+import time
+from dataclasses import dataclass, field
+
+BACKENDS = ("rpc", "postgres")
+RPC_PATH = "/rest/v1/rpc/execute_sql"
+DEFAULT_TIMEOUT = 30
+POOL_SIZE = 4
+# Nur Verbindungsfehler wiederholen: Die Anfrage hat den Server dann nicht erreicht
+CONNECT_RETRIES = 2
+
+
+class SqlError(Exception):
+    """Fehler beim Ausführen eines Batches; labels nennt die enthaltenen Schritte."""
+
+    def __init__(self, message, labels=(), status=None):
+        super().__init__(message)
+        self.labels = tuple(labels)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class Step:
+    """
+    Ein Schritt des Setups.
+
+    Attributes:
+        label (str): Kurzbeschreibung für Fortschritt und Fehlermeldungen.
+        sql (str): Eine oder mehrere Anweisungen.
+    """
+    label: str
+    sql: str
+
+
+@dataclass
+class BatchResult:
+    """
+    Ergebnis eines Batches.
+
+    Attributes:
+        index (int): Nummer des Batches (ab 1).
+        count (int): Anzahl der Batches insgesamt.
+        labels (list): Die Schritte des Batches.
+        seconds (float): Dauer des Round-Trips.
+        result: Antwort von execute_sql (Ergebnis der letzten Anweisung).
+    """
+    index: int
+    count: int
+    labels: list = field(default_factory=list)
+    seconds: float = 0.0
+    result: object = None
+
+
+def sql_literal(value):
+    """SQL-Literal für Text (None wird NULL)."""
+    if value is None:
+        return "NULL"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def join_statements(steps):
+    """
+    Fügt die SQL der Schritte zu einem Skript zusammen (jeweils mit
+    abschließendem Semikolon, bei mehreren Schritten mit dem Label als
+    Kommentar davor). Ein einzelner Schritt wird unverändert geschickt.
+    """
+    if len(steps) == 1:
+        return steps[0].sql
+    parts = []
+    for step in steps:
+        sql = step.sql.strip()
+        if sql and not sql.endswith(";"):
+            sql += ";"
+        parts.append(f"-- {step.label}\n{sql}")
+    return "\n\n".join(parts)
+
+
+def split_batches(steps, batch_size=None):
+    """
+    Teilt die Schritte in Batches.
+
+    Args:
+        batch_size (int): Schritte pro Batch; None oder 0 für einen einzigen Batch.
+    """
+    steps = list(steps)
+    if not batch_size or batch_size >= len(steps):
+        return [steps] if steps else []
+    return [steps[i:i + batch_size] for i in range(0, len(steps), batch_size)]
+
+
+class SqlExecutor:
+    """
+    Basisklasse der Backends: Unterklassen implementieren _execute(sql,
+    labels, prepare) und führen jeden Aufruf in einer eigenen Transaktion
+    aus. Zählt Round-Trips und deren Dauer.
+    """
+
+    def __init__(self):
+        self.round_trips = 0
+        self.seconds = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Gibt die Verbindungen frei."""
+
+    def execute(self, sql, labels=(), prepare=False):
+        """
+        Führt SQL in einem Round-Trip und einer Transaktion aus.
+
+        Args:
+            sql (str): Eine oder mehrere Anweisungen.
+            labels (list): Schritte, die sql enthält (für Fehlermeldungen).
+            prepare (bool): Als serverseitiges Prepared Statement ausführen,
+                sofern das Backend es unterstützt (nur eine Anweisung).
+
+        Returns:
+            Die Zeilen der letzten Anweisung als Liste von dicts (None ohne Ergebnis).
+
+        Raises:
+            SqlError: Wenn die Ausführung fehlschlägt.
+        """
+        started = time.perf_counter()
+        try:
+            return self._execute(sql, labels, prepare)
+        finally:
+            self.round_trips += 1
+            self.seconds += time.perf_counter() - started
+
+    def _execute(self, sql, labels, prepare):
+        raise NotImplementedError
+
+    def run(self, steps, batch_size=None):
+        """
+        Führt die Schritte in Batches aus, jeden Batch in einem Round-Trip.
+
+        Args:
+            steps (list): Step-Objekte in Ausführungsreihenfolge.
+            batch_size (int): Schritte pro Batch; None oder 0 für einen einzigen Batch.
+
+        Yields:
+            BatchResult: Nach jedem abgeschlossenen Batch.
+
+        Raises:
+            SqlError: Beim ersten fehlgeschlagenen Batch; spätere Batches laufen nicht mehr.
+        """
+        batches = split_batches(steps, batch_size)
+        for index, batch in enumerate(batches, start=1):
+            labels = [step.label for step in batch]
+            started = time.perf_counter()
+            result = self.execute(join_statements(batch), labels)
+            yield BatchResult(index, len(batches), labels, time.perf_counter() - started, result)
+
+
+class RpcExecutor(SqlExecutor):
+    """
+    Führt SQL über die RPC-Funktion execute_sql von Supabase aus.
+
+    Args:
+        url (str): Projekt-URL, z.B. "https://<ref>.supabase.co".
+        key (str): API-Key (anon oder service_role).
+        timeout (float): Timeout pro Aufruf in Sekunden.
+        pool_size (int): Maximale Anzahl offener Verbindungen.
+    """
+
+    def __init__(self, url, key, timeout=DEFAULT_TIMEOUT, pool_size=POOL_SIZE):
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+        except ImportError as e:
+            raise SqlError(f"Backend rpc nicht verfügbar: {e} (pip install requests)")
+
+        super().__init__()
+        self._request_error = requests.RequestException
+        self.endpoint = f"{url.rstrip('/')}{RPC_PATH}"
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "apikey": key,
+            "Authorization": f"Bearer {key}",
+            "Content-Type": "application/json",
+        })
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=CONNECT_RETRIES, read=0, status=0, backoff_factor=0.2),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def close(self):
+        self.session.close()
+
+    def _execute(self, sql, labels, prepare):
+        try:
+            response = self.session.post(self.endpoint, json={"sql": sql}, timeout=self.timeout)
+        except self._request_error as e:
+            raise SqlError(f"Anfrage fehlgeschlagen: {e}", labels)
+        if response.status_code != 200:
+            raise SqlError(response.text, labels, response.status_code)
+        try:
+            return response.json()
+        except ValueError:
+            return None
+
+
+def add_backend_arguments(parser):
+    """Optionen für Backend und Verbindung (--backend, --dsn, --timeout)."""
+    parser.add_argument("--backend", choices=BACKENDS, default="rpc",
+                        help="rpc: Supabase-RPC execute_sql über HTTPS (Standard); "
+                             "postgres: direkt über das Postgres-Protokoll (z.B. docker-compose)")
+    parser.add_argument("--dsn", metavar="DSN",
+                        help="Verbindung für --backend postgres (Standard: DATABASE_URL oder die lokale Datenbank)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, metavar="SEKUNDEN",
+                        help=f"Timeout pro Round-Trip (Standard: {DEFAULT_TIMEOUT})")
+
+
+def open_executor(args):
+    """
+    Erzeugt das Backend zu den Optionen von add_backend_arguments.
+
+    Raises:
+        SqlError: Wenn das Backend nicht verfügbar ist (z.B. psycopg fehlt).
+    """
+    from .settings import database_url, supabase_key, supabase_url
+
+    if args.backend == "postgres":
+        from .pg import PostgresExecutor
+
+        return PostgresExecutor(args.dsn or database_url(), timeout=args.timeout)
+    return RpcExecutor(supabase_url(), supabase_key(), timeout=args.timeout)
@@ -0,0 +1,466 @@
+"""
+Migrations-Runner mit Prüfsummen-Ledger (migrate.py).
+
+Migrationen sind die Dateien in supabase/migrations (nach Dateiname) und
+danach die .sql-Dateien im Projekt-Root in der Reihenfolge von
+ROOT_MIGRATIONS. Jede angewendete Migration steht mit der SHA-256-Prüfsumme
+ihres Inhalts in der Ledger-Tabelle LEDGER_TABLE. Dateien aus
+RECORD_ONLY_MIGRATIONS wiederholen nur andere Migrationen; sie werden nicht
+ausgeführt, sondern nur mit ihrer Prüfsumme eingetragen.
+
+Ablauf:
+    1. Ein Round-Trip liest das Ledger. Ist nichts offen, endet der Lauf
+       hier; das Ledger selbst wird mit der ersten Migration angelegt.
+    2. Wurde eine bereits angewendete Datei seitdem geändert, bricht der
+       Lauf ab, ohne etwas anzuwenden.
+    3. Die offenen Migrationen laufen samt Ledger-Eintrag in einem Batch
+       (siehe executor.py), standardmäßig alle in einer Transaktion.
+
+Die Skripte werden beim Anwenden wiederholbar gemacht (make_rerunnable):
+CREATE TABLE/INDEX/SCHEMA/... erhalten IF NOT EXISTS, CREATE FUNCTION/VIEW
+werden zu CREATE OR REPLACE, und CREATE TYPE/TRIGGER/POLICY sowie ADD
+CONSTRAINT, für die es kein IF NOT EXISTS gibt, laufen in einem DO-Block,
+der "existiert bereits" ignoriert. So laufen die Migrationen auch auf einer
+Datenbank durch, die schon vor dem Ledger eingerichtet wurde (z.B. über
+setup_rbac.py oder den SQL-Editor). Die Prüfsumme bezieht sich auf den
+unveränderten Dateiinhalt.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+
+from .executor import SqlError, Step, add_backend_arguments, open_executor, sql_literal
+from .settings import PROJECT_ROOT
+
+LEDGER_TABLE = "public.migration_ledger"
+MIGRATIONS_DIR = "supabase/migrations"
+# Root-Dateien in Abhängigkeitsreihenfolge (permissions vor den
+# Verknüpfungstabellen)
+ROOT_MIGRATIONS = (
+    "create_permissions_table.sql",
+    "create_permissions.sql",
+    "create_guild_discord_role_permissions_table.sql",
+    "create_guild_user_permissions_table.sql",
+    "insert_initial_permissions.sql",
+    "rbac_setup.sql",
+)
+# create_permissions.sql ist inhaltsgleich mit create_permissions_table.sql,
+# rbac_setup.sql fasst die übrigen zusammen (samt Prüfabfragen, die
+# schema.py ersetzt). insert_initial_permissions.sql enthält den früheren
+# Permission-Katalog; dessen einzige Quelle ist jetzt seeds/permissions.yaml
+# (setup_rbac.py schreibt ihn über seed.py). Sie laufen nicht, stehen aber
+# mit ihrer Prüfsumme im Ledger, damit Änderungen an ihnen auffallen.
+RECORD_ONLY_MIGRATIONS = frozenset({"create_permissions.sql", "insert_initial_permissions.sql", "rbac_setup.sql"})
+# SQLSTATE undefined_table
+UNDEFINED_TABLE = "42P01"
+# Dollar-Quote-Tag der DO-Blöcke von make_rerunnable
+DO_TAG = "$migrate$"
+
+
+class MigrationError(Exception):
+    """Migrationen fehlen, sind unlesbar oder wurden nach dem Anwenden geändert."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    Eine Migrationsdatei.
+
+    Attributes:
+        name (str): Relativer Pfad mit "/", z.B. "supabase/migrations/01_initial_schema.sql".
+        checksum (str): SHA-256 des Inhalts (Zeilenenden normalisiert).
+        sql (str): Inhalt der Datei.
+        record_only (bool): Nur die Prüfsumme eintragen, sql nicht ausführen.
+    """
+    name: str
+    checksum: str
+    sql: str
+    record_only: bool = False
+
+
+@dataclass
+class MigrationPlan:
+    """
+    Abgleich der Dateien mit dem Ledger.
+
+    Attributes:
+        pending (list): Noch nicht angewendete Migration-Objekte in Reihenfolge.
+        applied (list): Namen der angewendeten Migrationen mit gleicher Prüfsumme.
+        changed (list): Namen der angewendeten Migrationen, deren Datei sich geändert hat.
+        unknown (list): Namen im Ledger ohne passende Datei.
+    """
+    pending: list = field(default_factory=list)
+    applied: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    unknown: list = field(default_factory=list)
+
+
+def checksum(sql):
+    """SHA-256 des Inhalts; CRLF zählt wie LF, damit Windows-Checkouts nicht als geändert gelten."""
+    return hashlib.sha256(sql.replace("\r\n", "\n").encode("utf-8")).hexdigest()
+
+
+def migration_names(base_path=PROJECT_ROOT, names=None):
+    """
+    Namen aller Migrationen in Ausführungsreihenfolge.
+
+    Args:
+        names (list): Optional nur diese Migrationen (Reihenfolge bleibt die des Runners).
+    """
+    directory = os.path.join(base_path, MIGRATIONS_DIR)
+    try:
+        entries = sorted(e for e in os.listdir(directory) if e.endswith(".sql"))
+    except FileNotFoundError:
+        entries = []
+    all_names = [f"{MIGRATIONS_DIR}/{e}" for e in entries] + list(ROOT_MIGRATIONS)
+    if names is None:
+        return all_names
+    unknown = [name for name in names if name not in all_names]
+    if unknown:
+        raise MigrationError(f"Unbekannte Migration: {unknown[0]}")
+    return [name for name in all_names if name in names]
+
+
+def load_migrations(base_path=PROJECT_ROOT, names=None):
+    """
+    Liest die Migrationsdateien.
+
+    Raises:
+        MigrationError: Wenn eine Datei fehlt oder unlesbar ist.
+    """
+    migrations = []
+    for name in migration_names(base_path, names):
+        try:
+            with open(os.path.join(base_path, name), "r", encoding="utf-8", newline="") as f:
+                sql = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            raise MigrationError(f"Konnte Migration nicht lesen: {name} - {e}")
+        migrations.append(Migration(name, checksum(sql), sql, name in RECORD_ONLY_MIGRATIONS))
+    return migrations
+
+
+_DOLLAR_TAG_RE = re.compile(r"\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$")
+
+
+def _is_word_char(char):
+    return char.isalnum() or char in "_$"
+
+
+def _skip_quoted(sql, i, backslash_escapes):
+    """
+    Liefert die Position hinter dem String bzw. Bezeichner, der bei i beginnt.
+    Verdoppelte Anführungszeichen gehören zum Inhalt, in E'...' auch
+    Backslash-Escapes wie \'. Ohne Ende reicht er bis zum Skriptende.
+    """
+    quote = sql[i]
+    length = len(sql)
+    i += 1
+    while i < length:
+        char = sql[i]
+        if char == "\\" and backslash_escapes:
+            i += 2
+        elif char == quote:
+            if not sql.startswith(quote, i + 1):
+                return i + 1
+            i += 2  # verdoppeltes Anführungszeichen
+        else:
+            i += 1
+    return length
+
+
+def _skip_block_comment(sql, i):
+    """Liefert die Position hinter dem /* */-Kommentar bei i; Postgres verschachtelt sie."""
+    depth = 0
+    length = len(sql)
+    while i < length:
+        if sql.startswith("/*", i):
+            depth += 1
+            i += 2
+        elif sql.startswith("*/", i):
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return i
+        else:
+            i += 1
+    return length
+
+
+def split_statements(sql):
+    """
+    Zerlegt ein Skript an Semikolons außerhalb von Strings (auch E'...'),
+    Bezeichnern in Anführungszeichen, Kommentaren (auch verschachtelten
+    /* */) und Dollar-Quotes.
+
+    Returns:
+        list: Die Anweisungen ohne abschließendes Semikolon; Kommentare vor
+            einer Anweisung gehören zu ihr, reine Kommentare entfallen.
+    """
+    statements = []
+    start = 0
+    i = 0
+    length = len(sql)
+    while i < length:
+        char = sql[i]
+        if char == "-" and sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = length if end == -1 else end + 1
+        elif char == "/" and sql.startswith("/*", i):
+            i = _skip_block_comment(sql, i)
+        elif char in "'\"":
+            # E'...' (nicht als Ende eines Bezeichners wie in "name'")
+            escapes = char == "'" and i > 0 and sql[i - 1] in "Ee" and (i < 2 or not _is_word_char(sql[i - 2]))
+            i = _skip_quoted(sql, i, escapes)
+        elif char == "$":
+            match = _DOLLAR_TAG_RE.match(sql, i) if i == 0 or not _is_word_char(sql[i - 1]) else None
+            if match is None:
+                i += 1
+                continue
+            end = sql.find(match.group(), match.end())
+            i = length if end == -1 else end + len(match.group())
+        elif char == ";":
+            statements.append(sql[start:i])
+            start = i + 1
+            i += 1
+        else:
+            i += 1
+    statements.append(sql[start:])
+    return [s.strip() for s in statements if _strip_comments(s).strip()]
+
+
+def _strip_comments(statement):
+    """Entfernt führende Kommentare und Leerraum (für den Abgleich des Anweisungsanfangs)."""
+    text = statement.lstrip()
+    while True:
+        if text.startswith("--"):
+            end = text.find("\n")
+            text = "" if end == -1 else text[end + 1:].lstrip()
+        elif text.startswith("/*"):
+            text = text[_skip_block_comment(text, 0):].lstrip()
+        else:
+            return text
+
+
+_IF_NOT_EXISTS_RES = [
+    re.compile(r"^(CREATE\s+(?:TABLE|SCHEMA|EXTENSION|SEQUENCE)\s+)(?!IF\s+NOT\s+EXISTS\b)", re.I),
+    re.compile(r"^(CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?)(?!IF\s+NOT\s+EXISTS\b|ON\b)", re.I),
+    re.compile(r"^(ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?\S+\s+ADD\s+COLUMN\s+)(?!IF\s+NOT\s+EXISTS\b)", re.I),
+]
+_OR_REPLACE_RE = re.compile(r"^(CREATE\s+)(?=(?:FUNCTION|PROCEDURE|VIEW)\b)", re.I)
+_DUPLICATE_OBJECT_RE = re.compile(
+    r"^(?:CREATE\s+(?:TYPE|TRIGGER|POLICY|DOMAIN)\b"
+    r"|ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?\S+\s+ADD\s+CONSTRAINT\b)",
+    re.I,
+)
+
+
+def make_rerunnable(sql):
+    """
+    Macht ein Skript wiederholbar (siehe Moduldokumentation).
+
+    Returns:
+        tuple: (neues Skript, Anzahl der umgeschriebenen Anweisungen)
+    """
+    statements = []
+    rewritten = 0
+    for statement in split_statements(sql):
+        body = _strip_comments(statement)
+        prefix = statement[:len(statement) - len(body)]
+        new_body = body
+        for pattern in _IF_NOT_EXISTS_RES:
+            new_body = pattern.sub(r"\1IF NOT EXISTS ", new_body, count=1)
+        new_body = _OR_REPLACE_RE.sub(r"\1OR REPLACE ", new_body, count=1)
+        if _DUPLICATE_OBJECT_RE.match(new_body) and DO_TAG not in new_body:
+            new_body = (
+                f"DO {DO_TAG} BEGIN\n{new_body};\n"
+                f"EXCEPTION WHEN duplicate_object OR duplicate_table THEN NULL;\nEND {DO_TAG}"
+            )
+        if new_body != body:
+            rewritten += 1
+        statements.append(prefix + new_body)
+    return "".join(f"{s};\n" for s in statements), rewritten
+
+
+def ledger_ddl():
+    return f"""CREATE TABLE IF NOT EXISTS {LEDGER_TABLE} (
+    name TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+
+def _is_undefined_table(error):
+    """
+    Prüft auf SQLSTATE 42P01: beim Backend postgres steht er in status, beim
+    Backend rpc im Feld "code" der PostgREST-Fehlerantwort.
+    """
+    if error.status == UNDEFINED_TABLE:
+        return True
+    try:
+        body = json.loads(str(error))
+    except ValueError:
+        return False
+    return isinstance(body, dict) and body.get("code") == UNDEFINED_TABLE
+
+
+def read_ledger(executor):
+    """
+    Liest das Ledger (ein Round-Trip, eine Anweisung).
+
+    Returns:
+        list: Zeilen mit "name" und "checksum"; leer, solange es das Ledger
+            noch nicht gibt (es wird mit der ersten Migration angelegt).
+
+    Raises:
+        SqlError: Bei allen anderen Fehlern (z.B. execute_sql fehlt).
+    """
+    try:
+        return executor.execute(
+            f"SELECT name, checksum FROM {LEDGER_TABLE} ORDER BY applied_at, name", ["Ledger"], prepare=True
+        ) or []
+    except SqlError as e:
+        if _is_undefined_table(e):
+            return []
+        raise
+
+
+def plan_migrations(migrations, ledger_rows, known_names=None):
+    """
+    Gleicht die Migrationen mit den Ledger-Zeilen ab.
+
+    Args:
+        migrations (list): Migration-Objekte in Reihenfolge.
+        ledger_rows (list): Zeilen mit "name" und "checksum".
+        known_names (list): Alle vorhandenen Migrationen, falls migrations
+            nur eine Auswahl ist (sonst gelten die übrigen als unbekannt).
+    """
+    recorded = {row["name"]: row["checksum"] for row in ledger_rows or []}
+    plan = MigrationPlan()
+    for migration in migrations:
+        applied_checksum = recorded.get(migration.name)
+        if applied_checksum is None:
+            plan.pending.append(migration)
+        elif applied_checksum != migration.checksum:
+            plan.changed.append(migration.name)
+        else:
+            plan.applied.append(migration.name)
+    names = set(known_names) if known_names is not None else {migration.name for migration in migrations}
+    plan.unknown = [name for name in recorded if name not in names]
+    return plan
+
+
+def migration_steps(pending):
+    """
+    Ein Step pro Migration: das wiederholbare Skript (entfällt bei
+    record_only) und der Ledger-Eintrag. Der erste Step legt das Ledger bei
+    Bedarf an.
+    """
+    steps = []
+    for index, migration in enumerate(pending):
+        sql = "" if migration.record_only else make_rerunnable(migration.sql)[0]
+        if index == 0:
+            sql = ledger_ddl() + sql
+        sql += (
+            f"INSERT INTO {LEDGER_TABLE} (name, checksum) VALUES "
+            f"({sql_literal(migration.name)}, {sql_literal(migration.checksum)});\n"
+        )
+        steps.append(Step(migration.name, sql))
+    return steps
+
+
+def run_migrations(executor, migrations, batch_size=None, dry_run=False, out=None, extra_steps=()):
+    """
+    Wendet die offenen Migrationen an.
+
+    Args:
+        executor (SqlExecutor): Backend (siehe db_tools/executor.py).
+        migrations (list): Migration-Objekte in Reihenfolge (siehe load_migrations).
+        batch_size (int): Steps pro Round-Trip; None oder 0 für alle in einem.
+        dry_run (bool): Nur den Abgleich ausgeben.
+        out: Stream für den Fortschritt (Standard: sys.stdout).
+        extra_steps (list): Steps, die nach den Migrationen in denselben
+            Batches laufen (z.B. der Seed), auch wenn keine Migration offen ist.
+
+    Returns:
+        MigrationPlan
+
+    Raises:
+        MigrationError: Wenn angewendete Dateien geändert wurden.
+        SqlError: Beim ersten fehlgeschlagenen Batch.
+    """
+    out = out or sys.stdout
+    plan = plan_migrations(migrations, read_ledger(executor), migration_names())
+    for name in plan.unknown:
+        print(f"Hinweis: {name} steht im Ledger, die Datei fehlt.", file=out)
+    if plan.changed:
+        raise MigrationError(
+            "Nach dem Anwenden geändert (Prüfsumme weicht vom Ledger ab): " + ", ".join(plan.changed)
+            + ". Änderungen gehören in eine neue Migration."
+        )
+    if not plan.pending:
+        print(f"Keine offenen Migrationen ({len(plan.applied)} angewendet).", file=out)
+    else:
+        print(f"{len(plan.pending)} offene Migration(en), {len(plan.applied)} bereits angewendet:", file=out)
+    for migration in plan.pending:
+        if migration.record_only:
+            note = " (nur Prüfsumme, wird nicht ausgeführt)"
+        else:
+            _, rewritten = make_rerunnable(migration.sql)
+            note = f" ({rewritten} Anweisung(en) wiederholbar gemacht)" if rewritten else ""
+        print(f"- {migration.name}{note}", file=out)
+    steps = migration_steps(plan.pending) + list(extra_steps)
+    if dry_run or not steps:
+        return plan
+    for batch in executor.run(steps, batch_size):
+        print(f"Batch {batch.index}/{batch.count} in {batch.seconds * 1000:.0f} ms: {', '.join(batch.labels)}", file=out)
+    return plan
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Wendet offene Migrationen an und führt darüber ein Prüfsummen-Ledger.")
+    parser.add_argument("migrations", nargs="*", metavar="MIGRATION",
+                        help="Nur diese Migrationen (relativer Pfad, Standard: alle)")
+    parser.add_argument("--batch-size", type=int, default=0, metavar="N",
+                        help="Migrationen pro Round-Trip (Standard: 0 = alle in einer Transaktion)")
+    parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, was offen ist")
+    parser.add_argument("--list", action="store_true", help="Migrationen in Ausführungsreihenfolge auflisten (ohne Datenbank)")
+    add_backend_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch_size < 0:
+        parser.error("--batch-size darf nicht negativ sein.")
+    try:
+        migrations = load_migrations(PROJECT_ROOT, args.migrations or None)
+    except MigrationError as e:
+        parser.error(str(e))
+    if args.list:
+        for migration in migrations:
+            note = "  (nur Prüfsumme)" if migration.record_only else ""
+            print(f"{migration.checksum[:12]}  {migration.name}{note}")
+        return
+
+    try:
+        executor = open_executor(args)
+    except SqlError as e:
+        print(f"Fehler: {e}")
+        sys.exit(1)
+    with executor:
+        try:
+            run_migrations(executor, migrations, args.batch_size, dry_run=args.dry_run)
+        except MigrationError as e:
+            print(f"Fehler: {e}")
+            sys.exit(1)
+        except SqlError as e:
+            print(f"Fehler beim Anwenden ({', '.join(e.labels)}): {e}")
+            print("Der fehlgeschlagene Batch wurde nicht übernommen.")
+            sys.exit(1)
+        print(f"Fertig ({executor.round_trips} Round-Trip(s), {executor.seconds * 1000:.0f} ms).")
@@ -0,0 +1,246 @@
+"""
+Überprüfung des Schemas gegen eine erwartete Spezifikation.
+
+Eine einzige Katalogabfrage (catalog_query) liefert Spalten, Indizes und
+Fremdschlüssel aller geprüften Tabellen als ein JSON-Objekt; die Prüfung
+braucht damit genau einen Round-Trip, unabhängig von der Anzahl der
+Tabellen. Der Vergleich mit der Spezifikation (diff_schema) läuft lokal.
+
+Die Abfrage liest pg_catalog statt information_schema: Die Sichten von
+information_schema filtern nach Rechten und sind deutlich langsamer.
+"""
+import json
+from dataclasses import dataclass, field
+
+from .executor import sql_literal
+
+# pg_constraint.confdeltype -> Aktion bei ON DELETE
+ON_DELETE_ACTIONS = {
+    "a": "NO ACTION",
+    "r": "RESTRICT",
+    "c": "CASCADE",
+    "n": "SET NULL",
+    "d": "SET DEFAULT",
+}
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Erwartete Spalte.
+
+    Attributes:
+        name (str): Spaltenname.
+        type (str): Typ wie von format_type(), z.B. "timestamp with time zone".
+        nullable (bool): Ob NULL erlaubt ist.
+    """
+    name: str
+    type: str
+    nullable: bool = False
+
+
+@dataclass(frozen=True)
+class ForeignKey:
+    """
+    Erwarteter Fremdschlüssel.
+
+    Attributes:
+        columns (tuple): Spalten der Tabelle.
+        table (str): Referenzierte Tabelle (ohne Schema).
+        ref_columns (tuple): Referenzierte Spalten.
+        on_delete (str): Aktion bei ON DELETE, siehe ON_DELETE_ACTIONS.
+    """
+    columns: tuple
+    table: str
+    ref_columns: tuple = ("id",)
+    on_delete: str = "CASCADE"
+
+    def describe(self):
+        return f"({', '.join(self.columns)}) -> {self.table}({', '.join(self.ref_columns)}) ON DELETE {self.on_delete}"
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """
+    Erwartete Tabelle.
+
+    Attributes:
+        name (str): Tabellenname (ohne Schema).
+        columns (tuple): Column-Objekte in Tabellenreihenfolge.
+        indexes (tuple): Namen der Indizes (einschließlich Primärschlüssel und UNIQUE).
+        foreign_keys (tuple): ForeignKey-Objekte.
+    """
+    name: str
+    columns: tuple
+    indexes: tuple = ()
+    foreign_keys: tuple = ()
+
+
+@dataclass
+class TableReport:
+    """
+    Ergebnis für eine Tabelle.
+
+    Attributes:
+        name (str): Tabellenname.
+        problems (list): Abweichungen, die die Prüfung fehlschlagen lassen.
+        notes (list): Zusätzliche Spalten oder Indizes (kein Fehler).
+        summary (str): Kurzbeschreibung des vorgefundenen Zustands.
+    """
+    name: str
+    problems: list = field(default_factory=list)
+    notes: list = field(default_factory=list)
+    summary: str = ""
+
+    @property
+    def passed(self):
+        return not self.problems
+
+
+def catalog_query(table_names, schema="public"):
+    """
+    Katalogabfrage für die Tabellen: eine Zeile mit der Spalte "schema" (JSON).
+
+    Aufbau: {"<tabelle>": {"columns": [{"name", "type", "nullable"}, ...],
+    "indexes": {"<name>": "<CREATE INDEX ...>"}, "foreign_keys": [{"name",
+    "columns", "table", "ref_columns", "on_delete"}, ...]}}. Fehlende Tabellen
+    kommen nicht vor.
+    """
+    names = ", ".join(sql_literal(name) for name in table_names)
+    return f"""
+SELECT coalesce(json_object_agg(c.relname, json_build_object(
+    'columns', (
+        SELECT coalesce(json_agg(json_build_object(
+            'name', a.attname,
+            'type', format_type(a.atttypid, a.atttypmod),
+            'nullable', NOT a.attnotnull
+        ) ORDER BY a.attnum), '[]'::json)
+        FROM pg_attribute a
+        WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+    ),
+    'indexes', (
+        SELECT coalesce(json_object_agg(i.relname, pg_get_indexdef(i.oid)), '{{}}'::json)
+        FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = c.oid
+    ),
+    'foreign_keys', (
+        SELECT coalesce(json_agg(json_build_object(
+            'name', con.conname,
+            'columns', (
+                SELECT json_agg(att.attname ORDER BY k.ord)
+                FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                JOIN pg_attribute att ON att.attrelid = con.conrelid AND att.attnum = k.attnum
+            ),
+            'table', ref.relname,
+            'ref_columns', (
+                SELECT json_agg(att.attname ORDER BY k.ord)
+                FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                JOIN pg_attribute att ON att.attrelid = con.confrelid AND att.attnum = k.attnum
+            ),
+            'on_delete', con.confdeltype
+        ) ORDER BY con.conname), '[]'::json)
+        FROM pg_constraint con JOIN pg_class ref ON ref.oid = con.confrelid
+        WHERE con.conrelid = c.oid AND con.contype = 'f'
+    )
+)), '{{}}'::json) AS schema
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = {sql_literal(schema)}
+    AND c.relkind IN ('r', 'p')
+    AND c.relname IN ({names});
+"""
+
+
+def parse_catalog(result):
+    """
+    Liest das Ergebnis von catalog_query (Zeilenliste von execute_sql oder
+    direkt das JSON-Objekt).
+
+    Raises:
+        ValueError: Bei einer Antwort ohne Spalte "schema".
+    """
+    if isinstance(result, list):
+        if len(result) != 1 or not isinstance(result[0], dict) or "schema" not in result[0]:
+            raise ValueError(f"Unerwartete Antwort der Katalogabfrage: {str(result)[:200]}")
+        result = result[0]["schema"]
+    if isinstance(result, str):
+        result = json.loads(result)
+    if not isinstance(result, dict):
+        raise ValueError(f"Unerwartete Antwort der Katalogabfrage: {str(result)[:200]}")
+    return result
+
+
+def _diff_table(spec, actual):
+    report = TableReport(spec.name)
+    if actual is None:
+        report.problems.append("Tabelle fehlt")
+        report.summary = "fehlt"
+        return report
+
+    columns = {c["name"]: c for c in actual.get("columns") or []}
+    for column in spec.columns:
+        found = columns.get(column.name)
+        if found is None:
+            report.problems.append(f"Spalte {column.name} fehlt")
+            continue
+        if found["type"] != column.type:
+            report.problems.append(f"Spalte {column.name}: Typ {found['type']}, erwartet {column.type}")
+        if found["nullable"] != column.nullable:
+            expected = "NULL" if column.nullable else "NOT NULL"
+            report.problems.append(f"Spalte {column.name}: erwartet {expected}")
+    expected_columns = {column.name for column in spec.columns}
+    report.notes.extend(f"zusätzliche Spalte {name}" for name in columns if name not in expected_columns)
+
+    indexes = actual.get("indexes") or {}
+    report.problems.extend(f"Index {name} fehlt" for name in spec.indexes if name not in indexes)
+    report.notes.extend(f"zusätzlicher Index {name}" for name in sorted(indexes) if name not in spec.indexes)
+
+    foreign_keys = [
+        ForeignKey(
+            tuple(fk["columns"] or ()),
+            fk["table"],
+            tuple(fk["ref_columns"] or ()),
+            ON_DELETE_ACTIONS.get(fk["on_delete"], fk["on_delete"]),
+        )
+        for fk in actual.get("foreign_keys") or []
+    ]
+    by_columns = {fk.columns: fk for fk in foreign_keys}
+    for expected in spec.foreign_keys:
+        found = by_columns.get(tuple(expected.columns))
+        if found is None:
+            report.problems.append(f"Fremdschlüssel {expected.describe()} fehlt")
+        elif found != expected:
+            report.problems.append(f"Fremdschlüssel {found.describe()}, erwartet {expected.describe()}")
+    expected_fk_columns = {tuple(fk.columns) for fk in spec.foreign_keys}
+    report.notes.extend(
+        f"zusätzlicher Fremdschlüssel {fk.describe()}" for fk in foreign_keys if fk.columns not in expected_fk_columns
+    )
+
+    report.summary = f"{len(columns)} Spalte(n), {len(indexes)} Index(e), {len(foreign_keys)} Fremdschlüssel"
+    return report
+
+
+def diff_schema(specs, catalog):
+    """
+    Vergleicht den Katalog (siehe parse_catalog) mit der Spezifikation.
+
+    Returns:
+        list: Ein TableReport pro TableSpec, in deren Reihenfolge.
+    """
+    return [_diff_table(spec, catalog.get(spec.name)) for spec in specs]
+
+
+def format_report(reports):
+    """Prüfbericht: eine Zeile pro Tabelle, darunter Abweichungen und Hinweise."""
+    lines = []
+    for report in reports:
+        status = "OK" if report.passed else "FEHLER"
+        lines.append(f"[{status}] {report.name} ({report.summary})")
+        lines.extend(f"    - {problem}" for problem in report.problems)
+        lines.extend(f"    ~ {note}" for note in report.notes)
+    failed = sum(not report.passed for report in reports)
+    if failed:
+        lines.append(f"Schema-Prüfung fehlgeschlagen: {failed} von {len(reports)} Tabelle(n) weichen ab.")
+    else:
+        lines.append(f"Schema-Prüfung bestanden: {len(reports)} Tabelle(n) wie erwartet.")
+    return "\n".join(lines)
@@ -0,0 +1,339 @@
+"""
+Seeding des Permission-Katalogs und der Zuweisungen aus Dateien (seed_rbac.py).
+
+Eingabe sind YAML- oder CSV-Dateien; beliebig viele können kombiniert werden.
+Der Permission-Katalog steht nur in DEFAULT_SEED_FILE; setup_rbac.py
+schreibt ihn nach den Migrationen.
+
+YAML (alle Schlüssel optional)::
+
+    permissions:
+      - key: category:create
+        description: Allows creating new categories
+        module: Dynamic Voices
+    role_permissions:
+      - guild: "123456789012345678"    # Discord-ID der Guild
+        role: "234567890123456789"     # Discord-ID der Rolle
+        permissions: [category:read, zone:read]
+    user_permissions:
+      - guild: "123456789012345678"
+        user: "345678901234567890"     # Discord-ID des Users
+        permissions: [zone:update]
+
+CSV: eine Art pro Datei, erkannt an der Kopfzeile (Spalten wie in
+PERMISSION_COLUMNS, ROLE_COLUMNS bzw. USER_COLUMNS).
+
+Guilds und User werden über ihre Discord-ID den Zeilen in guilds bzw.
+user_profiles zugeordnet, Permissions über permission_key. Zuweisungen,
+deren Guild, User oder Permission es nicht gibt, werden übersprungen,
+ebenso bereits vorhandene. Permissions werden per Upsert aktualisiert.
+
+Geschrieben wird in großen mehrzeiligen Anweisungen statt einer Anfrage pro
+Zeile:
+- rpc: INSERT ... SELECT ... FROM (VALUES ...) mit chunk_size Zeilen pro
+  Anweisung; die Chunks gehen gebündelt in einem Round-Trip (batch_size).
+- postgres: COPY in temporäre Tabellen und je ein INSERT ... SELECT daraus,
+  alles in einer Transaktion.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+
+from .executor import SqlError, Step, add_backend_arguments, open_executor, sql_literal
+from .settings import PROJECT_ROOT
+
+PERMISSION_COLUMNS = ("permission_key", "description", "module")
+ROLE_COLUMNS = ("guild_discord_id", "discord_role_id", "permission_key")
+USER_COLUMNS = ("guild_discord_id", "user_discord_id", "permission_key")
+CHUNK_SIZE = 1000
+DEFAULT_SEED_FILE = os.path.join("seeds", "permissions.yaml")
+
+
+class SeedError(Exception):
+    """Eine Seed-Datei ist unlesbar oder unvollständig."""
+
+
+@dataclass
+class SeedData:
+    """
+    Zu schreibende Zeilen, je Art als Tupel in der Spaltenreihenfolge.
+
+    Attributes:
+        permissions (dict): permission_key -> (permission_key, description, module);
+            spätere Einträge überschreiben frühere.
+        role_permissions (list): Tupel nach ROLE_COLUMNS.
+        user_permissions (list): Tupel nach USER_COLUMNS.
+    """
+    permissions: dict = field(default_factory=dict)
+    role_permissions: list = field(default_factory=list)
+    user_permissions: list = field(default_factory=list)
+
+    def __len__(self):
+        return len(self.permissions) + len(self.role_permissions) + len(self.user_permissions)
+
+
+@dataclass(frozen=True)
+class Upsert:
+    """
+    Schreibvorgang für eine Art von Zeilen.
+
+    Attributes:
+        label (str): Zieltabelle für Fortschritt und Fehlermeldungen.
+        staging (str): Name der temporären Tabelle für COPY.
+        columns (tuple): Spalten der Quellzeilen.
+        sql (str): INSERT ... SELECT mit {source} als Platzhalter für die
+            Quelle (Alias v).
+    """
+    label: str
+    staging: str
+    columns: tuple
+    sql: str
+
+
+PERMISSIONS_UPSERT = Upsert(
+    "permissions",
+    "seed_permissions",
+    PERMISSION_COLUMNS,
+    """INSERT INTO public.permissions (permission_key, description, module)
+SELECT v.permission_key, v.description, v.module FROM {source}
+ON CONFLICT (permission_key) DO UPDATE
+SET description = EXCLUDED.description, module = EXCLUDED.module, updated_at = now()
+WHERE (permissions.description, permissions.module) IS DISTINCT FROM (EXCLUDED.description, EXCLUDED.module)""",
+)
+ROLE_PERMISSIONS_UPSERT = Upsert(
+    "guild_discord_role_permissions",
+    "seed_role_permissions",
+    ROLE_COLUMNS,
+    """INSERT INTO public.guild_discord_role_permissions (guild_id, discord_role_id, permission_id)
+SELECT g.id, v.discord_role_id, p.id FROM {source}
+JOIN public.guilds g ON g.discord_id = v.guild_discord_id
+JOIN public.permissions p ON p.permission_key = v.permission_key
+ON CONFLICT DO NOTHING""",
+)
+USER_PERMISSIONS_UPSERT = Upsert(
+    "guild_user_permissions",
+    "seed_user_permissions",
+    USER_COLUMNS,
+    """INSERT INTO public.guild_user_permissions (guild_id, user_profile_id, permission_id)
+SELECT g.id, u.id, p.id FROM {source}
+JOIN public.guilds g ON g.discord_id = v.guild_discord_id
+JOIN public.user_profiles u ON u.discord_id = v.user_discord_id
+JOIN public.permissions p ON p.permission_key = v.permission_key
+ON CONFLICT DO NOTHING""",
+)
+
+
+def _text(value):
+    """Zellwert als Text (YAML liefert Discord-IDs ohne Anführungszeichen als int)."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _required(entry, names, path):
+    for name in names:
+        value = _text(entry.get(name)) if isinstance(entry, dict) else None
+        if value is not None:
+            return value
+    raise SeedError(f"{path}: Eintrag ohne {names[0]}: {entry!r}")
+
+
+def _permission_list(entry, path):
+    permissions = entry.get("permissions") if isinstance(entry, dict) else None
+    if isinstance(permissions, str):
+        permissions = [permissions]
+    if not permissions:
+        raise SeedError(f"{path}: Eintrag ohne permissions: {entry!r}")
+    return [_text(p) for p in permissions if _text(p)]
+
+
+def _load_yaml(path, data):
+    try:
+        import yaml  # Stellt sicher, dass Sie 'pip install pyyaml' ausgeführt haben
+    except ImportError as e:
+        raise SeedError(f"{path}: YAML braucht PyYAML ({e}); alternativ CSV verwenden.")
+    with open(path, "r", encoding="utf-8") as f:
+        document = yaml.safe_load(f) or {}
+    if not isinstance(document, dict):
+        raise SeedError(f"{path}: Erwartet ein Mapping mit permissions, role_permissions und/oder user_permissions.")
+
+    for entry in document.get("permissions") or []:
+        key = _required(entry, ("key", "permission_key"), path)
+        data.permissions[key] = (key, _text(entry.get("description")), _text(entry.get("module")))
+    for entry in document.get("role_permissions") or []:
+        guild = _required(entry, ("guild", "guild_discord_id"), path)
+        role = _required(entry, ("role", "discord_role_id"), path)
+        data.role_permissions.extend((guild, role, key) for key in _permission_list(entry, path))
+    for entry in document.get("user_permissions") or []:
+        guild = _required(entry, ("guild", "guild_discord_id"), path)
+        user = _required(entry, ("user", "user_discord_id"), path)
+        data.user_permissions.extend((guild, user, key) for key in _permission_list(entry, path))
+
+
+def _load_csv(path, data):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        header = set(reader.fieldnames or ())
+        if set(ROLE_COLUMNS) <= header:
+            columns, target = ROLE_COLUMNS, data.role_permissions
+        elif set(USER_COLUMNS) <= header:
+            columns, target = USER_COLUMNS, data.user_permissions
+        elif "permission_key" in header:
+            columns, target = PERMISSION_COLUMNS, None
+        else:
+            raise SeedError(
+                f"{path}: Unbekannte Kopfzeile {sorted(header)}; erwartet "
+                f"{', '.join(PERMISSION_COLUMNS)} | {', '.join(ROLE_COLUMNS)} | {', '.join(USER_COLUMNS)}"
+            )
+        for line, row in enumerate(reader, start=2):
+            values = tuple(_text(row.get(column)) for column in columns)
+            if target is None:
+                if values[0] is None:
+                    raise SeedError(f"{path}:{line}: permission_key fehlt")
+                data.permissions[values[0]] = values
+            elif None in values:
+                raise SeedError(f"{path}:{line}: Spalte {columns[values.index(None)]} fehlt")
+            else:
+                target.append(values)
+
+
+def load_seed_files(paths):
+    """
+    Liest die Seed-Dateien (.yaml/.yml oder .csv) in der angegebenen Reihenfolge.
+
+    Raises:
+        SeedError: Bei unlesbaren Dateien oder fehlenden Pflichtfeldern.
+    """
+    data = SeedData()
+    for path in paths:
+        extension = os.path.splitext(path)[1].lower()
+        try:
+            if extension in (".yaml", ".yml"):
+                _load_yaml(path, data)
+            elif extension == ".csv":
+                _load_csv(path, data)
+            else:
+                raise SeedError(f"{path}: Unbekanntes Format (erwartet .yaml, .yml oder .csv).")
+        except OSError as e:
+            raise SeedError(f"Konnte {path} nicht lesen: {e}")
+    return data
+
+
+def seed_loads(data):
+    """(Upsert, Zeilen) in Schreibreihenfolge; Permissions zuerst, da die Zuweisungen sie referenzieren."""
+    loads = [
+        (PERMISSIONS_UPSERT, list(data.permissions.values())),
+        (ROLE_PERMISSIONS_UPSERT, data.role_permissions),
+        (USER_PERMISSIONS_UPSERT, data.user_permissions),
+    ]
+    return [(upsert, rows) for upsert, rows in loads if rows]
+
+
+def values_source(columns, rows):
+    """(VALUES (...), ...) AS v(<spalten>) mit den Zeilen als Literale."""
+    values = ",\n".join("(" + ", ".join(sql_literal(value) for value in row) + ")" for row in rows)
+    return f"(VALUES\n{values}\n) AS v({', '.join(columns)})"
+
+
+def chunk_steps(loads, chunk_size=CHUNK_SIZE):
+    """Ein Step pro Chunk von höchstens chunk_size Zeilen."""
+    steps = []
+    for upsert, rows in loads:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            label = f"{upsert.label} {start + 1}-{start + len(chunk)}"
+            steps.append(Step(label, upsert.sql.format(source=values_source(upsert.columns, chunk))))
+    return steps
+
+
+def seed(executor, data, chunk_size=CHUNK_SIZE, batch_size=None, use_copy=None, out=None):
+    """
+    Schreibt die Seed-Daten.
+
+    Args:
+        executor (SqlExecutor): Backend (siehe executor.py).
+        chunk_size (int): Zeilen pro mehrzeiliger Anweisung (nicht bei COPY).
+        batch_size (int): Chunks pro Round-Trip; None oder 0 für alle in einer Transaktion.
+        use_copy (bool): COPY statt VALUES; Standard: wenn das Backend es kann.
+        out: Stream für den Fortschritt (Standard: sys.stdout).
+
+    Returns:
+        float: Dauer in Sekunden.
+
+    Raises:
+        SqlError: Beim ersten fehlgeschlagenen Batch.
+    """
+    out = out or sys.stdout
+    loads = seed_loads(data)
+    if not loads:
+        print("Keine Zeilen zu schreiben.", file=out)
+        return 0.0
+    if use_copy is None:
+        use_copy = hasattr(executor, "copy_load")
+    started = time.perf_counter()
+    if use_copy:
+        counts = executor.copy_load([
+            (upsert.staging, upsert.columns, rows, upsert.sql.format(source=f"{upsert.staging} AS v"))
+            for upsert, rows in loads
+        ])
+        for (upsert, rows), count in zip(loads, counts):
+            print(f"{upsert.label}: {len(rows)} Zeile(n) per COPY, {count} geschrieben", file=out)
+    else:
+        for batch in executor.run(chunk_steps(loads, chunk_size), batch_size):
+            print(f"Batch {batch.index}/{batch.count} in {batch.seconds * 1000:.0f} ms: {len(batch.labels)} Chunk(s)", file=out)
+        for upsert, rows in loads:
+            print(f"{upsert.label}: {len(rows)} Zeile(n)", file=out)
+    return time.perf_counter() - started
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Schreibt Permissions und Zuweisungen aus YAML-/CSV-Dateien.")
+    parser.add_argument("files", nargs="*", metavar="DATEI",
+                        help=f"Seed-Dateien (.yaml/.yml/.csv; Standard: {DEFAULT_SEED_FILE})")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, metavar="N",
+                        help=f"Zeilen pro mehrzeiliger Anweisung (Standard: {CHUNK_SIZE})")
+    parser.add_argument("--batch-size", type=int, default=0, metavar="N",
+                        help="Chunks pro Round-Trip (Standard: 0 = alle in einer Transaktion)")
+    parser.add_argument("--no-copy", action="store_true",
+                        help="Bei --backend postgres mehrzeilige INSERTs statt COPY verwenden")
+    parser.add_argument("--dry-run", action="store_true", help="Dateien nur lesen und zählen")
+    add_backend_arguments(parser)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size muss mindestens 1 sein.")
+    if args.batch_size < 0:
+        parser.error("--batch-size darf nicht negativ sein.")
+    try:
+        data = load_seed_files(args.files or [os.path.join(PROJECT_ROOT, DEFAULT_SEED_FILE)])
+    except SeedError as e:
+        parser.error(str(e))
+    print(
+        f"{len(data.permissions)} Permission(s), {len(data.role_permissions)} Rollen- und "
+        f"{len(data.user_permissions)} User-Zuweisung(en) gelesen."
+    )
+    if args.dry_run:
+        return
+
+    try:
+        executor = open_executor(args)
+    except SqlError as e:
+        print(f"Fehler: {e}")
+        sys.exit(1)
+    with executor:
+        try:
+            seconds = seed(executor, data, args.chunk_size, args.batch_size, use_copy=False if args.no_copy else None)
+        except SqlError as e:
+            print(f"Fehler beim Schreiben ({', '.join(e.labels)}): {e}")
+            print("Der fehlgeschlagene Batch wurde nicht übernommen.")
+            sys.exit(1)
+    rate = len(data) / seconds if seconds else 0
+    print(f"{len(data)} Zeile(n) in {seconds * 1000:.0f} ms ({rate:,.0f} Zeilen/s, {executor.round_trips} Round-Trip(s)).")
@@ -0,0 +1,4 @@
+from db_tools.seed import main
+
+if __name__ == '__main__':
+    main()
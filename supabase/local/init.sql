@@ -0,0 +1,26 @@
+-- Minimaler Ersatz für die Supabase-Umgebung in der lokalen Datenbank
+-- (docker-compose.yml, Dienst "postgres"); läuft nur beim ersten Start
+-- mit leerem Volume. Die Migrationen referenzieren auth.users, auth.uid()
+-- und die Rollen von PostgREST.
+
+CREATE SCHEMA IF NOT EXISTS auth;
+
+CREATE TABLE IF NOT EXISTS auth.users (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  email TEXT
+);
+
+-- Wie bei Supabase: die User-ID aus den JWT-Claims der Anfrage (lokal meist NULL)
+CREATE OR REPLACE FUNCTION auth.uid() RETURNS UUID
+LANGUAGE sql STABLE
+AS $$
+  SELECT nullif(current_setting('request.jwt.claim.sub', true), '')::uuid
+$$;
+
+DO $$
+BEGIN
+  CREATE ROLE anon NOLOGIN;
+  CREATE ROLE authenticated NOLOGIN;
+  CREATE ROLE service_role NOLOGIN BYPASSRLS;
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
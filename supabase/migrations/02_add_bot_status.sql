@@ -1,16 +1,24 @@
 -- Add bot_status column to guilds table
 ALTER TABLE public.guilds ADD COLUMN IF NOT EXISTS bot_status TEXT NOT NULL DEFAULT 'active';
 
--- Create an enum type for bot_status
-CREATE TYPE public.bot_status_enum AS ENUM ('active', 'inactive', 'pending_invite');
+-- Create an enum type for bot_status (skipped if it already exists, so the script can be re-run)
+DO $$
+BEGIN
+  CREATE TYPE public.bot_status_enum AS ENUM ('active', 'inactive', 'pending_invite');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+-- Drop the text default first; Postgres cannot cast it to the enum automatically
+ALTER TABLE public.guilds
+  ALTER COLUMN bot_status DROP DEFAULT;
 
 -- Convert the column to use the enum type
-ALTER TABLE public.guilds 
-  ALTER COLUMN bot_status TYPE public.bot_status_enum 
-  USING bot_status::public.bot_status_enum;
+ALTER TABLE public.guilds
+  ALTER COLUMN bot_status TYPE public.bot_status_enum
+  USING bot_status::text::public.bot_status_enum;
 
 -- Set default value to 'active'
-ALTER TABLE public.guilds 
+ALTER TABLE public.guilds
   ALTER COLUMN bot_status SET DEFAULT 'active'::public.bot_status_enum;
 
 -- Update existing records to have 'active' status
@@ -0,0 +1,5 @@
+"""Gemeinsame Einstellungen der Tests: Projekt-Root in den Importpfad, damit ts_collector und db_tools ohne Installation gefunden werden."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
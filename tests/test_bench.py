@@ -0,0 +1,30 @@
+import os
+
+from ts_collector.bench import prepare_tree
+
+
+def _files(root):
+    return sorted(os.path.relpath(os.path.join(d, f), root) for d, _, names in os.walk(root) for f in names)
+
+
+def test_prepare_tree_reuses_only_matching_trees(tmp_path):
+    root = str(tmp_path / "tree")
+    tree = prepare_tree(root, 10, mean_size=200, ignored_ratio=0.5)
+    assert tree["ignored_files"] == 5
+    marker = os.path.join(root, "tree.json")
+    mtime = os.stat(marker).st_mtime_ns
+    assert prepare_tree(root, 10, mean_size=200, ignored_ratio=0.5) == tree
+    assert os.stat(marker).st_mtime_ns == mtime
+
+    # Andere Parameter erzeugen den Baum neu, statt den alten zu messen
+    other = prepare_tree(root, 10, mean_size=200, ignored_ratio=0.0)
+    assert other["ignored_files"] == 0
+    assert not any("skip" in path for path in _files(root))
+
+
+def test_prepare_tree_regenerates_interrupted_tree(tmp_path):
+    root = tmp_path / "tree"
+    (root / "apps/bench/src").mkdir(parents=True)  # abgebrochen: Ordner ohne tree.json
+    tree = prepare_tree(str(root), 4, mean_size=200)
+    assert tree["files"] == 4
+    assert (root / "tree.json").is_file()
@@ -0,0 +1,27 @@
+import json
+
+from ts_collector.cli import main
+
+
+def _project(tmp_path, monkeypatch):
+    path = tmp_path / "apps/backend/src/main.ts"
+    path.parent.mkdir(parents=True)
+    path.write_text("export const answer = 42;\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+
+def test_stats_json_goes_to_stderr(tmp_path, monkeypatch, capsys):
+    _project(tmp_path, monkeypatch)
+    main(["--sink", "file", "-o", str(tmp_path / "bundle.txt"), "--no-cache", "--stats", "json"],
+         default_profiles=("default",))
+    captured = capsys.readouterr()
+    assert json.loads(captured.err)["files"] == 1
+
+
+def test_stats_file_with_stdout_sink(tmp_path, monkeypatch, capsys):
+    _project(tmp_path, monkeypatch)
+    stats_path = tmp_path / "stats.json"
+    main(["--sink", "stdout", "--no-cache", "--stats-file", str(stats_path)], default_profiles=("default",))
+    captured = capsys.readouterr()
+    assert captured.out.startswith("Path: apps/backend/src/main.ts")
+    assert json.loads(stats_path.read_text(encoding="utf-8"))["files"] == 1
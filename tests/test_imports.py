@@ -0,0 +1,37 @@
+import os
+
+from ts_collector.cache import SnapshotCache
+from ts_collector.collector import collect_profiles
+from ts_collector.imports import ImportGraph
+from ts_collector.profiles import Profile
+from ts_collector.reader import MMAP_THRESHOLD
+
+
+def _write(root, rel_path, text):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_record_accepts_mmap_contents(tmp_path):
+    """Dateien ab MMAP_THRESHOLD kommen als mmap; record() darf daran nicht scheitern."""
+    root = str(tmp_path)
+    _write(root, "src/util.ts", "export const x = 1;\n")
+    filler = "// " + "x" * 76 + "\n"
+    _write(root, "src/big.ts", "import { x } from './util';\n" + filler * (MMAP_THRESHOLD // len(filler) + 1))
+    assert os.path.getsize(os.path.join(root, "src/big.ts")) >= MMAP_THRESHOLD
+
+    profile = Profile("p", ("src",), (".ts",))
+    cache = SnapshotCache(root)
+    graph = ImportGraph(root, cache)
+    results = collect_profiles(root, [profile], cache=cache, import_graph=graph)
+    graph.save()
+
+    assert results["p"].errors == []
+    assert graph.parsed == 2
+
+    # Im nächsten Lauf kommt die Import-Liste aus dem Cache, ohne die Datei zu lesen
+    graph = ImportGraph(root, SnapshotCache(root))
+    st = os.stat(os.path.join(root, "src/big.ts"))
+    assert graph.cached_targets("src/big.ts", st) == ["src/util.ts"]
@@ -0,0 +1,112 @@
+import io
+
+from db_tools.executor import SqlExecutor, Step
+import pytest
+
+from db_tools.migrations import (
+    DO_TAG, Migration, checksum, load_migrations, make_rerunnable, run_migrations, split_statements,
+)
+
+
+class RecordingExecutor(SqlExecutor):
+    """Beantwortet die Ledger-Abfrage mit ledger und merkt sich alle anderen Round-Trips."""
+
+    def __init__(self, ledger=()):
+        super().__init__()
+        self.ledger = list(ledger)
+        self.batches = []
+
+    def _execute(self, sql, labels, prepare):
+        if labels == ["Ledger"]:
+            return self.ledger
+        self.batches.append(labels)
+        return None
+
+
+def _migration(name, sql):
+    return Migration(name, checksum(sql), sql)
+
+
+def test_extra_steps_share_the_batch_of_pending_migrations():
+    executor = RecordingExecutor()
+    seed = [Step("permissions 1-2", "SELECT 1;")]
+    run_migrations(executor, [_migration("a.sql", "CREATE TABLE a (id int);")], out=io.StringIO(), extra_steps=seed)
+    assert executor.batches == [["a.sql", "permissions 1-2"]]
+    assert executor.round_trips == 2
+
+
+def test_extra_steps_run_without_pending_migrations():
+    migration = _migration("a.sql", "CREATE TABLE a (id int);")
+    executor = RecordingExecutor([{"name": "a.sql", "checksum": migration.checksum}])
+    run_migrations(executor, [migration], out=io.StringIO(), extra_steps=[Step("permissions 1-2", "SELECT 1;")])
+    assert executor.batches == [["permissions 1-2"]]
+
+
+def test_dry_run_skips_extra_steps():
+    executor = RecordingExecutor()
+    out = io.StringIO()
+    run_migrations(executor, [_migration("a.sql", "SELECT 1;")], dry_run=True, out=out,
+                   extra_steps=[Step("permissions 1-2", "SELECT 1;")])
+    assert executor.batches == []
+    assert "- a.sql" in out.getvalue()
+
+
+@pytest.mark.parametrize("migration", load_migrations(), ids=lambda m: m.name)
+def test_real_migrations_are_rerunnable(migration):
+    script, _ = make_rerunnable(migration.sql)
+    # Ein zweiter Durchlauf ändert nichts mehr
+    assert make_rerunnable(script) == (script, 0)
+    assert len(split_statements(script)) == len(split_statements(migration.sql))
+
+
+def test_real_migration_keeps_dollar_quoted_block():
+    migration = next(m for m in load_migrations() if m.name.endswith("02_add_bot_status.sql"))
+    statements = split_statements(migration.sql)
+    assert len(statements) == 6
+    assert statements[1].endswith("EXCEPTION WHEN duplicate_object THEN NULL;\nEND $$")
+
+
+def test_split_statements_quotes_and_comments():
+    sql = (
+        "SELECT 'a;''b';\n"
+        "SELECT E'it\\'s; \\\\';\n"
+        "SELECT \"semi;\"\"colon\" FROM t;\n"
+        "SELECT name' ; x' FROM t;\n"
+        "-- Kommentar; mit Semikolon\n"
+        "/* außen /* innen; */ weiter; */ SELECT 1;\n"
+        "CREATE FUNCTION f() RETURNS int AS $body$ BEGIN RETURN 1; END $body$ LANGUAGE plpgsql;\n"
+        "SELECT $$;$$, a$b$c;\n"
+        "-- nur Kommentar\n"
+    )
+    assert split_statements(sql) == [
+        "SELECT 'a;''b'",
+        "SELECT E'it\\'s; \\\\'",
+        'SELECT "semi;""colon" FROM t',
+        "SELECT name' ; x' FROM t",
+        "-- Kommentar; mit Semikolon\n/* außen /* innen; */ weiter; */ SELECT 1",
+        "CREATE FUNCTION f() RETURNS int AS $body$ BEGIN RETURN 1; END $body$ LANGUAGE plpgsql",
+        "SELECT $$;$$, a$b$c",
+    ]
+
+
+def test_make_rerunnable_rewrites():
+    script, rewritten = make_rerunnable(
+        "CREATE TABLE IF NOT EXISTS a (id int);\n"
+        "-- Index\nCREATE INDEX idx_a ON a (id);\n"
+        "CREATE INDEX ON a (id);\n"
+        "ALTER TABLE a ADD COLUMN note text;\n"
+        "ALTER TABLE a ADD CONSTRAINT a_id_check CHECK (id > 0);\n"
+        "CREATE FUNCTION f() RETURNS int AS $$ SELECT 1; $$ LANGUAGE sql;\n"
+        "INSERT INTO a VALUES (E'CREATE TABLE b;\\'');\n"
+    )
+    assert rewritten == 4
+    assert split_statements(script) == [
+        "CREATE TABLE IF NOT EXISTS a (id int)",
+        "-- Index\nCREATE INDEX IF NOT EXISTS idx_a ON a (id)",
+        "CREATE INDEX ON a (id)",
+        "ALTER TABLE a ADD COLUMN IF NOT EXISTS note text",
+        f"DO {DO_TAG} BEGIN\nALTER TABLE a ADD CONSTRAINT a_id_check CHECK (id > 0);\n"
+        f"EXCEPTION WHEN duplicate_object OR duplicate_table THEN NULL;\nEND {DO_TAG}",
+        "CREATE OR REPLACE FUNCTION f() RETURNS int AS $$ SELECT 1; $$ LANGUAGE sql",
+        "INSERT INTO a VALUES (E'CREATE TABLE b;\\'')",
+    ]
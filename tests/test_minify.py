@@ -0,0 +1,37 @@
+from ts_collector.minify import minify_source
+
+
+def test_jsx_text_keeps_comment_markers():
+    assert minify_source("const a = <p>Visit http://example.com for more</p>;\n", ".tsx") == \
+        "const a = <p>Visit http://example.com for more</p>;\n"
+    source = "const b = (\n  <div>\n    it's /* not */ a comment\n    <br/> and // this\n  </div>\n);\n"
+    assert minify_source(source, ".tsx") == "const b = (\n<div>\nit's /* not */ a comment\n<br/> and // this\n</div>\n);\n"
+
+
+def test_jsx_attributes_and_code_comments():
+    source = (
+        'return <a\n'
+        '  href="http://x.y" // Kommentar zwischen Attributen\n'
+        '  title="a // b"\n'
+        '>{items.map(i => <li key={i}>{i} /* Text */</li>) /* Code */}</a>; // Code\n'
+    )
+    assert minify_source(source, ".tsx") == (
+        'return <a\n'
+        'href="http://x.y"\n'
+        'title="a // b"\n'
+        '>{items.map(i => <li key={i}>{i} /* Text */</li>) }</a>;\n'
+    )
+
+
+def test_tsx_without_jsx():
+    # Generische Pfeilfunktion und Vergleiche sind kein JSX
+    assert minify_source("const f = <T,>(x: T) => x; // c\n", ".tsx") == "const f = <T,>(x: T) => x;\n"
+    assert minify_source("const g = a < b && c > d; /* c */\n", ".tsx") == "const g = a < b && c > d;\n"
+
+
+def test_regex_and_template_literals():
+    for extension in (".ts", ".tsx"):
+        assert minify_source("const r = /\\/\\/ not/.test(s); // c\n", extension) == "const r = /\\/\\/ not/.test(s);\n"
+        assert minify_source("const q = a / b / c; // c\n", extension) == "const q = a / b / c;\n"
+        assert minify_source("const t = `// ${x /* y */} /* z */`; // c\n", extension) == \
+            "const t = `// ${x /* y */} /* z */`;\n"
@@ -0,0 +1,22 @@
+import os
+
+from ts_collector.outline import OutlineIndex, extract_outline
+
+# "//" ist in .ts ein Kommentar bis zum Zeilenende, in .tsx JSX-Text
+SOURCE = "export function f() { return <p>// }</p>; }\nexport const b = 1;\n"
+
+
+def test_outline_depends_on_extension():
+    assert extract_outline(SOURCE, "a.tsx") == "export function f() {…}\nexport const b = …"
+    assert extract_outline(SOURCE, "a.ts") == "export function f() {…}"
+
+
+def test_index_keys_outlines_by_extension(tmp_path):
+    for name in ("a.ts", "a.tsx"):
+        (tmp_path / name).write_text(SOURCE, encoding="utf-8")
+    index = OutlineIndex(str(tmp_path), persistent=False)
+    for name in ("a.ts", "a.tsx"):
+        st = os.stat(tmp_path / name)
+        assert index.update(name, st, "same-digest", SOURCE) == extract_outline(SOURCE, name)
+        assert index.lookup(name, st) == ("same-digest", extract_outline(SOURCE, name))
+    assert index.extracted == 2
@@ -0,0 +1,24 @@
+from ts_collector.budget import estimate_tokens
+from ts_collector.cli import main
+
+
+def _write(root, rel_path, text):
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_token_budget_holds_for_dense_files(tmp_path, monkeypatch, capsys):
+    # Viele Satzzeichen: deutlich mehr Tokens pro Byte als üblicher Quelltext
+    for i in range(12):
+        _write(tmp_path, f"apps/backend/src/data{i}.ts", f"export const t{i} = [{','.join('[]' for _ in range(40))}];\n")
+    # Inhaltsgleiche Dateien werden als Verweis ausgegeben
+    for name in ("a", "b", "c"):
+        _write(tmp_path, f"apps/backend/src/very/deeply/nested/module/path/{name}.ts", "export const shared = 1;\n" * 5)
+    monkeypatch.chdir(tmp_path)
+
+    for budget in (300, 600, 1500):
+        main(["--sink", "stdout", "--no-cache", "--budget-tokens", str(budget)], default_profiles=("default",))
+        bundle = capsys.readouterr().out
+        assert "Path: " in bundle
+        assert estimate_tokens(bundle) <= budget
@@ -0,0 +1,32 @@
+import random
+
+from ts_collector.budget import estimate_tokens, utf8_len
+from ts_collector.sinks import ChunkedFileSink
+
+
+def _chunks_within_budget(sink, measure):
+    for path in sink.paths:
+        with open(path, encoding="utf-8", newline="") as f:
+            assert measure(f.read()) <= sink.budget, path
+
+
+def test_chunk_header_grows_with_usage(tmp_path):
+    # Der Kopf nennt den Verbrauch: hier wächst er beim zweiten Block von 2 auf 5 Stellen
+    for budget in range(10040, 10080):
+        sink = ChunkedFileSink(str(tmp_path / str(budget)), "bundle", budget)
+        sink.write_file("a.ts", "a")
+        sink.write_file("b.ts", "b" * 9971)
+        sink.close()
+        _chunks_within_budget(sink, utf8_len)
+
+
+def test_chunks_stay_within_budget(tmp_path):
+    rng = random.Random(0)
+    files = [(f"src/file{i}.ts", "x = 1;\n" * rng.randint(1, 20)) for i in range(300)]
+    for measure in (utf8_len, estimate_tokens):
+        for budget in (200, 999, 1000, 1005, 5000):
+            sink = ChunkedFileSink(str(tmp_path / f"{measure.__name__}-{budget}"), "bundle", budget, measure)
+            for rel_path, content in files:
+                sink.write_file(rel_path, content)
+            sink.close()
+            _chunks_within_budget(sink, measure)
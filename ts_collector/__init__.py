@@ -0,0 +1,59 @@
+"""
+Gemeinsame Collector-Engine für die copy_ts_code*.py-Skripte.
+
+Die Untermodule werden erst beim ersten Zugriff auf einen der Namen unten
+geladen, damit schlanke Einstiegspunkte wie der Daemon-Client (client.py)
+nicht die Startkosten der ganzen Engine tragen.
+"""
+import importlib
+
+# Öffentlicher Name -> Untermodul, das ihn definiert
+_EXPORTS = {
+    "BlockListSink": "sinks",
+    "ChunkedFileSink": "sinks",
+    "ClipboardSink": "sinks",
+    "DEFAULT_PROFILE": "profiles",
+    "FileSink": "sinks",
+    "GitError": "gitindex",
+    "ImportGraph": "imports",
+    "JsonlSink": "archive",
+    "MemorySink": "sinks",
+    "OutlineIndex": "outline",
+    "PROFILES": "profiles",
+    "Profile": "profiles",
+    "ProfileResult": "collector",
+    "SearchIndex": "search",
+    "Sink": "sinks",
+    "SinkError": "sinks",
+    "SnapshotCache": "cache",
+    "StdoutSink": "sinks",
+    "TarSink": "archive",
+    "WorkspaceError": "workspace",
+    "ZipSink": "archive",
+    "collect_profiles": "collector",
+    "collect_ts_file_content_recursively": "collector",
+    "discover_packages": "workspace",
+    "estimate_tokens": "budget",
+    "extract_outline": "outline",
+    "get_profiles": "profiles",
+    "minify_source": "minify",
+    "rank_files": "ranking",
+    "select_within_budget": "ranking",
+    "tokenize": "minify",
+    "workspace_profiles": "workspace",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,255 @@
+"""
+Archiv-Sinks: JSONL, tar und zip, jeweils mit Offset-Index.
+
+Neben dem Archiv wird <archiv>.index.json geschrieben. Er enthält für jede
+Datei den Byte-Offset und die Länge ihrer Daten im Archiv, damit
+nachgelagerte Werkzeuge eine einzelne Datei per seek() lesen können, ohne
+das ganze Archiv zu parsen:
+
+- jsonl: Offset/Länge der JSON-Zeile {"path": ..., "content": ...}
+- tar:   Offset/Länge des Dateiinhalts (unkomprimiertes tar)
+- zip:   Offset/Länge des Dateiinhalts (ZIP_STORED, also unkomprimiert)
+
+tar und zip nehmen SourceFile-Verweise entgegen. Ohne Minifizierung
+werden die Dateien dann nicht dekodiert, sondern direkt von Datei zu Datei
+kopiert (tar über os.sendfile im Kernel, zip über einen Blockpuffer, weil
+die CRC-Prüfsumme berechnet werden muss).
+
+Einträge aus Text (minifizierte Inhalte, Verweise auf inhaltsgleiche
+Dateien) erhalten ein festes Datum (BYTES_MTIME), damit derselbe Stand bei
+jedem Lauf byte-identische Archive ergibt; kopierte Dateien behalten ihr
+mtime.
+"""
+import json
+import os
+import shutil
+import struct
+import tarfile
+import time
+import zipfile
+
+from .reader import SourceFile
+from .sinks import Sink
+
+ARCHIVE_FORMATS = ("jsonl", "tar", "zip")
+INDEX_SUFFIX = ".index.json"
+INDEX_VERSION = 1
+_COPY_BUFFER = 1024 * 1024
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+# 1980-01-01 00:00 UTC, das früheste Datum, das zip speichern kann
+BYTES_MTIME = 315532800
+_ZIP_MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def index_path_for(archive_path):
+    return archive_path + INDEX_SUFFIX
+
+
+def _copy_file_range(src_fd, dst_fd, count):
+    """Kopiert count Bytes von src_fd nach dst_fd, wenn möglich ohne Umweg über Python."""
+    copied = 0
+    if hasattr(os, "sendfile"):
+        try:
+            while copied < count:
+                sent = os.sendfile(dst_fd, src_fd, copied, count - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return copied
+        except OSError:
+            if copied:
+                raise
+    while copied < count:
+        chunk = os.read(src_fd, min(_COPY_BUFFER, count - copied))
+        if not chunk:
+            break
+        os.write(dst_fd, chunk)
+        copied += len(chunk)
+    return copied
+
+
+class _ArchiveSink(Sink):
+    """Gemeinsame Basis: Lazy Open, Index, Notizen statt Text im Archiv."""
+
+    format_name = ""
+    accepts_source_files = False
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.entries = {}  # relativer Pfad -> {"offset", "length"}
+        self.notes = []
+
+    def _ensure_open(self):
+        if not self.is_open:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)) or ".", exist_ok=True)
+            self._open()
+            self.is_open = True
+
+    def write_file(self, rel_path, content):
+        self._ensure_open()
+        started = time.perf_counter()
+        if isinstance(content, SourceFile):
+            self._add_source(rel_path, content)
+        else:
+            self._add_bytes(rel_path, content.encode("utf-8"))
+        self.bytes_written += self.entries[rel_path]["length"]
+        self.emit_seconds += time.perf_counter() - started
+
+    def write_text(self, text):
+        """Freitext (z.B. die Liste gelöschter Dateien) landet im Index, nicht im Archiv."""
+        if text.strip():
+            self.notes.append(text.strip())
+
+    def _add_source(self, rel_path, source):
+        with open(source.abs_path, "rb") as f:
+            self._add_bytes(rel_path, f.read())
+
+    def _add_bytes(self, rel_path, data):
+        raise NotImplementedError
+
+    def _close(self):
+        self._finish_archive()
+        index = {
+            "version": INDEX_VERSION,
+            "format": self.format_name,
+            "archive": os.path.basename(self.path),
+            "files": self.entries,
+        }
+        if self.notes:
+            index["notes"] = self.notes
+        index_path = index_path_for(self.path)
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1, ensure_ascii=False)
+        return f"als {self.format_name}-Archiv nach {self.path} geschrieben (Index: {index_path})"
+
+    def _finish_archive(self):
+        raise NotImplementedError
+
+
+class JsonlSink(_ArchiveSink):
+    """Eine JSON-Zeile pro Datei: {"path": ..., "content": ...}."""
+
+    format_name = "jsonl"
+
+    def _open(self):
+        self._file = open(self.path, "wb")
+        self._offset = 0
+
+    def _add_bytes(self, rel_path, data):
+        line = json.dumps(
+            {"path": rel_path, "content": data.decode("utf-8")}, ensure_ascii=False,
+        ).encode("utf-8") + b"\n"
+        self._file.write(line)
+        self.entries[rel_path] = {"offset": self._offset, "length": len(line)}
+        self._offset += len(line)
+
+    def _finish_archive(self):
+        self._file.close()
+
+
+class TarSink(_ArchiveSink):
+    """Unkomprimiertes tar (PAX-Format für lange Pfade); Inhalte per sendfile."""
+
+    format_name = "tar"
+    accepts_source_files = True
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        self._offset = 0
+
+    def _write_all(self, data):
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        self._offset += len(data)
+
+    def _header(self, rel_path, size, mtime):
+        info = tarfile.TarInfo(rel_path)
+        info.size = size
+        info.mtime = int(mtime)
+        info.mode = 0o644
+        self._write_all(info.tobuf(format=tarfile.PAX_FORMAT, encoding="utf-8"))
+
+    def _pad(self, size):
+        remainder = size % tarfile.BLOCKSIZE
+        if remainder:
+            self._write_all(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+
+    def _add_bytes(self, rel_path, data):
+        self._header(rel_path, len(data), BYTES_MTIME)
+        self.entries[rel_path] = {"offset": self._offset, "length": len(data)}
+        self._write_all(data)
+        self._pad(len(data))
+
+    def _add_source(self, rel_path, source):
+        with open(source.abs_path, "rb") as f:
+            size = source.size
+            self._header(rel_path, size, os.fstat(f.fileno()).st_mtime)
+            self.entries[rel_path] = {"offset": self._offset, "length": size}
+            copied = _copy_file_range(f.fileno(), self._fd, size)
+        self._offset += copied
+        if copied < size:
+            # Datei ist seit der Prüfung geschrumpft: mit Nullen auffüllen, damit das Archiv gültig bleibt
+            self._write_all(tarfile.NUL * (size - copied))
+        self._pad(size)
+
+    def _finish_archive(self):
+        # Zwei leere Blöcke als Ende-Markierung, aufgefüllt auf ganze Records
+        self._write_all(tarfile.NUL * (tarfile.BLOCKSIZE * 2))
+        self._pad_record()
+        os.close(self._fd)
+
+    def _pad_record(self):
+        remainder = self._offset % tarfile.RECORDSIZE
+        if remainder:
+            self._write_all(tarfile.NUL * (tarfile.RECORDSIZE - remainder))
+
+
+class ZipSink(_ArchiveSink):
+    """zip mit ZIP_STORED, damit die Offsets im Index direkt auf die Daten zeigen."""
+
+    format_name = "zip"
+    accepts_source_files = True
+
+    def _open(self):
+        self._zip = zipfile.ZipFile(self.path, "w", compression=zipfile.ZIP_STORED, allowZip64=True)
+
+    def _info(self, rel_path, mtime):
+        if mtime == BYTES_MTIME:
+            date_time = _ZIP_MIN_DATE_TIME  # unabhängig von der Zeitzone
+        else:
+            date_time = max(time.localtime(mtime)[:6], _ZIP_MIN_DATE_TIME)
+        info = zipfile.ZipInfo(rel_path, date_time=date_time)
+        info.compress_type = zipfile.ZIP_STORED
+        info.external_attr = 0o644 << 16
+        return info
+
+    def _add_bytes(self, rel_path, data):
+        self._zip.writestr(self._info(rel_path, BYTES_MTIME), data)
+        self.entries[rel_path] = {"offset": None, "length": len(data)}
+
+    def _add_source(self, rel_path, source):
+        with open(source.abs_path, "rb") as src:
+            info = self._info(rel_path, os.fstat(src.fileno()).st_mtime)
+            info.file_size = source.size
+            with self._zip.open(info, "w", force_zip64=source.size > zipfile.ZIP64_LIMIT) as dst:
+                shutil.copyfileobj(src, dst, _COPY_BUFFER)
+        self.entries[rel_path] = {"offset": None, "length": info.file_size}
+
+    def _finish_archive(self):
+        infos = {info.filename: info for info in self._zip.infolist()}
+        self._zip.close()
+        # Datenoffset = Position des lokalen Headers + Headerlänge (inkl. Name und Extra-Feld)
+        with open(self.path, "rb") as f:
+            for rel_path, entry in self.entries.items():
+                info = infos[rel_path]
+                f.seek(info.header_offset)
+                fields = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+                name_length, extra_length = fields[-2], fields[-1]
+                entry["offset"] = info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+                entry["length"] = info.file_size
+
+
+ARCHIVE_SINKS = {"jsonl": JsonlSink, "tar": TarSink, "zip": ZipSink}
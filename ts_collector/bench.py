@@ -0,0 +1,334 @@
+"""
+Benchmark des Collectors über synthetische Monorepos.
+
+Erzeugt reproduzierbare Bäume (fester Seed) in einem temporären Ordner und
+misst die Phasen getrennt:
+
+- walk:   Durchlauf mit walk_files (inkl. Pruning und .gitignore)
+- read:   Lesen aller gefundenen Dateien mit read_files
+- format: Dekodieren und Formatieren der Blöcke ("Path: ...")
+- emit:   Schreiben der fertigen Blöcke in einen FileSink
+- total:  collect_profiles von Anfang bis Ende
+
+Jede Messung wird --repeat-mal wiederholt, berichtet wird das Minimum.
+Gemessen wird mit warmem Seitencache (ohne Root-Rechte lässt er sich nicht
+leeren). Das Ergebnis ist JSON und enthält den Commit, damit Läufe
+verschiedener Stände verglichen werden können.
+
+Aufruf:
+    python -m ts_collector.bench --sizes 1000,10000 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from .collector import collect_profiles, decode_content
+from .gitindex import GitError, current_commit
+from .profiles import Profile
+from .reader import DEFAULT_JOBS, read_files
+from .sinks import FileSink, format_header
+from .walker import DEFAULT_PRUNE_DIRS, walk_files
+
+DEFAULT_SIZES = (1_000, 10_000)
+DEFAULT_DEPTH = 4
+DEFAULT_MEAN_FILE_BYTES = 3_000
+# Anteil zusätzlicher Dateien in node_modules/, dist/ und per .gitignore ausgeschlossenen Ordnern
+DEFAULT_IGNORED_RATIO = 0.5
+FILES_PER_DIR = 20
+FANOUT = 8
+BENCH_ROOTS = ("apps/bench/src", "packages/bench-lib/src")
+BENCH_EXTENSIONS = (".ts", ".tsx", ".css")
+
+_TS_SNIPPETS = (
+    "import {{ Injectable }} from '@nestjs/common';\n",
+    "import type {{ Item{n} }} from '../types/item-{n}';\n",
+    "/**\n * Liefert den Wert {n} zurück.\n */\n",
+    "export interface Item{n} {{\n  id: string;\n  name: string;\n  count: number;\n}}\n",
+    "export function compute{n}(input: number[]): number {{\n  return input.reduce((a, b) => a + b * {n}, 0);\n}}\n",
+    "// TODO: Randfall {n} behandeln\n",
+    "export const label{n} = `Eintrag ${{{n}}}: ok`;\n",
+    "\n",
+)
+_CSS_SNIPPETS = (
+    ".item-{n} {{\n  display: flex;\n  margin: {n}px;\n}}\n",
+    "/* Abschnitt {n} */\n",
+    "@media (max-width: {n}px) {{\n  .item-{n} {{ display: none; }}\n}}\n",
+)
+
+
+def _make_content(rng, size, css):
+    snippets = _CSS_SNIPPETS if css else _TS_SNIPPETS
+    parts = []
+    total = 0
+    while total < size:
+        part = rng.choice(snippets).format(n=rng.randrange(1000))
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def _dir_path(index, depth):
+    """Ordnerpfad aus den Ziffern von index zur Basis FANOUT (Tiefe 1 bis depth)."""
+    parts = []
+    value = index
+    for _ in range(depth):
+        parts.append(f"mod{value % FANOUT}")
+        value //= FANOUT
+        if value == 0:
+            break
+    return "/".join(parts)
+
+
+def generate_tree(root, files, depth=DEFAULT_DEPTH, mean_size=DEFAULT_MEAN_FILE_BYTES,
+                  ignored_ratio=DEFAULT_IGNORED_RATIO, seed=0):
+    """
+    Erzeugt ein synthetisches Monorepo unter root.
+
+    Args:
+        root (str): Zielordner (wird angelegt).
+        files (int): Anzahl gesammelter Quelldateien.
+        depth (int): Maximale Ordnertiefe unterhalb der Startordner.
+        mean_size (int): Mittlere Dateigröße in Bytes (log-normalverteilt).
+        ignored_ratio (float): Zusätzliche Dateien in ignorierten Ordnern, relativ zu files.
+        seed (int): Seed für reproduzierbare Bäume.
+
+    Returns:
+        dict: Beschreibung des Baums (Dateien, Bytes, Ordner).
+    """
+    rng = random.Random(seed)
+    # Ein Vorrat an Inhalten hält die Erzeugung auch bei 500k Dateien schnell
+    pool = []
+    for i in range(256):
+        size = int(min(200_000, max(50, rng.lognormvariate(0, 0.8) * mean_size)))
+        css = i % 16 == 0
+        pool.append((_make_content(rng, size, css).encode("utf-8"), css))
+
+    dirs = max(1, -(-files // FILES_PER_DIR))
+    total_bytes = 0
+    created_dirs = set()
+
+    def write(rel_path, data):
+        abs_path = os.path.join(root, rel_path)
+        parent = os.path.dirname(abs_path)
+        if parent not in created_dirs:
+            os.makedirs(parent, exist_ok=True)
+            created_dirs.add(parent)
+        with open(abs_path, "wb") as f:
+            f.write(data)
+
+    for i in range(files):
+        dir_index = i % dirs
+        bench_root = BENCH_ROOTS[dir_index % len(BENCH_ROOTS)]
+        data, css = pool[rng.randrange(len(pool))]
+        extension = ".css" if css else rng.choice((".ts", ".ts", ".tsx"))
+        write(f"{bench_root}/{_dir_path(dir_index, depth)}/file{i}{extension}", data)
+        total_bytes += len(data)
+
+    ignored = int(files * ignored_ratio)
+    ignored_dirs = ("node_modules/pkg", "dist", "generated")
+    for i in range(ignored):
+        bench_root = BENCH_ROOTS[i % len(BENCH_ROOTS)]
+        ignored_dir = ignored_dirs[i % len(ignored_dirs)]
+        write(f"{bench_root}/{_dir_path(i % dirs, depth)}/{ignored_dir}/skip{i}.ts", pool[i % len(pool)][0])
+    for bench_root in BENCH_ROOTS:
+        write(f"{bench_root}/.gitignore", b"generated/\n")
+
+    return {"files": files, "ignored_files": ignored, "bytes": total_bytes, "dirs": len(created_dirs)}
+
+
+def prepare_tree(root, files, depth=DEFAULT_DEPTH, mean_size=DEFAULT_MEAN_FILE_BYTES,
+                 ignored_ratio=DEFAULT_IGNORED_RATIO, seed=0):
+    """
+    Wie generate_tree, verwendet aber einen vorhandenen Baum unter root
+    wieder, wenn er mit denselben Parametern erzeugt wurde. tree.json wird
+    zuletzt geschrieben; fehlt sie oder passt sie nicht (z.B. nach einem
+    abgebrochenen Lauf), wird der Baum neu erzeugt.
+
+    Returns:
+        dict: Beschreibung des Baums (siehe generate_tree).
+    """
+    params = {"files": files, "depth": depth, "mean_size": mean_size, "ignored_ratio": ignored_ratio, "seed": seed}
+    marker = os.path.join(root, "tree.json")
+    try:
+        with open(marker, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved["params"] == params:
+            return saved["tree"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    shutil.rmtree(root, ignore_errors=True)
+    tree = generate_tree(root, files, depth, mean_size, ignored_ratio, seed)
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump({"params": params, "tree": tree}, f)
+    return tree
+
+
+def _best_of(repeat, func):
+    best = None
+    value = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, value
+
+
+def _phase(seconds, files, size):
+    return {
+        "seconds": round(seconds, 6),
+        "files_per_second": round(files / seconds, 1) if seconds else None,
+        "mb_per_second": round(size / seconds / 1e6, 2) if seconds and size is not None else None,
+    }
+
+
+def benchmark_tree(root, repeat=3, jobs=DEFAULT_JOBS):
+    """
+    Misst alle Phasen auf einem erzeugten Baum.
+
+    Returns:
+        dict: Phase -> {"seconds", "files_per_second", "mb_per_second"}.
+    """
+    def walk():
+        found = []
+        for rel_root in BENCH_ROOTS:
+            for rel_path, entry in walk_files(root, rel_root, DEFAULT_PRUNE_DIRS, True):
+                if entry.name.endswith(BENCH_EXTENSIONS):
+                    found.append(rel_path)
+        return found
+
+    walk_seconds, found = _best_of(repeat, walk)
+
+    def read():
+        return [(rel_path, raw) for rel_path, raw in read_files(root, found, jobs)]
+
+    read_seconds, raws = _best_of(repeat, read)
+    size = sum(len(raw) for _, raw in raws if not isinstance(raw, Exception))
+
+    def format_blocks():
+        return [format_header(rel_path) + decode_content(raw, "ignore") + "\n\n"
+                for rel_path, raw in raws if not isinstance(raw, Exception)]
+
+    format_seconds, blocks = _best_of(repeat, format_blocks)
+    del raws
+
+    out_dir = tempfile.mkdtemp(prefix="ts-collector-emit-")
+    try:
+        def emit():
+            sink = FileSink(os.path.join(out_dir, "bundle.txt"))
+            for block in blocks:
+                sink.write_text(block)
+            sink.close()
+
+        emit_seconds, _ = _best_of(repeat, emit)
+        del blocks
+
+        profile = Profile(name="bench", directories=BENCH_ROOTS, extensions=BENCH_EXTENSIONS, encoding_errors="ignore")
+
+        def total():
+            # Fortschrittsmeldungen gehören zum realen Ablauf, landen hier aber im Speicher
+            with contextlib.redirect_stdout(io.StringIO()):
+                collect_profiles(
+                    root, [profile], jobs=jobs,
+                    sink_factory=lambda p: FileSink(os.path.join(out_dir, "total.txt")),
+                )[profile.name].sink.close()
+
+        total_seconds, _ = _best_of(repeat, total)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    return {
+        "walk": _phase(walk_seconds, len(found), None),
+        "read": _phase(read_seconds, len(found), size),
+        "format": _phase(format_seconds, len(found), size),
+        "emit": _phase(emit_seconds, len(found), size),
+        "total": _phase(total_seconds, len(found), size),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark des Collectors über synthetische Monorepos.")
+    parser.add_argument(
+        "--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), metavar="N,N,...",
+        help=f"Anzahl Quelldateien je Baum (Standard: {','.join(str(s) for s in DEFAULT_SIZES)}; bis 500000).",
+    )
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help=f"Maximale Ordnertiefe (Standard: {DEFAULT_DEPTH}).")
+    parser.add_argument(
+        "--mean-size", type=int, default=DEFAULT_MEAN_FILE_BYTES, metavar="BYTES",
+        help=f"Mittlere Dateigröße (Standard: {DEFAULT_MEAN_FILE_BYTES}).",
+    )
+    parser.add_argument(
+        "--ignored-ratio", type=float, default=DEFAULT_IGNORED_RATIO, metavar="R",
+        help=f"Zusätzliche Dateien in ignorierten Ordnern relativ zu N (Standard: {DEFAULT_IGNORED_RATIO}).",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen pro Messung (Standard: 3).")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, metavar="N", help="Parallele Leser.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed für die Baumerzeugung (Standard: 0).")
+    parser.add_argument("--workdir", metavar="DIR", help="Ordner für die erzeugten Bäume (Standard: temporär).")
+    parser.add_argument("--keep", action="store_true", help="Erzeugte Bäume nicht löschen.")
+    parser.add_argument("-o", "--output", metavar="FILE", help="JSON-Ergebnis in FILE statt auf stdout schreiben.")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError:
+        parser.error("--sizes erwartet eine kommagetrennte Liste von Zahlen.")
+    if not sizes or min(sizes) < 1 or args.repeat < 1 or args.depth < 1:
+        parser.error("--sizes, --repeat und --depth müssen mindestens 1 sein.")
+
+    try:
+        commit = current_commit(os.path.dirname(os.path.abspath(__file__)))
+    except GitError:
+        commit = None
+    report = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jobs": args.jobs,
+        "repeat": args.repeat,
+        "runs": [],
+    }
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="ts-collector-bench-")
+    try:
+        for files in sizes:
+            name = f"tree-{files}-d{args.depth}-m{args.mean_size}-i{args.ignored_ratio:g}-s{args.seed}"
+            root = os.path.join(workdir, name)
+            started = time.perf_counter()
+            tree = prepare_tree(root, files, args.depth, args.mean_size, args.ignored_ratio, args.seed)
+            print(f"Baum mit {files} Datei(en) bereit ({time.perf_counter() - started:.1f} s), messe ...", file=sys.stderr)
+            phases = benchmark_tree(root, args.repeat, args.jobs)
+            report["runs"].append({
+                "files": files, "depth": args.depth, "mean_size": args.mean_size,
+                "ignored_ratio": args.ignored_ratio, "seed": args.seed, "tree": tree, "phases": phases,
+            })
+            if not args.keep:
+                shutil.rmtree(root, ignore_errors=True)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Ergebnis nach {args.output} geschrieben.", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Größenbudgets für Bundles: Bytes oder geschätzte Tokens.
+
+Die Token-Schätzung kommt ohne Tokenizer-Download oder Netzwerkzugriff aus.
+Sie zerlegt Text grob so, wie BPE-Tokenizer Quelltext zerlegen:
+Buchstabenfolgen in Stücke von bis zu sechs Zeichen, Zahlen in Gruppen von
+bis zu drei Ziffern, Zeilenumbruch samt Einrückung als ein Token und jedes
+sonstige Zeichen einzeln. Für TypeScript liegt das erfahrungsgemäß nahe
+genug an echten Zählungen, um Chunks sicher unter einem Kontextfenster zu halten.
+"""
+import re
+
+_TOKEN_RE = re.compile(r"[A-Za-z]{1,6}|\d{1,3}|\n[ \t]*|[^\sA-Za-z\d]")
+
+BUDGET_UNITS = ("bytes", "tokens")
+
+
+def utf8_len(text):
+    """Länge von text in UTF-8-Bytes, ohne ASCII-Text zu kodieren."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def estimate_tokens(text):
+    """Schätzt die Anzahl der Tokens von text."""
+    return len(_TOKEN_RE.findall(text))
+
+
+def get_measure(unit):
+    """
+    Liefert die Messfunktion zu einer Budget-Einheit.
+
+    Args:
+        unit (str): "bytes" oder "tokens".
+
+    Returns:
+        callable: Funktion text -> int.
+    """
+    if unit == "tokens":
+        return estimate_tokens
+    if unit == "bytes":
+        return utf8_len
+    raise ValueError(f"Unbekannte Budget-Einheit: {unit}")
+
+
+def split_to_budget(text, limit, measure):
+    """
+    Teilt text an Zeilengrenzen in Stücke, die jeweils höchstens limit groß sind.
+    Einzelne Zeilen, die allein zu groß sind, werden innerhalb der Zeile getrennt.
+
+    Returns:
+        list: Teilstücke; zusammengefügt ergeben sie wieder text.
+    """
+    limit = max(1, limit)
+    pieces = []
+    current = []
+    current_size = 0
+    for line in text.splitlines(keepends=True):
+        size = measure(line)
+        if size > limit:
+            if current:
+                pieces.append("".join(current))
+                current, current_size = [], 0
+            # Proportional nach Zeichen aufteilen; Schätzung reicht hier aus
+            step = max(1, len(line) * limit // size)
+            pieces.extend(line[i:i + step] for i in range(0, len(line), step))
+            continue
+        if current and current_size + size > limit:
+            pieces.append("".join(current))
+            current, current_size = [], 0
+        current.append(line)
+        current_size += size
+    if current:
+        pieces.append("".join(current))
+    return pieces or [text]
@@ -0,0 +1,143 @@
+"""
+Persistenter Snapshot-Cache des Collectors.
+
+Ein Manifest (relativer Pfad -> Größe, mtime_ns, Inhalts-Hash) liegt im
+Projekt unter .ts_collector_cache/. Die Dateiinhalte werden
+inhaltsadressiert unter objects/ abgelegt. Stimmen Größe und mtime_ns
+einer Datei mit dem Manifest überein, wird sie aus dem Cache bedient,
+ohne die Quelldatei zu öffnen; außerdem lässt sich so das Delta seit dem
+letzten Snapshot bestimmen (--changed-only).
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+CACHE_DIR_NAME = ".ts_collector_cache"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def content_hash(raw):
+    """Schneller, kollisionsarmer Hash des Dateiinhalts (hex)."""
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _atomic_write(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SnapshotCache:
+    """
+    Manifest und Objektspeicher eines Projekts.
+
+    Attributes:
+        cache_dir (str): Absoluter Pfad des Cache-Ordners.
+        previous (dict): Manifest des letzten Laufs: Pfad -> (size, mtime_ns, hash).
+        current (dict): Manifest, das am Ende dieses Laufs gespeichert wird.
+        hits (int): Dateien, die aus dem Cache bedient wurden.
+        misses (int): Dateien, die neu gelesen werden mussten.
+        memory (dict): Hash -> Inhalt; nur mit keep_in_memory gefüllt, damit
+            lange laufende Prozesse unveränderte Dateien gar nicht mehr lesen.
+    """
+
+    def __init__(self, base_path, cache_dir=None, keep_in_memory=False):
+        self.cache_dir = os.path.abspath(cache_dir or os.path.join(base_path, CACHE_DIR_NAME))
+        self.objects_dir = os.path.join(self.cache_dir, "objects")
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_NAME)
+        self.previous, self._written_at_ns = self._load()
+        self.current = dict(self.previous)
+        self.hits = 0
+        self.misses = 0
+        self.keep_in_memory = keep_in_memory
+        self.memory = {}
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, 0
+        if data.get("version") != MANIFEST_VERSION:
+            return {}, 0
+        files = {path: tuple(entry) for path, entry in data.get("files", {}).items()}
+        return files, data.get("written_at_ns", 0)
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def lookup(self, rel_path, st):
+        """
+        Prüft, ob rel_path seit dem letzten Snapshot unverändert ist.
+
+        Dateien, deren mtime nicht vor dem Schreiben des letzten Manifests
+        liegt, gelten als unsicher (Änderung innerhalb derselben
+        Zeitstempel-Auflösung möglich) und werden neu gelesen.
+
+        Returns:
+            str | None: Hash des gecachten Inhalts oder None.
+        """
+        entry = self.previous.get(rel_path)
+        if entry is None:
+            return None
+        size, mtime_ns, digest = entry
+        if size != st.st_size or mtime_ns != st.st_mtime_ns or mtime_ns >= self._written_at_ns:
+            return None
+        return digest
+
+    def store(self, rel_path, st, raw):
+        """Legt den Inhalt im Objektspeicher ab und aktualisiert das Manifest. Gibt den Hash zurück."""
+        digest = content_hash(raw)
+        obj_path = self.object_path(digest)
+        if not os.path.exists(obj_path):
+            os.makedirs(os.path.dirname(obj_path), exist_ok=True)
+            _atomic_write(obj_path, raw)
+        if self.keep_in_memory:
+            self.memory[digest] = bytes(raw)  # mmap-Inhalte vom Dateisystem lösen
+        self.current[rel_path] = (st.st_size, st.st_mtime_ns, digest)
+        return digest
+
+    def is_changed(self, rel_path, digest):
+        """True, wenn rel_path neu ist oder sich der Inhalt seit dem letzten Snapshot geändert hat."""
+        entry = self.previous.get(rel_path)
+        return entry is None or entry[2] != digest
+
+    def forget(self, rel_paths):
+        """Entfernt gelöschte Dateien aus dem Manifest."""
+        for rel_path in rel_paths:
+            self.current.pop(rel_path, None)
+
+    def save(self):
+        """Schreibt das Manifest atomar und entfernt nicht mehr referenzierte Objekte."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        written_at_ns = time.time_ns()
+        data = {
+            "version": MANIFEST_VERSION,
+            "written_at_ns": written_at_ns,
+            "files": {path: list(entry) for path, entry in sorted(self.current.items())},
+        }
+        _atomic_write(self.manifest_path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+        live = {entry[2] for entry in self.current.values()}
+        for digest in {entry[2] for entry in self.previous.values()} - live:
+            try:
+                os.unlink(self.object_path(digest))
+            except OSError:
+                pass
+            self.memory.pop(digest, None)
+
+        # Der gespeicherte Stand ist der Ausgangspunkt für weitere Läufe desselben Prozesses (--watch)
+        self.previous = dict(self.current)
+        self._written_at_ns = written_at_ns
@@ -0,0 +1,804 @@
+"""
+Kommandozeile für den Collector. Wird von allen copy_ts_code*.py-Skripten
+mit dem jeweils passenden Standardprofil aufgerufen.
+"""
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+from .cache import CACHE_DIR_NAME, SnapshotCache
+from .archive import ARCHIVE_FORMATS, ARCHIVE_SINKS
+from .budget import get_measure
+from .collector import collect_profiles, profile_keep_dirs, union_roots, walk_profile_files
+from .daemon import serve
+from .gitindex import GitError, walk_order_key
+from .imports import CLOSURE_EXTENSIONS, ImportGraph
+from .outline import OUTLINE_DB_NAME, OutlineIndex
+from .profiles import DEFAULT_PROFILE, PROFILES, get_profiles, normalize_rel_dir
+from .ranking import (
+    content_tokens, focus_terms, format_omitted, import_in_degree, load_churn, profile_candidates, rank_files,
+    select_within_budget,
+)
+from .reader import DEFAULT_JOBS, DEFAULT_MAX_FILE_BYTES
+from .search import DEFAULT_MAX_SNIPPETS, SEARCH_DB_NAME, SearchIndex, compile_query, refresh_index, search
+from .stats import DEFAULT_TOP_FILES, RunStats
+from .sinks import ChunkedFileSink, ClipboardSink, FileSink, SinkError, StdoutSink
+from .walker import DEFAULT_PRUNE_DIRS
+from .watch import make_watcher, wait_for_changes
+from .workspace import WORKSPACE_FILE, WorkspaceError, workspace_profiles
+
+SINK_CHOICES = ("clipboard", "stdout", "file", "chunks") + ARCHIVE_FORMATS
+DEFAULT_CHUNK_BYTES = 400_000
+QUERY_COMMAND = "query"
+SERVE_COMMAND = "serve"
+# Unterordner des Cache-Ordners mit je einem Snapshot-Cache pro Paket (--workspace)
+WORKSPACE_CACHE_DIR = "packages"
+
+
+def build_parser(default_profiles, command=None):
+    parser = argparse.ArgumentParser(
+        description="Sammelt Quelldateien der konfigurierten Profile und kopiert sie als Bundle.",
+        epilog=f"Suche über den Trigramm-Index: %(prog)s {QUERY_COMMAND} MUSTER [--regex] [--bundle] [Optionen]. "
+               f"Resident-Daemon: %(prog)s {SERVE_COMMAND} [Optionen], Bundles holen mit copy_ts_code_client.py.",
+    )
+    if command is not None:
+        parser.prog = f"{parser.prog} {command}"
+        parser.epilog = None
+    if command == QUERY_COMMAND:
+        parser.description = "Durchsucht die Dateien der Profile über den Trigramm-Suchindex."
+        add_query_arguments(parser)
+    elif command == SERVE_COMMAND:
+        parser.description = (
+            "Startet den Collector-Daemon: Dateiliste, Inhalte und Bundles bleiben im Speicher "
+            "und werden per Dateiüberwachung aktuell gehalten. Ohne -p werden alle Profile bedient."
+        )
+    parser.add_argument(
+        "-p", "--profile", dest="profiles", action="append", metavar="NAME",
+        help=f"Profil, das gebündelt werden soll (mehrfach angebbar, Standard: {', '.join(default_profiles)}).",
+    )
+    parser.add_argument(
+        "--all-profiles", action="store_true",
+        help="Alle Profile in einem gemeinsamen Durchlauf bündeln.",
+    )
+    parser.add_argument(
+        "--workspace", action="store_true",
+        help=f"Statt der Profile aus profiles.py ein Bundle pro Paket aus {WORKSPACE_FILE} bilden "
+             "(-p wählt Pakete aus); die Pakete werden parallel in Worker-Prozessen gebündelt.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, metavar="N",
+        help="Anzahl der Worker-Prozesse für --workspace (Standard: Anzahl der CPU-Kerne).",
+    )
+    parser.add_argument(
+        "--sink", choices=SINK_CHOICES,
+        help="Ausgabeziel (Standard: file mit --output/--output-dir, sonst clipboard). "
+             "jsonl, tar und zip schreiben ein Archiv plus <archiv>.index.json mit Offsets.",
+    )
+    parser.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="Zieldatei für --sink file/jsonl/tar/zip (nur mit einem Profil).",
+    )
+    parser.add_argument(
+        "--output-dir", metavar="DIR",
+        help="Zielordner für --sink file (DIR/<profil>.txt), Archive (DIR/<profil>.<format>) und --sink chunks.",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, metavar="BYTES",
+        help=f"Maximale Größe pro Chunk für --sink chunks in Bytes (Standard: {DEFAULT_CHUNK_BYTES}).",
+    )
+    parser.add_argument(
+        "--chunk-tokens", type=int, metavar="N",
+        help="Budget pro Chunk in geschätzten Tokens statt Bytes (für --sink chunks).",
+    )
+    parser.add_argument(
+        "--budget-bytes", type=int, metavar="BYTES",
+        help="Passt ein Profil nicht in BYTES, werden die wichtigsten Dateien ausgewählt "
+             "(Ranking nach --focus, Import-Häufigkeit, Git-Churn und Aktualität); "
+             "die ausgelassenen Dateien stehen am Ende des Bundles.",
+    )
+    parser.add_argument(
+        "--budget-tokens", type=int, metavar="N",
+        help="Wie --budget-bytes, aber in geschätzten Tokens.",
+    )
+    parser.add_argument(
+        "--focus", metavar="BEGRIFFE",
+        help="Suchbegriffe für das Ranking (Leerzeichen oder Komma getrennt); "
+             "Dateien, deren Pfad sie enthält, werden bevorzugt.",
+    )
+    parser.add_argument(
+        "--changed-only", action="store_true",
+        help="Nur Dateien ausgeben, die seit dem letzten Snapshot neu sind oder sich geändert haben.",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help=f"Snapshot-Cache ({CACHE_DIR_NAME}/) weder lesen noch schreiben.",
+    )
+    parser.add_argument(
+        "--cache-dir", metavar="DIR",
+        help=f"Ort des Snapshot-Caches (Standard: <Projekt-Root>/{CACHE_DIR_NAME}).",
+    )
+    parser.add_argument(
+        "--no-dedupe", action="store_true",
+        help="Inhaltsgleiche Dateien jedes Mal vollständig ausgeben statt als Verweis auf die erste Kopie.",
+    )
+    parser.add_argument(
+        "--entry", action="append", metavar="FILE",
+        help="Nur FILE und alle (transitiv) importierten Dateien bündeln statt der Profilordner (mehrfach angebbar).",
+    )
+    parser.add_argument(
+        "--git", action="store_true",
+        help="Dateiliste aus dem Git-Index lesen statt die Ordner zu durchlaufen (Fallback: Durchlauf).",
+    )
+    parser.add_argument(
+        "--since", metavar="REF",
+        help="Nur Dateien bündeln, die sich seit dem Git-Ref REF geändert haben (impliziert --git).",
+    )
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="Kommentare, Leerzeilen und Einrückung aus .ts/.tsx/.css entfernen (Strings bleiben erhalten).",
+    )
+    parser.add_argument(
+        "--outline", action="store_true",
+        help="Nur die Gliederung der .ts/.tsx-Dateien ausgeben (Exporte, Klassen, Signaturen, Decorators; "
+             f"Rümpfe als {{…}}). Index unter {CACHE_DIR_NAME}/{OUTLINE_DB_NAME}.",
+    )
+    parser.add_argument(
+        "--index", action="store_true",
+        help=f"Beim Sammeln den Trigramm-Suchindex für '{QUERY_COMMAND}' aktualisieren "
+             f"({CACHE_DIR_NAME}/{SEARCH_DB_NAME}).",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="Weiterlaufen und nach jeder gespeicherten Änderung neu bündeln (Beenden mit Strg+C).",
+    )
+    parser.add_argument(
+        "--poll", action="store_true",
+        help="Im Watch-Modus per stat() abfragen statt inotify zu verwenden.",
+    )
+    parser.add_argument(
+        "--max-file-size", type=int, default=DEFAULT_MAX_FILE_BYTES, metavar="BYTES",
+        help=f"Größere Dateien überspringen (Standard: {DEFAULT_MAX_FILE_BYTES}, 0 = unbegrenzt).",
+    )
+    parser.add_argument(
+        "--no-ignore", action="store_true",
+        help=".gitignore- und .ignore-Dateien nicht berücksichtigen.",
+    )
+    parser.add_argument(
+        "--no-prune", action="store_true",
+        help=f"Auch in {', '.join(sorted(DEFAULT_PRUNE_DIRS))} absteigen.",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=DEFAULT_JOBS, metavar="N",
+        help=f"Anzahl paralleler Leser (Standard: {DEFAULT_JOBS}, 1 = sequentiell).",
+    )
+    parser.add_argument(
+        "--stats", nargs="?", const="table", choices=("table", "json"),
+        help="Zeit je Phase, Durchsatz, Dateien je Startordner und langsamste/größte Dateien ausgeben "
+             "(json: ohne Trennlinie auf stderr).",
+    )
+    parser.add_argument(
+        "--stats-file", metavar="DATEI",
+        help="Statistik in DATEI schreiben statt ausgeben (Format wie --stats, Standard: json).",
+    )
+    parser.add_argument(
+        "--stats-top", type=int, default=DEFAULT_TOP_FILES, metavar="N",
+        help=f"Anzahl der langsamsten/größten Dateien in --stats (Standard: {DEFAULT_TOP_FILES}).",
+    )
+    parser.add_argument(
+        "--list-profiles", action="store_true",
+        help="Listet die verfügbaren Profile auf und beendet das Skript.",
+    )
+    return parser
+
+
+def add_query_arguments(parser):
+    parser.add_argument("pattern", metavar="MUSTER", help="Gesuchter Text (mit --regex ein regulärer Ausdruck).")
+    parser.add_argument(
+        "-e", "--regex", action="store_true",
+        help="MUSTER als regulären Ausdruck (Python-Syntax) auswerten.",
+    )
+    parser.add_argument(
+        "-i", "--ignore-case", action="store_true",
+        help="Groß-/Kleinschreibung ignorieren.",
+    )
+    parser.add_argument(
+        "-l", "--files-only", action="store_true",
+        help="Nur die Pfade der Dateien mit Treffern ausgeben.",
+    )
+    parser.add_argument(
+        "--max-snippets", type=int, default=DEFAULT_MAX_SNIPPETS, metavar="N",
+        help=f"Höchstens N Trefferzeilen pro Datei anzeigen (Standard: {DEFAULT_MAX_SNIPPETS}).",
+    )
+    parser.add_argument(
+        "--bundle", action="store_true",
+        help="Die Dateien mit Treffern anschließend bündeln (Ausgabeziel wie sonst über --sink/--output).",
+    )
+
+
+def print_errors(errors):
+    if errors:
+        print("Einige Fehler sind aufgetreten:")
+        for err in errors:
+            print(f"- {err}")
+        print("-" * 30)
+
+
+def make_sink_factory(args, stdout):
+    """Liefert eine Funktion, die für jedes Profil den gewählten Sink erzeugt."""
+    if args.sink == "stdout":
+        return lambda profile: StdoutSink(stdout)
+    if args.sink == "file":
+        if args.output:
+            return lambda profile: FileSink(args.output)
+        return lambda profile: FileSink(os.path.join(args.output_dir, f"{profile.name}.txt"))
+    if args.sink in ARCHIVE_SINKS:
+        sink_class = ARCHIVE_SINKS[args.sink]
+        if args.output:
+            return lambda profile: sink_class(args.output)
+        return lambda profile: sink_class(os.path.join(args.output_dir, f"{profile.name}.{args.sink}"))
+    if args.sink == "chunks":
+        if args.chunk_tokens:
+            measure, budget, label = get_measure("tokens"), args.chunk_tokens, "Tokens"
+        else:
+            measure, budget, label = get_measure("bytes"), args.chunk_size or DEFAULT_CHUNK_BYTES, "Bytes"
+        return lambda profile: ChunkedFileSink(args.output_dir, profile.name, budget, measure, label)
+    return lambda profile: ClipboardSink()
+
+
+def validate_args(parser, args, profiles):
+    if args.jobs < 1:
+        parser.error("--jobs muss mindestens 1 sein.")
+    if args.stats_top < 1:
+        parser.error("--stats-top muss mindestens 1 sein.")
+    if args.max_file_size < 0:
+        parser.error("--max-file-size darf nicht negativ sein.")
+    if args.entry and (args.git or args.since):
+        parser.error("--entry ist mit --git und --since nicht kombinierbar.")
+    if args.workspace and (args.entry or args.watch or args.outline or args.index or args.all_profiles or args.stats):
+        parser.error("--workspace ist mit --entry, --watch, --outline, --index, --all-profiles, --stats und --stats-file "
+                     "nicht kombinierbar.")
+    if args.workers < 1:
+        parser.error("--workers muss mindestens 1 sein.")
+    if args.budget_bytes and args.budget_tokens:
+        parser.error("--budget-bytes und --budget-tokens schließen sich aus.")
+    if (args.budget_bytes is not None and args.budget_bytes < 1) or (args.budget_tokens is not None and args.budget_tokens < 1):
+        parser.error("Das Budget muss mindestens 1 sein.")
+    if args.focus and not (args.budget_bytes or args.budget_tokens):
+        parser.error("--focus wirkt nur zusammen mit --budget-bytes oder --budget-tokens.")
+    if args.outline and args.minify:
+        parser.error("--outline und --minify schließen sich aus.")
+    if args.watch and args.changed_only:
+        parser.error("--watch ist mit --changed-only nicht kombinierbar.")
+    if args.changed_only and args.no_cache:
+        parser.error("--changed-only benötigt den Snapshot-Cache und ist mit --no-cache nicht kombinierbar.")
+    if args.sink in ("file",) + ARCHIVE_FORMATS and not (args.output or args.output_dir):
+        parser.error(f"--sink {args.sink} erfordert --output oder --output-dir.")
+    if args.sink in ARCHIVE_FORMATS:
+        # Verweise auf inhaltsgleiche Dateien wären im Archiv keine gültigen Dateiinhalte
+        args.no_dedupe = True
+    if (args.chunk_size or args.chunk_tokens) and args.sink is None:
+        args.sink = "chunks"
+    if args.sink is None:
+        args.sink = "file" if (args.output or args.output_dir) else "clipboard"
+    if args.sink == "chunks":
+        if not args.output_dir:
+            parser.error("--sink chunks erfordert --output-dir.")
+        if args.chunk_size and args.chunk_tokens:
+            parser.error("--chunk-size und --chunk-tokens schließen sich aus.")
+        if (args.chunk_size is not None and args.chunk_size < 1) or (args.chunk_tokens is not None and args.chunk_tokens < 1):
+            parser.error("Das Chunk-Budget muss mindestens 1 sein.")
+    if len(profiles) > 1 and (args.sink in ("clipboard", "stdout") or args.output):
+        parser.error("Mehrere Profile erfordern --output-dir (jedes Profil bekommt ein eigenes Bundle).")
+
+
+def report_result(result, changed_only=False):
+    """Schließt den Sink eines Profils und gibt die Abschlussmeldung aus. Gibt False bei Fehlern zurück."""
+    extensions_str = ", ".join(result.profile.extensions)
+    print_errors(result.errors)
+    if result.skipped_files:
+        print(f"Übersprungen ({len(result.skipped_files)}):")
+        for rel_path, reason in result.skipped_files:
+            print(f"- {rel_path}: {reason}")
+        print("-" * 30)
+
+    if changed_only and result.processed_files_count == 0 and not result.deleted_files:
+        result.sink.close()
+        print("Keine Änderungen seit dem letzten Snapshot.")
+        return not result.errors
+
+    if result.processed_files_count == 0 and not result.deleted_files:
+        # Diese Meldung wird nur angezeigt, wenn *überhaupt nichts* verarbeitet werden konnte
+        result.sink.close()
+        print(f"Keine {extensions_str}-Dateien erfolgreich verarbeitet.")
+        if not result.errors:
+            print("Bitte überprüfen Sie die Ordner des Profils in 'ts_collector/profiles.py'.")
+        else:
+            print(f"Mögliche Ursachen: Ordner des Profils falsch, keine {extensions_str}-Dateien vorhanden oder Lesefehler.")
+        return False
+
+    try:
+        destination = result.sink.close()
+    except SinkError as e:
+        print(f"FEHLER: {e}")
+        if isinstance(result.sink, ClipboardSink):
+            print("Stellen Sie sicher, dass 'pyperclip' korrekt installiert ist und funktioniert.")
+            print("Unter Linux benötigen Sie evtl. 'xclip' oder 'xsel' (`sudo apt-get install xclip`).")
+        print("\nDer Inhalt wurde NICHT kopiert. Hier ist der Anfang des Inhalts (max 500 Zeichen):")
+        print(e.preview + "...")  # Zeige trotzdem einen Teil an
+        return False
+
+    print(f"Erfolg! {result.processed_files_count} Datei(en) wurden verarbeitet.")
+    if result.duplicate_files_count:
+        print(f"{result.duplicate_files_count} inhaltsgleiche Datei(en) wurden als Verweis ausgegeben.")
+    if result.minified_bytes_saved:
+        print(f"Minifizierung: {result.minified_bytes_saved} Bytes eingespart.")
+    if result.deleted_files:
+        print(f"{len(result.deleted_files)} Datei(en) wurden seit dem letzten Snapshot gelöscht.")
+    print(f"Der kombinierte Inhalt (Pfad + Code) aller gefundenen {extensions_str}-Dateien wurde {destination}.")
+    return True
+
+
+def collect_closure(project_root, entries, cache, cache_dir, persistent=True, stats=None):
+    """
+    Ermittelt die Import-Hülle der Einstiegsdateien.
+
+    Returns:
+        list | None: Relative Pfade in Entdeckungsreihenfolge oder None bei Fehlern.
+    """
+    entry_paths = []
+    for entry in entries:
+        rel_path = normalize_rel_dir(os.path.relpath(os.path.abspath(entry), project_root))
+        if not os.path.isfile(os.path.join(project_root, rel_path)):
+            print(f"FEHLER: Einstiegsdatei nicht gefunden: {entry}")
+            return None
+        entry_paths.append(rel_path)
+
+    started = time.perf_counter()
+    graph = ImportGraph(project_root, cache, cache_dir, persistent)
+    paths, errors = graph.closure(entry_paths)
+    if stats is not None:
+        stats.add("closure", time.perf_counter() - started)
+    print_errors(errors)
+    graph.save()
+    print(f"Import-Hülle: {len(paths)} Datei(en) ab {', '.join(entry_paths)} "
+          f"({graph.reused} Import-Listen aus dem Cache, {graph.parsed} neu ermittelt).")
+    return paths
+
+
+def select_by_budget(args, project_root, profiles, graph, paths=None, stats=None):
+    """
+    Ranking-Stufe für --budget-bytes/--budget-tokens: wählt pro Profil die
+    am höchsten bewerteten Dateien, die ins Budget passen.
+
+    Args:
+        graph (ImportGraph): Liefert die Import-Listen aus dem Cache.
+        paths (list): Kandidaten statt Durchlauf (z.B. Import-Hülle, --watch).
+
+    Returns:
+        dict: Profilname -> Selection (siehe ranking.py).
+    """
+    started = time.perf_counter()
+    budget, unit = (args.budget_tokens, "tokens") if args.budget_tokens else (args.budget_bytes, "bytes")
+    if paths is None:
+        prune_dirs = () if args.no_prune else DEFAULT_PRUNE_DIRS
+        files, _ = walk_profile_files(project_root, profiles, prune_dirs, not args.no_ignore)
+    else:
+        files = []
+        for rel_path in paths:
+            try:
+                files.append((rel_path, os.stat(os.path.join(project_root, rel_path))))
+            except OSError:
+                files.append((rel_path, None))
+    order = [rel_path for rel_path, _ in files]
+
+    in_degree, uncached = import_in_degree(graph, files)
+    churn = load_churn(project_root, args.cache_dir, not args.no_cache)
+    focus = focus_terms(args.focus)
+    candidates = {profile.name: profile_candidates(profile, files) for profile in profiles}
+    tokens = None
+    if unit == "tokens":
+        # Gezählt wird wie im Bundle, nicht über eine Umrechnung der Dateigröße
+        tokens = content_tokens(project_root, {p for c in candidates.values() for p, _ in c},
+                                args.max_file_size or None)
+    selections = {}
+    for profile in profiles:
+        ranked = rank_files(candidates[profile.name], focus, in_degree, churn)
+        selections[profile.name] = select_within_budget(ranked, budget, unit, order, tokens)
+    elapsed = time.perf_counter() - started
+    if stats is not None:
+        stats.add("rank", elapsed)
+
+    label = "Bytes" if unit == "bytes" else "Tokens (geschätzt)"
+    for profile in profiles:
+        selection = selections[profile.name]
+        print(f"Ranking '{profile.name}': {len(selection.selected)} von "
+              f"{len(selection.selected) + len(selection.omitted)} Datei(en) im Budget "
+              f"(ca. {selection.used} von {budget} {label}, alle Dateien ca. {selection.total}).")
+    print(f"Ranking in {elapsed * 1000:.1f} ms ({graph.reused} Import-Listen aus dem Cache, "
+          f"{uncached} Datei(en) ohne Import-Liste).")
+    return selections
+
+
+def run_collection(args, project_root, profiles, cache, bundle_stdout, paths=None, stats=None):
+    """
+    Sammelt alle Profile einmal mit den Optionen aus args.
+
+    Args:
+        paths (list): Explizite Dateiliste statt Durchlauf (für --watch).
+        stats (RunStats): Optional, für --stats.
+
+    Returns:
+        dict | None: Profilname -> ProfileResult oder None bei einem Abbruch.
+    """
+    if args.entry:
+        paths = collect_closure(project_root, args.entry, cache, args.cache_dir, not args.no_cache, stats)
+        if paths is None:
+            return None
+        # Die Profile liefern nur noch Namen und Dekodierung; die Dateien kommen aus der Closure
+        profiles = [replace(p, directories=(".",), extensions=CLOSURE_EXTENSIONS) for p in profiles]
+    selections = None
+    import_graph = None
+    if args.budget_bytes or args.budget_tokens:
+        import_graph = ImportGraph(project_root, cache, args.cache_dir, not args.no_cache)
+        selections = select_by_budget(args, project_root, profiles, import_graph, paths, stats)
+    outline = OutlineIndex(project_root, args.cache_dir, persistent=not args.no_cache) if args.outline else None
+    search_index = SearchIndex(project_root, args.cache_dir, persistent=not args.no_cache) if args.index else None
+    options = dict(
+        prune_dirs=() if args.no_prune else DEFAULT_PRUNE_DIRS,
+        use_ignore_files=not args.no_ignore,
+        jobs=args.jobs,
+        sink_factory=make_sink_factory(args, bundle_stdout),
+        cache=cache,
+        changed_only=args.changed_only,
+        dedupe=not args.no_dedupe,
+        source="git" if args.git or args.since else "walk",
+        since=args.since,
+        minify=args.minify,
+        max_file_size=args.max_file_size or None,
+        stats=stats,
+        outline=outline,
+        search_index=search_index,
+        # Import-Listen der gelesenen Dateien für das Ranking des nächsten Laufs
+        import_graph=import_graph if cache is not None else None,
+    )
+    try:
+        if selections is None:
+            results = collect_profiles(project_root, profiles, paths=paths, **options)
+        else:
+            # Jedes Profil bündelt nur seine eigene Auswahl
+            results = {}
+            for profile in profiles:
+                selection = selections[profile.name]
+                results.update(collect_profiles(project_root, [profile], paths=selection.selected, **options))
+                if selection.omitted:
+                    results[profile.name].sink.write_text(format_omitted(selection.omitted))
+        for index in (outline, search_index, import_graph):
+            if index is not None:
+                index.save()
+    except (SinkError, GitError) as e:
+        print(f"FEHLER: {e}")
+        return None
+    finally:
+        for index in (outline, search_index):
+            if index is not None:
+                index.close()
+    if outline is not None:
+        print(f"Gliederung: {outline.reused} aus dem Index, {outline.extracted} neu erstellt.")
+    if search_index is not None:
+        print(f"Suchindex: {search_index.indexed} Inhalt(e) neu aufgenommen.")
+    return results
+
+
+def report_results(results, cache, changed_only=False):
+    """Gibt die Abschlussmeldungen aller Profile aus. Gibt den Exit-Code zurück."""
+    print("-" * 30)
+    if cache is not None:
+        print(f"Snapshot-Cache: {cache.hits} Datei(en) aus dem Cache, {cache.misses} neu gelesen.")
+        cache.hits = cache.misses = 0
+
+    exit_code = 0
+    for result in results.values():
+        if len(results) > 1:
+            print(f"Profil '{result.profile.name}':")
+        if not report_result(result, changed_only):
+            exit_code = 1
+    return exit_code
+
+
+def print_stats(stats, results, mode, path=None):
+    """
+    Gibt die Statistik eines Laufs aus, nachdem alle Sinks geschlossen sind.
+    JSON geht ohne Trennlinie auf stderr, damit es nicht zwischen den
+    Fortschrittsmeldungen steht; mit path landet die Statistik in der Datei.
+    """
+    stats.finish(result.sink for result in results.values())
+    text = stats.to_json() if mode == "json" else stats.format_table()
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"Statistik geschrieben: {path}")
+    elif mode == "json":
+        print(text, file=sys.stderr)
+    else:
+        print("-" * 30)
+        print(text)
+
+
+def run_watch(args, project_root, profiles, cache, bundle_stdout, results):
+    """
+    Überwacht die Startordner und bündelt nach jeder Änderung neu, bis Strg+C gedrückt wird.
+
+    Geänderte oder gelöschte bekannte Dateien lösen einen Lauf über die
+    bekannte Dateiliste aus (kein Durchlauf; unveränderte Inhalte kommen aus
+    dem Speicher des Snapshot-Caches). Neue Dateien, neue Ordner und
+    Ereignis-Überläufe lösen einen vollständigen Lauf aus.
+    """
+    prune_dirs = () if args.no_prune else DEFAULT_PRUNE_DIRS
+    if args.entry:
+        roots, extensions = ["."], CLOSURE_EXTENSIONS
+    else:
+        roots = [r for r in union_roots(profiles) if os.path.isdir(os.path.join(project_root, r))]
+        extensions = tuple({e.lower() for p in profiles for e in p.extensions})
+    watcher, kind = make_watcher(project_root, roots, prune_dirs, profile_keep_dirs(profiles), polling=args.poll)
+    known = {rel_path for result in results.values() for rel_path in result.files}
+    print(f"Watch-Modus aktiv ({kind}). Beenden mit Strg+C.")
+
+    def is_relevant(rel_path):
+        return rel_path.lower().endswith(extensions)
+
+    try:
+        while True:
+            changed, rescan = wait_for_changes(watcher, is_relevant)
+            started = time.perf_counter()
+            existing = {p for p in changed if os.path.isfile(os.path.join(project_root, p))}
+            paths = None
+            if not (args.entry or rescan or existing - known):
+                known -= changed - existing
+                paths = sorted(known, key=walk_order_key)
+            # Fortschrittsmeldungen eines Laufs würden die Ausgabe fluten
+            stats = RunStats(args.stats_top) if args.stats else None
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = run_collection(args, project_root, profiles, cache, bundle_stdout, paths, stats)
+            listed = ", ".join(sorted(changed)[:3]) + (" ..." if len(changed) > 3 else "")
+            print(f"[{time.strftime('%H:%M:%S')}] Änderung erkannt: {listed or 'Ordnerstruktur'}")
+            if results is None:
+                continue
+            known = {rel_path for result in results.values() for rel_path in result.files}
+            report_results(results, cache)
+            if stats is not None:
+                print_stats(stats, results, args.stats, args.stats_file)
+            print(f"Neu gebündelt in {time.perf_counter() - started:.2f} s.")
+    except KeyboardInterrupt:
+        print("\nWatch-Modus beendet.")
+    finally:
+        watcher.close()
+
+
+def _build_package(args, project_root, profile):
+    """
+    Worker-Prozess für --workspace: bündelt ein Paket.
+
+    Jedes Paket hat einen eigenen Snapshot-Cache, weil parallele Prozesse
+    sonst gegenseitig ihr Manifest überschreiben würden.
+
+    Returns:
+        dict: name, files, bytes, seconds, exit_code und die Meldungen (log).
+    """
+    started = time.perf_counter()
+    # sys.stdout ist hier ggf. schon auf stderr umgelenkt (--sink stdout, siehe main)
+    bundle_stdout = sys.__stdout__
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        cache = None
+        if not args.no_cache:
+            cache_root = args.cache_dir or os.path.join(project_root, CACHE_DIR_NAME)
+            cache = SnapshotCache(project_root, os.path.join(cache_root, WORKSPACE_CACHE_DIR, profile.name))
+        results = run_collection(args, project_root, [profile], cache, bundle_stdout)
+        exit_code = 1 if results is None else report_results(results, cache, args.changed_only)
+    result = results[profile.name] if results else None
+    return {
+        "name": profile.name,
+        "files": result.processed_files_count if result else 0,
+        "bytes": result.sink.bytes_written if result else 0,
+        "seconds": time.perf_counter() - started,
+        "exit_code": exit_code,
+        "log": log.getvalue(),
+    }
+
+
+def run_workspace(args, project_root, profiles):
+    """
+    Bündelt jedes Paket des Workspaces in einem eigenen Worker-Prozess und
+    gibt Dateien, Größe und Dauer pro Paket aus.
+
+    Returns:
+        int: Exit-Code (1, wenn ein Paket fehlgeschlagen ist).
+    """
+    workers = min(args.workers, len(profiles))
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_build_package, args, project_root, profile) for profile in profiles]
+        summaries = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    exit_code = 0
+    for summary in summaries:
+        if summary["exit_code"]:
+            exit_code = 1
+            print(f"Paket '{summary['name']}':")
+            print(summary["log"].strip())
+    print("-" * 30)
+    width = max(len("Paket"), *(len(summary["name"]) for summary in summaries))
+    print(f"{'Paket':<{width}}  {'Dateien':>7}  {'KB':>8}  {'Zeit':>7}")
+    for summary in summaries:
+        status = "  FEHLER" if summary["exit_code"] else ""
+        print(f"{summary['name']:<{width}}  {summary['files']:>7}  {summary['bytes'] / 1024:>8.1f}  "
+              f"{summary['seconds']:>5.2f} s{status}")
+    print(f"{len(summaries)} Paket(e) mit {workers} Worker-Prozess(en) in {elapsed:.2f} s gebündelt.")
+    return exit_code
+
+
+def run_query(args, project_root, profiles, cache, bundle_stdout, stats=None):
+    """
+    Beantwortet eine Suche über den Trigramm-Index. Vorher wird der Index mit
+    den aktuellen Dateien der Profile abgeglichen (nur Geändertes wird gelesen).
+    Mit --bundle werden die Dateien mit Treffern anschließend gebündelt.
+
+    Returns:
+        int: Exit-Code (1, wenn nichts gefunden wurde oder ein Fehler auftrat).
+    """
+    try:
+        compiled, alternatives = compile_query(args.pattern, args.regex, args.ignore_case)
+    except re.error as e:
+        print(f"FEHLER: Ungültiger regulärer Ausdruck: {e}")
+        return 1
+
+    started = time.perf_counter()
+    index = SearchIndex(project_root, args.cache_dir, persistent=not args.no_cache)
+    try:
+        paths, errors = refresh_index(
+            index, project_root, profiles,
+            prune_dirs=() if args.no_prune else DEFAULT_PRUNE_DIRS,
+            use_ignore_files=not args.no_ignore,
+            jobs=args.jobs,
+            max_file_size=args.max_file_size or None,
+        )
+        refreshed = time.perf_counter()
+        hits, candidates = search(index, project_root, paths, compiled, alternatives, args.max_snippets)
+    finally:
+        index.close()
+    finished = time.perf_counter()
+
+    print_errors(errors)
+    for hit in hits:
+        if args.files_only:
+            print(hit.path)
+            continue
+        for number, snippet in hit.lines:
+            print(f"{hit.path}:{number}: {snippet}")
+        if hit.count > len(hit.lines):
+            print(f"{hit.path}: ... {hit.count - len(hit.lines)} weitere Trefferzeile(n)")
+    print(
+        f"{sum(h.count for h in hits)} Trefferzeile(n) in {len(hits)} Datei(en); "
+        f"{candidates} von {len(paths)} Datei(en) laut Index Kandidaten "
+        f"(Abgleich {(refreshed - started) * 1000:.1f} ms, {index.indexed} neu indiziert; "
+        f"Suche {(finished - refreshed) * 1000:.1f} ms).",
+        file=sys.stderr,
+    )
+    if not hits:
+        return 1
+    if not args.bundle:
+        return 0
+
+    print("-" * 30)
+    results = run_collection(args, project_root, profiles, cache, bundle_stdout, [h.path for h in hits], stats)
+    if results is None:
+        return 1
+    exit_code = report_results(results, cache)
+    if stats is not None:
+        print_stats(stats, results, args.stats, args.stats_file)
+    return exit_code
+
+
+def main(argv=None, default_profiles=(DEFAULT_PROFILE,)):
+    if argv is None:
+        argv = sys.argv[1:]
+    command = argv[0] if argv and argv[0] in (QUERY_COMMAND, SERVE_COMMAND) else None
+    query = command == QUERY_COMMAND
+    parser = build_parser(default_profiles, command)
+    args = parser.parse_args(argv[1:] if command else argv)
+    if args.stats_file and not args.stats:
+        args.stats = "json"
+
+    if args.workspace:
+        try:
+            profiles = workspace_profiles(os.getcwd(), args.profiles)
+        except WorkspaceError as e:
+            parser.error(str(e))
+    else:
+        if args.all_profiles or (command == SERVE_COMMAND and not args.profiles) or args.list_profiles:
+            names = list(PROFILES)
+        else:
+            names = args.profiles or list(default_profiles)
+        try:
+            profiles = get_profiles(names)
+        except KeyError as e:
+            parser.error(e.args[0])
+
+    if args.list_profiles:
+        for profile in profiles:
+            print(f"{profile.name}: {', '.join(profile.directories)} ({', '.join(profile.extensions)})")
+        return
+    if query:
+        if args.entry or args.watch or args.changed_only:
+            parser.error("--entry, --watch und --changed-only sind mit query nicht kombinierbar.")
+        if args.max_snippets < 0:
+            parser.error("--max-snippets darf nicht negativ sein.")
+    if command == SERVE_COMMAND:
+        if args.entry or args.watch or args.changed_only or args.git or args.since or args.no_cache:
+            parser.error("--entry, --watch, --changed-only, --git, --since und --no-cache "
+                         "sind mit serve nicht kombinierbar.")
+        if (args.outline or args.index or args.minify or args.no_dedupe or args.sink or args.output
+                or args.output_dir or args.chunk_size or args.chunk_tokens):
+            parser.error("Ausgabeoptionen gelten beim Client, nicht beim Daemon (serve).")
+        if args.jobs < 1:
+            parser.error("--jobs muss mindestens 1 sein.")
+        if args.max_file_size < 0:
+            parser.error("--max-file-size darf nicht negativ sein.")
+    elif not query or args.bundle:
+        validate_args(parser, args, profiles)
+
+    # Beim Stdout-Sink gehören die Fortschrittsmeldungen auf stderr
+    bundle_stdout = sys.stdout
+    redirect = contextlib.redirect_stdout(sys.stderr) if args.sink == "stdout" else contextlib.nullcontext()
+    with redirect:
+        project_root = os.getcwd()  # Nimmt an, dass das Skript im Projekt-Root ausgeführt wird
+        if not query:
+            print(f"Projekt-Root erkannt als: {project_root}")
+
+        if command == SERVE_COMMAND:
+            cache = SnapshotCache(project_root, args.cache_dir, keep_in_memory=True)
+            sys.exit(serve(
+                project_root, profiles, cache, args.cache_dir,
+                prune_dirs=() if args.no_prune else DEFAULT_PRUNE_DIRS,
+                use_ignore_files=not args.no_ignore,
+                jobs=args.jobs,
+                max_file_size=args.max_file_size or None,
+                polling=args.poll,
+            ))
+
+        if args.workspace and not query:
+            exit_code = run_workspace(args, project_root, profiles)
+            if exit_code:
+                sys.exit(exit_code)
+            print("Skript beendet.")
+            return
+
+        cache = None if args.no_cache else SnapshotCache(project_root, args.cache_dir, keep_in_memory=args.watch)
+        stats = RunStats(args.stats_top) if args.stats else None
+        if query:
+            exit_code = run_query(args, project_root, profiles, cache, bundle_stdout, stats)
+            if exit_code:
+                sys.exit(exit_code)
+            return
+        results = run_collection(args, project_root, profiles, cache, bundle_stdout, stats=stats)
+        if results is None:
+            sys.exit(1)
+        exit_code = report_results(results, cache, args.changed_only)
+        if stats is not None:
+            print_stats(stats, results, args.stats, args.stats_file)
+
+        if args.watch:
+            run_watch(args, project_root, profiles, cache, bundle_stdout, results)
+            return
+
+        if exit_code:
+            sys.exit(exit_code)  # Beendet das Skript mit einem Fehlercode
+
+        print("Skript beendet.")
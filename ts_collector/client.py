@@ -0,0 +1,181 @@
+"""
+Schlanker Client für den Collector-Daemon (copy_ts_code.py serve).
+
+Der Client lädt neben der Standardbibliothek nur cache.py (sinks.py erst für
+die Zwischenablage) und schickt eine Anfrage über den Unix-Socket des
+Daemons; das Bundle kommt fertig aus dessen Speicher.
+So entfallen pro Aufruf der Import der Engine, der Verzeichnisdurchlauf und
+das Lesen der Dateien.
+
+Protokoll (eine Verbindung pro Anfrage):
+    Anfrage: eine JSON-Zeile, z.B. {"profile": "backend"},
+        {"paths": ["apps/backend/src/main.ts"]}, {"command": "status"}
+        oder {"command": "stop"}; optional "minify" und "dedupe".
+    Antwort: eine JSON-Kopfzeile mit "ok" und "bytes", danach genau "bytes"
+        Bytes Bundle (UTF-8). Bei "ok": false steht der Grund in "error".
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+
+from .cache import CACHE_DIR_NAME
+
+DAEMON_SOCKET_NAME = "daemon.sock"
+# sun_path ist unter Linux 108 Bytes lang (inkl. abschließendem Nullbyte), unter macOS 104
+MAX_SOCKET_PATH_BYTES = 100
+SERVE_HINT = "python copy_ts_code.py serve"
+
+
+def daemon_socket_path(project_root, cache_dir=None):
+    """
+    Pfad des Daemon-Sockets: <cache-ordner>/daemon.sock, bei zu langen
+    Pfaden ein Projekt-spezifischer Name im temporären Ordner.
+    """
+    cache_dir = os.path.abspath(cache_dir or os.path.join(project_root, CACHE_DIR_NAME))
+    path = os.path.join(cache_dir, DAEMON_SOCKET_NAME)
+    if len(os.fsencode(path)) <= MAX_SOCKET_PATH_BYTES:
+        return path
+    digest = hashlib.blake2b(os.fsencode(cache_dir), digest_size=8).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"ts_collector-{digest}.sock")
+
+
+def send_request(socket_path, request, timeout=None):
+    """
+    Schickt eine Anfrage an den Daemon.
+
+    Returns:
+        tuple: (Kopf als dict, Bundle als bytes)
+
+    Raises:
+        OSError: Wenn kein Daemon erreichbar ist oder die Verbindung abbricht.
+        ValueError: Bei einer unlesbaren Antwort.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reader:
+            header = json.loads(reader.readline())
+            body = reader.read(header.get("bytes", 0))
+    if len(body) != header.get("bytes", 0):
+        raise ValueError("Antwort des Daemons ist unvollständig.")
+    return header, body
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Holt ein Bundle vom laufenden Collector-Daemon "
+                    f"(starten mit: {SERVE_HINT}).",
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        "-p", "--profile", metavar="NAME",
+        help="Profil, dessen Bundle geholt wird (Standard: das Standardprofil des Daemons).",
+    )
+    target.add_argument(
+        "--paths", nargs="+", metavar="PATH",
+        help="Genau diese Dateien bündeln (relativ zum Projekt-Root).",
+    )
+    target.add_argument("--status", action="store_true", help="Zustand des Daemons anzeigen.")
+    target.add_argument("--stop", action="store_true", help="Daemon beenden.")
+    parser.add_argument("--minify", action="store_true", help="Bundle minifiziert anfordern.")
+    parser.add_argument("--no-dedupe", action="store_true", help="Inhaltsgleiche Dateien vollständig ausgeben.")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("-o", "--output", metavar="FILE", help="Bundle in diese Datei schreiben.")
+    output.add_argument("--stdout", action="store_true", help="Bundle auf die Standardausgabe schreiben.")
+    parser.add_argument(
+        "--cache-dir", metavar="DIR",
+        help=f"Cache-Ordner des Daemons (Standard: {CACHE_DIR_NAME} im Projekt-Root).",
+    )
+    parser.add_argument("--socket", metavar="PATH", help="Socket des Daemons (Standard: aus --cache-dir).")
+    return parser
+
+
+def _request_from_args(args):
+    if args.status:
+        return {"command": "status"}
+    if args.stop:
+        return {"command": "stop"}
+    request = {"minify": args.minify, "dedupe": not args.no_dedupe}
+    if args.paths:
+        request["paths"] = args.paths
+    elif args.profile:
+        request["profile"] = args.profile
+    return request
+
+
+def _deliver(args, header, body):
+    """Gibt das Bundle aus. Returns: Beschreibung des Ziels."""
+    if args.stdout:
+        sys.stdout.buffer.write(body)
+        sys.stdout.buffer.flush()
+        return "auf die Standardausgabe geschrieben"
+    if args.output:
+        parent = os.path.dirname(args.output)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with open(args.output, "wb") as f:
+            f.write(body)
+        return f"nach {args.output} geschrieben"
+    from .sinks import ClipboardSink  # erst hier, damit --stdout/-o schlank bleiben
+    sink = ClipboardSink()
+    sink.write_text(body.decode("utf-8"))
+    return sink.close()
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    socket_path = args.socket or daemon_socket_path(os.getcwd(), args.cache_dir)
+    # Beim Bundle auf stdout gehören die Meldungen auf stderr
+    log = sys.stderr if args.stdout else sys.stdout
+    try:
+        header, body = send_request(socket_path, _request_from_args(args))
+    except OSError as e:
+        print(f"FEHLER: Kein Daemon erreichbar unter {socket_path} ({e}). Starten mit: {SERVE_HINT}", file=log)
+        sys.exit(2)
+    except ValueError as e:
+        print(f"FEHLER: {e}", file=log)
+        sys.exit(2)
+
+    if not header.get("ok"):
+        print(f"FEHLER: {header.get('error', 'unbekannter Fehler')}", file=log)
+        sys.exit(1)
+    if args.status:
+        for key, value in header.items():
+            if key not in ("ok", "bytes"):
+                print(f"{key}: {value}", file=log)
+        return
+    if args.stop:
+        print("Daemon wird beendet.", file=log)
+        return
+
+    errors = header.get("errors", [])
+    if errors:
+        print("Einige Fehler sind aufgetreten:", file=log)
+        for err in errors:
+            print(f"- {err}", file=log)
+    for skipped in header.get("skipped", []):
+        print(f"Übersprungen: {skipped}", file=log)
+    if not body:
+        print("Keine Dateien gefunden, nichts auszugeben.", file=log)
+        sys.exit(1)
+    try:
+        target = _deliver(args, header, body)
+    except OSError as e:
+        print(f"FEHLER beim Schreiben des Bundles: {e}", file=log)
+        sys.exit(1)
+    except Exception as e:  # SinkError der Zwischenablage (sinks.py wird erst in _deliver geladen)
+        print(f"FEHLER: {e}", file=log)
+        sys.exit(1)
+    source = "aus dem Speicher" if header.get("cached") else "neu gebündelt"
+    print(
+        f"Erfolg! {header.get('files', 0)} Datei(en) ({header['bytes'] / 1024:.1f} KB, {source}, "
+        f"{header.get('elapsed_ms', 0):.1f} ms im Daemon) {target}.",
+        file=log,
+    )
+    if errors:
+        sys.exit(1)
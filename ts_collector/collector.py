@@ -0,0 +1,528 @@
+"""
+Collector-Engine: durchläuft die Vereinigung aller Startordner der
+angefragten Profile genau einmal, liest jede passende Datei höchstens
+einmal und verteilt den Inhalt auf die Bundles aller Profile.
+"""
+import os
+import time
+from dataclasses import dataclass, field
+from itertools import chain
+
+from .cache import content_hash
+from .gitindex import GitError, IndexEntry, changed_since, is_git_checkout, list_index_files
+from .minify import minify_with_savings
+from .outline import OUTLINE_EXTENSIONS
+from .profiles import Profile
+from .reader import DEFAULT_JOBS, SkippedFile, SourceFile, read_files, read_source
+from .sinks import BlockListSink, Sink
+from .stats import RunStats
+from .walker import DEFAULT_PRUNE_DIRS, walk_files
+
+
+@dataclass
+class ProfileResult:
+    """
+    Ergebnis eines Profils nach dem gemeinsamen Durchlauf.
+
+    Attributes:
+        profile (Profile): Das zugehörige Profil.
+        sink (Sink): Ausgabeziel, in das die Dateien geschrieben wurden.
+        content_blocks (list): Strings im Format "Path: ...\\n\\n{content}\\n\\n"
+            (nur gefüllt, wenn ohne eigenen Sink gesammelt wurde).
+        processed_files_count (int): Anzahl erfolgreich verarbeiteter Dateien.
+        errors (list): Fehlermeldungen, die dieses Profil betreffen.
+        deleted_files (list): Seit dem letzten Snapshot gelöschte Dateien (nur mit Cache).
+        duplicate_files_count (int): Dateien, die als Verweis auf eine inhaltsgleiche
+            frühere Datei ausgegeben wurden.
+        minified_bytes_saved (int): Durch die Minifizierung eingesparte Bytes.
+        files (list): Relative Pfade aller gefundenen Dateien des Profils in
+            Bundle-Reihenfolge (auch übersprungene).
+        skipped_files (list): (relativer Pfad, Grund) für Binärdateien und
+            Dateien über der Größengrenze.
+    """
+    profile: Profile
+    sink: Sink = None
+    content_blocks: list = field(default_factory=list)
+    processed_files_count: int = 0
+    errors: list = field(default_factory=list)
+    deleted_files: list = field(default_factory=list)
+    duplicate_files_count: int = 0
+    minified_bytes_saved: int = 0
+    files: list = field(default_factory=list)
+    skipped_files: list = field(default_factory=list)
+
+    def bundle_text(self):
+        """Fügt alle Blöcke zusammen; überflüssige Leerzeilen am Ende werden entfernt."""
+        return "".join(self.content_blocks).strip()
+
+
+def is_under(rel_path, rel_dir):
+    """Prüft, ob rel_path gleich rel_dir ist oder darunter liegt (POSIX-Pfade)."""
+    if rel_dir == ".":
+        return True
+    return rel_path == rel_dir or rel_path.startswith(rel_dir + "/")
+
+
+def union_roots(profiles):
+    """
+    Bildet die minimale Menge an Startordnern, die alle Profile abdeckt.
+    Ordner, die bereits unter einem anderen Startordner liegen, entfallen,
+    damit kein Teilbaum doppelt durchlaufen wird.
+
+    Args:
+        profiles (list): Liste von Profile-Objekten.
+
+    Returns:
+        list: Sortierte, relative POSIX-Pfade.
+    """
+    all_dirs = sorted({d for p in profiles for d in p.normalized_directories()})
+    roots = []
+    for rel_dir in all_dirs:
+        if not any(is_under(rel_dir, root) for root in roots):
+            roots.append(rel_dir)
+    return roots
+
+
+def profile_keep_dirs(profiles):
+    """Explizit konfigurierte Ordner (und ihre Elternordner); sie werden nie verworfen."""
+    keep_dirs = set()
+    for p in profiles:
+        for rel_dir in p.normalized_directories():
+            parts = rel_dir.split("/")
+            keep_dirs.update("/".join(parts[:i]) for i in range(1, len(parts) + 1))
+    return keep_dirs
+
+
+def decode_content(raw, encoding_errors):
+    """
+    Dekodiert Dateiinhalt als UTF-8 und vereinheitlicht Zeilenenden wie
+    open(..., 'r') im Textmodus.
+
+    Raises:
+        UnicodeDecodeError: Bei encoding_errors="strict" und ungültigem UTF-8.
+    """
+    text = str(raw, "utf-8", encoding_errors)  # auch für mmap-Inhalte, ohne Zwischenkopie
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _matching_profiles(rel_path, lower_name, profile_dirs):
+    return [
+        name for name, (dirs, extensions) in profile_dirs.items()
+        if lower_name.endswith(extensions) and any(is_under(rel_path, d) for d in dirs)
+    ]
+
+
+def walk_profile_files(base_path, profiles, prune_dirs=DEFAULT_PRUNE_DIRS, use_ignore_files=True):
+    """
+    Durchläuft die Startordner der Profile, ohne Dateien zu lesen (für
+    Suchindex und Ranking).
+
+    Returns:
+        tuple: (Liste von (relativer Pfad, os.stat_result oder None) in
+            Durchlaufreihenfolge, durchlaufene Startordner)
+    """
+    profile_dirs = {p.name: (p.normalized_directories(), tuple(e.lower() for e in p.extensions)) for p in profiles}
+    roots = [r for r in union_roots(profiles) if os.path.isdir(os.path.join(base_path, r))]
+    keep_dirs = profile_keep_dirs(profiles)
+    files = []
+    for root in roots:
+        for rel_path, entry in walk_files(base_path, root, prune_dirs, use_ignore_files, keep_dirs):
+            if not _matching_profiles(rel_path, entry.name.lower(), profile_dirs):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                st = None
+            files.append((rel_path, st))
+    return files, roots
+
+
+# Kürzere Dateien werden auch bei gleichem Inhalt vollständig ausgegeben,
+# weil der Verweis nicht kürzer wäre als der Inhalt selbst.
+MIN_DEDUPE_CHARS = 80
+
+
+class _ProfileStream:
+    """
+    Reihenfolgepuffer eines Profils: Dateien werden in der Reihenfolge des
+    Profils an den Sink übergeben, auch wenn sie in anderer Reihenfolge
+    gelesen wurden. Zurückgehalten werden nur vorzeitig eingetroffene Dateien.
+    """
+
+    def __init__(self, result, order, dedupe=False):
+        self.result = result
+        self.order = order
+        self.position = 0
+        self.pending = {}
+        self.dedupe = dedupe
+        self.first_path_by_digest = {}
+
+    def offer(self, rel_path, content, digest=None):
+        """
+        content=None markiert eine Datei, die übersprungen wird (z.B. Lesefehler).
+        digest ist der Inhalts-Hash für die Deduplizierung (optional).
+        """
+        self.pending[rel_path] = (content, digest)
+        while self.position < len(self.order) and self.order[self.position] in self.pending:
+            next_path = self.order[self.position]
+            next_content, next_digest = self.pending.pop(next_path)
+            self.position += 1
+            if next_content is None:
+                continue
+            self.result.processed_files_count += 1
+            if self.dedupe and next_digest is not None and len(next_content) >= MIN_DEDUPE_CHARS:
+                first_path = self.first_path_by_digest.setdefault(next_digest, next_path)
+                if first_path != next_path:
+                    self.result.sink.write_duplicate(next_path, first_path)
+                    self.result.duplicate_files_count += 1
+                    continue
+            self.result.sink.write_file(next_path, next_content)
+
+
+def collect_profiles(base_path, profiles, prune_dirs=DEFAULT_PRUNE_DIRS, use_ignore_files=True, jobs=DEFAULT_JOBS,
+                     sink_factory=None, cache=None, changed_only=False, dedupe=False, source="walk", since=None,
+                     minify=False, paths=None, max_file_size=None, stats=None, outline=None,
+                     search_index=None, import_graph=None):
+    """
+    Sammelt die Bundles mehrerer Profile in einem einzigen Durchlauf.
+
+    Args:
+        base_path (str): Der Basispfad (Projekt-Root).
+        profiles (list): Liste von Profile-Objekten.
+        prune_dirs (iterable): Ordnernamen, in die nicht abgestiegen wird.
+        use_ignore_files (bool): .gitignore-/.ignore-Regeln berücksichtigen.
+        jobs (int): Anzahl paralleler Leser (1 = sequentiell).
+        sink_factory (callable): Erzeugt für ein Profil den Sink, in den die
+            Dateien geschrieben werden, sobald sie gelesen sind. Ohne Angabe
+            werden die Blöcke in ProfileResult.content_blocks gesammelt.
+            Die Sinks werden nicht geschlossen; das übernimmt der Aufrufer.
+        cache (SnapshotCache): Optionaler Snapshot-Cache. Unveränderte Dateien
+            werden aus dem Cache gelesen, das Manifest wird am Ende gespeichert.
+        changed_only (bool): Nur Dateien ausgeben, die seit dem letzten
+            Snapshot neu sind oder sich geändert haben (erfordert cache).
+        dedupe (bool): Inhaltsgleiche Dateien nur einmal ausgeben; spätere
+            Kopien erscheinen als einzeiliger Verweis auf die erste.
+        source (str): "walk" durchläuft die Verzeichnisse, "git" liest die
+            Dateiliste aus dem Git-Index (plus nicht ignorierte neue Dateien).
+            Ist base_path kein Git-Checkout, wird auf "walk" zurückgefallen.
+        since (str): Nur Dateien aufnehmen, die sich seit diesem Git-Ref
+            geändert haben (setzt einen Git-Checkout voraus).
+        minify (bool): Kommentare und überflüssige Leerzeichen aus .ts-, .tsx-
+            und .css-Dateien entfernen; String-Literale bleiben unverändert.
+        paths (list): Explizite Dateiliste (relative Pfade, in Ausgabereihenfolge)
+            statt Verzeichnisdurchlauf, z.B. die Import-Hülle aus imports.py.
+        max_file_size (int): Dateien über dieser Größe in Bytes werden
+            übersprungen (None = unbegrenzt). Binärdateien werden immer übersprungen.
+        stats (RunStats): Optionales Objekt, in dem Phasenzeiten und
+            Dateigrößen erfasst werden (--stats).
+        outline (OutlineIndex): Statt der Inhalte nur die Gliederung der .ts-
+            und .tsx-Dateien ausgeben; andere Dateien und Dateien ohne
+            Deklarationen entfallen. Unveränderte Dateien werden direkt aus
+            dem Index bedient, ohne sie zu lesen.
+        search_index (SearchIndex): Optionaler Trigramm-Index, in den jede
+            gelesene Datei aufgenommen wird (für den query-Unterbefehl).
+        import_graph (ImportGraph): Optional; nimmt die Import-Angaben jeder
+            gelesenen .ts- und .tsx-Datei auf (für das Ranking späterer Läufe).
+
+    Returns:
+        dict: Profilname -> ProfileResult, in der Reihenfolge von profiles.
+
+    Raises:
+        GitError: Wenn since angegeben ist und git die Änderungen nicht ermitteln kann.
+    """
+    results = {}
+    for p in profiles:
+        result = ProfileResult(profile=p)
+        result.sink = sink_factory(p) if sink_factory else BlockListSink(result.content_blocks)
+        results[p.name] = result
+    profile_dirs = {p.name: (p.normalized_directories(), tuple(e.lower() for e in p.extensions)) for p in profiles}
+
+    all_extensions = sorted({e for _, extensions in profile_dirs.values() for e in extensions})
+    print(f"Skript gestartet. Suche rekursiv nach {', '.join(all_extensions)}-Dateien in:")
+
+    # Fehlende Startordner pro Profil melden (auch wenn sie unter einem
+    # existierenden Startordner eines anderen Profils liegen würden).
+    for p in profiles:
+        for rel_dir in profile_dirs[p.name][0]:
+            if not os.path.isdir(os.path.join(base_path, rel_dir)):
+                error_msg = f"WARNUNG: Startverzeichnis nicht gefunden oder kein Verzeichnis: {rel_dir}"
+                results[p.name].errors.append(error_msg)
+
+    keep_dirs = profile_keep_dirs(profiles)
+
+    if stats is None:
+        stats = RunStats()
+    enumerate_started = time.perf_counter()
+
+    # Phase 1: Vereinigung der Startordner genau einmal durchlaufen (nur Metadaten).
+    roots = []
+    for root in union_roots(profiles):
+        print(f"- Startordner: {root}")
+        if not os.path.isdir(os.path.join(base_path, root)):
+            print(f"  WARNUNG: Startverzeichnis nicht gefunden oder kein Verzeichnis: {root}")
+            continue
+        roots.append(root)
+
+    changed_paths = changed_since(base_path, since, roots) if since else None
+    entries = None
+    if paths is not None:
+        entries = [(rel_path, IndexEntry(os.path.join(base_path, rel_path))) for rel_path in paths]
+    elif source == "git" or since:
+        if is_git_checkout(base_path):
+            try:
+                entries = list_index_files(base_path, roots, prune_dirs, keep_dirs)
+            except GitError as e:
+                print(f"WARNUNG: {e}")
+        else:
+            print("WARNUNG: Kein Git-Checkout gefunden.")
+        if entries is None:
+            print("  -> Verwende stattdessen den Verzeichnisdurchlauf.")
+    if entries is None:
+        entries = (item for root in roots for item in walk_files(base_path, root, prune_dirs, use_ignore_files, keep_dirs))
+
+    found_files = []  # (relativer Pfad, Profilnamen), in Durchlaufreihenfolge
+    file_stats = {}  # relativer Pfad -> os.stat_result (nur mit Cache oder Index)
+    # Mit since oder paths fehlen Dateien absichtlich; sie gelten nicht als gelöscht
+    walked_roots = roots if changed_paths is None and paths is None else []
+    for rel_path, entry in entries:
+        if changed_paths is not None and rel_path not in changed_paths:
+            continue
+        lower_name = entry.name.lower()
+        if outline is not None and not lower_name.endswith(OUTLINE_EXTENSIONS):
+            continue
+        names = _matching_profiles(rel_path, lower_name, profile_dirs)
+        if names:
+            found_files.append((rel_path, names))
+            if cache is not None or outline is not None or search_index is not None:
+                try:
+                    file_stats[rel_path] = entry.stat()  # DirEntry cached den Stat
+                except OSError:
+                    pass
+
+    # Phase 2: Reihenfolge jedes Profils festlegen (Ordnerreihenfolge des
+    # Profils, innerhalb eines Ordners Durchlaufreihenfolge).
+    streams = {}
+    for p in profiles:
+        dirs, _ = profile_dirs[p.name]
+        ordered = []
+        for rel_path, names in found_files:
+            if p.name in names:
+                dir_index = next(i for i, d in enumerate(dirs) if is_under(rel_path, d))
+                ordered.append((dir_index, rel_path))
+        ordered.sort(key=lambda item: item[0])  # stabil: Durchlaufreihenfolge bleibt erhalten
+        results[p.name].files = [rel_path for _, rel_path in ordered]
+        streams[p.name] = _ProfileStream(results[p.name], results[p.name].files, dedupe)
+
+    # Unveränderte Dateien werden aus dem Cache bedient; mit --changed-only
+    # werden sie gar nicht erst gelesen.
+    names_by_path = dict(found_files)
+    for index in (outline, search_index):
+        if index is not None:
+            _forget_deleted(index, profile_dirs, walked_roots, names_by_path)
+    # Archiv-Sinks übernehmen die Dateien ungelesen, sofern der Inhalt
+    # nicht verändert (Minifizierung) oder verglichen (Dedupe, Delta) werden muss
+    source_only = not (minify or dedupe or changed_only or outline or search_index) and all(
+        getattr(result.sink, "accepts_source_files", False) for result in results.values()
+    )
+    cached_digests = {}
+    if cache is not None and not source_only:
+        for rel_path, st in file_stats.items():
+            digest = cache.lookup(rel_path, st)
+            if digest is not None:
+                cached_digests[rel_path] = digest
+
+    # Gelesen wird in der Reihenfolge des ersten Profils, danach die übrigen
+    # Dateien. Das erste Profil wird so ohne Zwischenpuffer gestreamt.
+    read_order = []
+    seen = set()
+    for stream in streams.values():
+        for rel_path in stream.order:
+            if rel_path in seen:
+                continue
+            seen.add(rel_path)
+            if changed_only and rel_path in cached_digests:
+                for name in names_by_path[rel_path]:
+                    streams[name].offer(rel_path, None)
+                continue
+            read_order.append(rel_path)
+    # Gliederungen unveränderter Dateien kommen direkt aus dem Index
+    indexed = []
+    if outline is not None:
+        for rel_path in read_order:
+            hit = outline.lookup(rel_path, file_stats.get(rel_path))
+            if hit is not None:
+                indexed.append((rel_path, hit))
+        if indexed:
+            skip = {rel_path for rel_path, _ in indexed}
+            read_order = [rel_path for rel_path in read_order if rel_path not in skip]
+    source_paths = {rel_path: cache.object_path(digest) for rel_path, digest in cached_digests.items()}
+    # Inhalte, die der Cache bereits im Speicher hält (--watch), werden nicht erneut gelesen
+    in_memory = []
+    if cache is not None and cache.memory:
+        in_memory = [(rel_path, cache.memory[cached_digests[rel_path]]) for rel_path in read_order
+                     if cached_digests.get(rel_path) in cache.memory]
+        if in_memory:
+            skip = {rel_path for rel_path, _ in in_memory}
+            read_order = [rel_path for rel_path in read_order if rel_path not in skip]
+
+    stats.add("enumerate", time.perf_counter() - enumerate_started)
+
+    # Phase 3: Jede Datei genau einmal lesen, dekodieren und an die Sinks geben.
+    # Der Durchlauf ist hier bereits abgeschlossen, weil die Reihenfolge der
+    # Profile und die Cache-Abfragen alle Pfade brauchen. Der Thread-Pool in
+    # read_files überlappt nur das Lesen mit Dekodierung und Sink-Ausgabe.
+    for rel_path, (digest, text) in indexed:
+        for name in names_by_path[rel_path]:
+            streams[name].offer(rel_path, text or None, digest)
+    read_seconds = {}
+    reads = read_files(base_path, read_order, jobs, source_paths, max_file_size, read_seconds, source_only)
+    for rel_path, raw in stats.timed_iter("read", chain(in_memory, reads)):
+        names = names_by_path[rel_path]
+        print(f"  -> Verarbeite: {rel_path}")
+        digest = cached_digests.get(rel_path)
+        if digest is not None and isinstance(raw, OSError):
+            # Objekt fehlt im Cache: auf die Quelldatei zurückfallen
+            del cached_digests[rel_path]
+            digest = None
+            try:
+                raw = read_source(os.path.join(base_path, rel_path), max_file_size)
+            except (OSError, SkippedFile) as e:
+                raw = e
+        if isinstance(raw, SkippedFile):
+            print(f"     Übersprungen: {raw}")
+            for name in names:
+                results[name].skipped_files.append((rel_path, str(raw)))
+                streams[name].offer(rel_path, None)
+            continue
+        if isinstance(raw, SourceFile):
+            stats.record_file(rel_path, next((r for r in roots if is_under(rel_path, r)), "."), raw.size,
+                              read_seconds.get(rel_path, 0.0))
+            for name in names:
+                streams[name].offer(rel_path, raw)
+            continue
+        if cache is not None and not isinstance(raw, OSError):
+            if rel_path in cached_digests:
+                cache.hits += 1
+                if cache.keep_in_memory:
+                    cache.memory[digest] = bytes(raw)
+            elif rel_path in file_stats:
+                cache.misses += 1
+                digest = cache.store(rel_path, file_stats[rel_path], raw)
+                if changed_only and not cache.is_changed(rel_path, digest):
+                    for name in names:
+                        streams[name].offer(rel_path, None)
+                    continue
+        if isinstance(raw, OSError):
+            error_msg = f"FEHLER: Konnte Datei nicht lesen: {rel_path} - {raw}"
+            print(f"     {error_msg}")
+            for name in names:
+                results[name].errors.append(error_msg)
+                streams[name].offer(rel_path, None)
+            continue
+        if (dedupe or outline is not None or search_index is not None or import_graph is not None) and digest is None:
+            digest = content_hash(raw)
+        if search_index is not None:
+            started = time.perf_counter()
+            search_index.update(rel_path, file_stats.get(rel_path), digest, raw)
+            stats.add("index", time.perf_counter() - started)
+        if import_graph is not None:
+            started = time.perf_counter()
+            import_graph.record(rel_path, digest, raw)
+            stats.add("rank", time.perf_counter() - started)
+        root = next((r for r in roots if is_under(rel_path, r)), ".")
+        stats.record_file(rel_path, root, len(raw), read_seconds.get(rel_path, 0.0))
+
+        decoded = {}
+        for name in names:
+            mode = results[name].profile.encoding_errors
+            if mode not in decoded:
+                started = time.perf_counter()
+                try:
+                    decoded[mode] = (decode_content(raw, mode), 0)
+                except UnicodeDecodeError as e:
+                    decoded[mode] = (e, 0)
+                stats.add("decode", time.perf_counter() - started)
+                if minify and not isinstance(decoded[mode][0], UnicodeDecodeError):
+                    started = time.perf_counter()
+                    decoded[mode] = minify_with_savings(decoded[mode][0], rel_path)
+                    stats.add("minify", time.perf_counter() - started)
+                    print(f"     Minifiziert: {decoded[mode][1]} Bytes eingespart")
+                if outline is not None and not isinstance(decoded[mode][0], UnicodeDecodeError):
+                    started = time.perf_counter()
+                    text = outline.update(rel_path, file_stats.get(rel_path), digest, decoded[mode][0])
+                    decoded[mode] = (text or None, 0)
+                    stats.add("outline", time.perf_counter() - started)
+            content, saved = decoded[mode]
+            if isinstance(content, UnicodeDecodeError):
+                results[name].errors.append(f"FEHLER: Konnte Datei nicht lesen: {rel_path} - {content}")
+                content = None
+            else:
+                results[name].minified_bytes_saved += saved
+            started = time.perf_counter()
+            streams[name].offer(rel_path, content, digest)
+            stats.add_offer(time.perf_counter() - started)
+        del raw, decoded
+
+    if not found_files:
+        print("  -> Keine passenden Dateien in den angegebenen Verzeichnissen oder deren Unterverzeichnissen gefunden.")
+
+    if cache is not None:
+        _record_deletions(cache, results, profile_dirs, walked_roots, names_by_path, changed_only)
+        cache.save()
+
+    stats.finish(result.sink for result in results.values())
+    return results
+
+
+def _forget_deleted(index, profile_dirs, walked_roots, names_by_path):
+    """Entfernt Dateien, die es unter den durchlaufenen Startordnern nicht mehr gibt, aus einem SQLite-Index."""
+    index.forget([
+        rel_path for rel_path in index.paths
+        if rel_path not in names_by_path
+        and any(is_under(rel_path, root) for root in walked_roots)
+        and _matching_profiles(rel_path, rel_path.rsplit("/", 1)[-1].lower(), profile_dirs)
+    ])
+
+
+def _record_deletions(cache, results, profile_dirs, walked_roots, names_by_path, changed_only):
+    """Ermittelt seit dem letzten Snapshot gelöschte Dateien und entfernt sie aus dem Manifest."""
+    deleted = []
+    for rel_path in cache.previous:
+        if rel_path in names_by_path or not any(is_under(rel_path, root) for root in walked_roots):
+            continue
+        names = _matching_profiles(rel_path, rel_path.rsplit("/", 1)[-1].lower(), profile_dirs)
+        if not names:
+            continue  # Gehört zu einem anderen Profil, das in diesem Lauf nicht gesammelt wurde
+        deleted.append(rel_path)
+        for name in names:
+            results[name].deleted_files.append(rel_path)
+    cache.forget(deleted)
+
+    if changed_only:
+        for result in results.values():
+            if result.deleted_files:
+                lines = "".join(f"- {rel_path}\n" for rel_path in sorted(result.deleted_files))
+                result.sink.write_text(f"Gelöscht seit dem letzten Snapshot:\n{lines}\n")
+
+
+def collect_ts_file_content_recursively(base_path, relative_start_dirs):
+    """
+    Sammelt Pfade und Inhalte von .ts-Dateien rekursiv in den angegebenen
+    Startverzeichnissen und deren Unterverzeichnissen.
+
+    Args:
+        base_path (str): Der Basispfad (Projekt-Root), von dem aus das Skript läuft.
+        relative_start_dirs (list): Eine Liste von relativen Pfaden zu den
+                                     Startordnern für die rekursive Suche.
+
+    Returns:
+        tuple: Ein Tuple enthaltend:
+            - list: Eine Liste von Strings, jeder formatiert als "Path: ... \\n\\n Content... \\n\\n".
+            - int: Die Anzahl der erfolgreich verarbeiteten Dateien.
+            - list: Eine Liste von Fehlermeldungen.
+    """
+    profile = Profile(name="adhoc", directories=tuple(relative_start_dirs), extensions=(".ts",))
+    result = collect_profiles(base_path, [profile])[profile.name]
+    return result.content_blocks, result.processed_files_count, result.errors
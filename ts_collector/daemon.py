@@ -0,0 +1,298 @@
+"""
+Resident Collector-Daemon (copy_ts_code.py serve).
+
+Der Daemon hält Dateiliste, Dateiinhalte (Snapshot-Cache mit
+keep_in_memory) und fertige Bundles im Speicher und beantwortet Anfragen des
+Clients (client.py, copy_ts_code_client.py) über einen Unix-Socket. Ein
+Bundle, dessen Dateien sich nicht geändert haben, wird unverändert aus dem
+Speicher geschickt: kein Durchlauf, kein stat(), kein Lesen.
+
+Ein Hintergrund-Thread überwacht die Startordner (watch.py):
+- geänderte oder gelöschte bekannte Dateien verwerfen nur die Bundles der
+  betroffenen Profile; die nächste Anfrage bündelt über die bekannte
+  Dateiliste neu, unveränderte Inhalte kommen aus dem Speicher,
+- neue Dateien, neue Ordner und Ereignis-Überläufe verwerfen die
+  Dateiliste; die nächste Anfrage löst einen vollständigen Durchlauf aus.
+
+Änderungen werden nach dem Entprellintervall der Überwachung sichtbar
+(siehe watch.DEBOUNCE_SECONDS). Anfragen werden nacheinander bearbeitet.
+"""
+import contextlib
+import io
+import json
+import os
+import socketserver
+import threading
+import time
+
+from .client import daemon_socket_path, send_request
+from .collector import collect_profiles, is_under, profile_keep_dirs, union_roots
+from .gitindex import walk_order_key
+from .profiles import DEFAULT_PROFILE, Profile, normalize_rel_dir
+from .reader import DEFAULT_JOBS
+from .sinks import MemorySink
+from .walker import DEFAULT_PRUNE_DIRS
+from .watch import make_watcher, wait_for_changes
+
+# Pseudo-Profil für {"paths": [...]}: jede Endung, Dekodierung wie bei den Quellprofilen
+PATHS_PROFILE = Profile(name="paths", directories=(".",), extensions=("",), encoding_errors="ignore")
+
+
+class CollectorDaemon:
+    """
+    Zustand des Daemons. Alle Methoden außer watch_forever werden unter
+    self.lock aufgerufen (siehe _Handler und watch_forever).
+
+    Attributes:
+        known (set | None): Bekannte Dateien aller Profile; None erzwingt
+            beim nächsten Bündeln einen vollständigen Durchlauf.
+        bundles (dict): (Profilname, minify, dedupe) -> (Kopf, Bundle-Bytes).
+        changes (int): Anzahl der verarbeiteten Änderungsmeldungen.
+    """
+
+    def __init__(self, base_path, profiles, cache, prune_dirs=DEFAULT_PRUNE_DIRS, use_ignore_files=True,
+                 jobs=DEFAULT_JOBS, max_file_size=None):
+        self.base_path = base_path
+        self.profiles = {p.name: p for p in profiles}
+        self.cache = cache
+        self.prune_dirs = prune_dirs
+        self.use_ignore_files = use_ignore_files
+        self.jobs = jobs
+        self.max_file_size = max_file_size
+        self.known = None
+        self.bundles = {}
+        self.changes = 0
+        self.requests = 0
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self._profile_dirs = {
+            p.name: (p.normalized_directories(), tuple(e.lower() for e in p.extensions)) for p in profiles
+        }
+        self.extensions = tuple({ext for _, extensions in self._profile_dirs.values() for ext in extensions})
+
+    def _collect(self, profiles, minify, dedupe, paths=None):
+        # Fortschrittsmeldungen des Collectors gehören nicht ins Daemon-Protokoll
+        with contextlib.redirect_stdout(io.StringIO()):
+            return collect_profiles(
+                self.base_path, profiles,
+                prune_dirs=self.prune_dirs,
+                use_ignore_files=self.use_ignore_files,
+                jobs=self.jobs,
+                sink_factory=lambda profile: MemorySink(),
+                cache=self.cache,
+                dedupe=dedupe,
+                minify=minify,
+                paths=paths,
+                max_file_size=self.max_file_size,
+            )
+
+    @staticmethod
+    def _render(result):
+        result.sink.close()
+        body = result.sink.getvalue().encode("utf-8")
+        header = {
+            "ok": True,
+            "profile": result.profile.name,
+            "files": result.processed_files_count,
+            "duplicates": result.duplicate_files_count,
+            "errors": result.errors,
+            "skipped": [f"{rel_path} ({reason})" for rel_path, reason in result.skipped_files],
+            "bytes": len(body),
+        }
+        return header, body
+
+    def refresh(self, minify=False, dedupe=True):
+        """Vollständiger Durchlauf über alle Profile; füllt Dateiliste, Inhalte und Bundles."""
+        results = self._collect(list(self.profiles.values()), minify, dedupe)
+        self.known = {rel_path for result in results.values() for rel_path in result.files}
+        for name, result in results.items():
+            self.bundles[(name, minify, dedupe)] = self._render(result)
+
+    def bundle(self, profile_name, minify=False, dedupe=True):
+        """
+        Returns:
+            tuple: (Kopf, Bundle-Bytes); "cached" im Kopf gibt an, ob das
+                Bundle unverändert aus dem Speicher kam.
+        """
+        key = (profile_name, minify, dedupe)
+        cached = key in self.bundles
+        if not cached:
+            if self.known is None:
+                self.refresh(minify, dedupe)
+            else:
+                paths = sorted(self.known, key=walk_order_key)
+                results = self._collect([self.profiles[profile_name]], minify, dedupe, paths)
+                self.bundles[key] = self._render(results[profile_name])
+        header, body = self.bundles[key]
+        return dict(header, cached=cached), body
+
+    def bundle_paths(self, rel_paths, minify=False, dedupe=True):
+        """Bündelt genau die angegebenen Dateien (ohne Zwischenspeichern des Bundles)."""
+        results = self._collect([PATHS_PROFILE], minify, dedupe, rel_paths)
+        header, body = self._render(results[PATHS_PROFILE.name])
+        return dict(header, cached=False), body
+
+    def status(self):
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "root": self.base_path,
+            "profiles": list(self.profiles),
+            "files": len(self.known) if self.known is not None else None,
+            "bundles": len(self.bundles),
+            "cached_contents": len(self.cache.memory),
+            "requests": self.requests,
+            "changes": self.changes,
+            "uptime_s": round(time.time() - self.started),
+            "bytes": 0,
+        }
+
+    def apply_changes(self, changed, rescan):
+        """Verwirft nach einer Änderungsmeldung die betroffenen Bundles bzw. die Dateiliste."""
+        self.changes += 1
+        existing = {p for p in changed if os.path.isfile(os.path.join(self.base_path, p))}
+        if rescan or self.known is None or existing - self.known:
+            self.known = None
+            self.bundles.clear()
+            return
+        self.known -= changed - existing
+        affected = {
+            name for name, (dirs, extensions) in self._profile_dirs.items()
+            if any(p.lower().endswith(extensions) and any(is_under(p, d) for d in dirs) for p in changed)
+        }
+        for key in [k for k in self.bundles if k[0] in affected]:
+            del self.bundles[key]
+
+    def watch_forever(self, watcher):
+        """Hintergrund-Thread: wartet auf Änderungen und gibt sie an apply_changes weiter."""
+        while True:
+            changed, rescan = wait_for_changes(watcher, lambda p: p.lower().endswith(self.extensions))
+            with self.lock:
+                self.apply_changes(changed, rescan)
+
+    def handle(self, request):
+        """Bearbeitet eine Anfrage. Returns: (Kopf, Bundle-Bytes)."""
+        command = request.get("command")
+        if command == "status":
+            return self.status(), b""
+        if command == "stop":
+            return {"ok": True, "bytes": 0}, b""
+        if command is not None:
+            return {"ok": False, "error": f"Unbekannter Befehl: {command}", "bytes": 0}, b""
+        self.requests += 1
+        minify = bool(request.get("minify", False))
+        dedupe = bool(request.get("dedupe", True))
+        if "paths" in request:
+            rel_paths = [normalize_rel_dir(p) for p in request["paths"]]
+            outside = [p for p in rel_paths if os.path.isabs(p) or p == ".." or p.startswith("../")]
+            if outside:
+                return {"ok": False, "error": f"Pfad außerhalb des Projekts: {outside[0]}", "bytes": 0}, b""
+            return self.bundle_paths(rel_paths, minify, dedupe)
+        profile_name = request.get("profile") or DEFAULT_PROFILE
+        if profile_name not in self.profiles:
+            error = f"Unbekanntes Profil: {profile_name} (verfügbar: {', '.join(self.profiles)})"
+            return {"ok": False, "error": error, "bytes": 0}, b""
+        return self.bundle(profile_name, minify, dedupe)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        daemon = self.server.daemon
+        started = time.perf_counter()
+        try:
+            request = json.loads(self.rfile.readline())
+            if not isinstance(request, dict):
+                raise ValueError("Anfrage ist kein JSON-Objekt")
+        except ValueError as e:
+            header, body = {"ok": False, "error": f"Ungültige Anfrage: {e}", "bytes": 0}, b""
+            request = {}
+        else:
+            with daemon.lock:
+                header, body = daemon.handle(request)
+        header["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        self.wfile.write(json.dumps(header).encode("utf-8") + b"\n")
+        self.wfile.write(body)
+        if request.get("command") == "stop":
+            threading.Thread(target=self.server.shutdown).start()
+        elif "command" not in request:
+            label = request.get("profile") or ("Pfadliste" if "paths" in request else DEFAULT_PROFILE)
+            if header["ok"]:
+                source = "aus dem Speicher" if header["cached"] else "neu gebündelt"
+                print(f"[{time.strftime('%H:%M:%S')}] {label}: {header['files']} Datei(en), "
+                      f"{header['bytes'] / 1024:.1f} KB, {source} ({header['elapsed_ms']:.1f} ms)")
+            else:
+                print(f"[{time.strftime('%H:%M:%S')}] {label}: FEHLER: {header['error']}")
+
+
+class _Server(socketserver.UnixStreamServer):
+
+    def __init__(self, socket_path, daemon):
+        self.daemon = daemon
+        super().__init__(socket_path, _Handler)
+
+    def handle_error(self, request, client_address):
+        # Abgebrochene Client-Verbindungen sind kein Grund für einen Traceback
+        pass
+
+
+def _claim_socket(socket_path):
+    """
+    Entfernt einen verwaisten Socket eines beendeten Daemons.
+
+    Returns:
+        bool: False, wenn unter socket_path bereits ein Daemon antwortet.
+    """
+    if not os.path.exists(socket_path):
+        return True
+    try:
+        send_request(socket_path, {"command": "status"}, timeout=2)
+    except (OSError, ValueError):
+        os.unlink(socket_path)
+        return True
+    return False
+
+
+def serve(base_path, profiles, cache, cache_dir=None, prune_dirs=DEFAULT_PRUNE_DIRS, use_ignore_files=True,
+          jobs=DEFAULT_JOBS, max_file_size=None, polling=False):
+    """
+    Startet den Daemon und blockiert, bis er per Client (--stop) oder
+    Strg+C beendet wird.
+
+    Args:
+        cache (SnapshotCache): Cache mit keep_in_memory=True.
+
+    Returns:
+        int: Exit-Code.
+    """
+    socket_path = daemon_socket_path(base_path, cache_dir)
+    if not _claim_socket(socket_path):
+        print(f"FEHLER: Unter {socket_path} läuft bereits ein Daemon.")
+        return 1
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+
+    daemon = CollectorDaemon(base_path, profiles, cache, prune_dirs, use_ignore_files, jobs, max_file_size)
+    started = time.perf_counter()
+    daemon.refresh()
+    print(f"Dateien geladen: {len(daemon.known)} Datei(en), {len(daemon.bundles)} Bundle(s) "
+          f"in {time.perf_counter() - started:.2f} s.")
+
+    roots = [r for r in union_roots(profiles) if os.path.isdir(os.path.join(base_path, r))]
+    watcher, kind = make_watcher(base_path, roots, prune_dirs, profile_keep_dirs(profiles), polling=polling)
+    threading.Thread(target=daemon.watch_forever, args=(watcher,), daemon=True).start()
+
+    server = _Server(socket_path, daemon)
+    os.chmod(socket_path, 0o600)  # Bundles enthalten Quelltext: nur für den eigenen Benutzer
+    print(f"Daemon bereit ({kind}), Socket: {socket_path}. Beenden mit Strg+C "
+          f"oder python copy_ts_code_client.py --stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(socket_path)
+        watcher.close()
+    print("Daemon beendet.")
+    return 0
@@ -0,0 +1,168 @@
+"""
+Dateiauflistung aus dem Git-Index.
+
+In einem Git-Checkout ist "git ls-files" deutlich günstiger als ein
+Verzeichnisdurchlauf über Bäume mit unversionierten Build-Artefakten.
+Außerdem lässt sich die Auswahl auf Dateien beschränken, die sich seit
+einem Commit geändert haben ("git diff --name-only <ref>" und neue,
+unversionierte Dateien).
+"""
+import os
+import subprocess
+
+
+class GitError(Exception):
+    """Git ist nicht verfügbar, base_path ist kein Checkout oder ein Befehl ist fehlgeschlagen."""
+
+
+class IndexEntry:
+    """
+    Minimaler Ersatz für os.DirEntry bei Dateien aus dem Git-Index.
+    Der Stat wird beim ersten Zugriff ermittelt und zwischengespeichert.
+    """
+    __slots__ = ("name", "path", "_stat")
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._stat = None
+
+    def stat(self):
+        if self._stat is None:
+            self._stat = os.stat(self.path)
+        return self._stat
+
+    def is_file(self):
+        try:
+            self.stat()
+        except OSError:
+            return False
+        return True
+
+
+def _run_git(base_path, args):
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=base_path, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False,
+        )
+    except OSError as e:
+        raise GitError(f"Git konnte nicht gestartet werden: {e}")
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(f"git {' '.join(args)} fehlgeschlagen: {message}")
+    return completed.stdout
+
+
+def is_git_checkout(base_path):
+    """Prüft, ob base_path in einem Git-Arbeitsverzeichnis liegt."""
+    try:
+        return _run_git(base_path, ["rev-parse", "--is-inside-work-tree"]).strip() == b"true"
+    except GitError:
+        return False
+
+
+def current_commit(base_path):
+    """
+    Liefert den Commit-Hash von HEAD.
+
+    Raises:
+        GitError: Wenn base_path kein Checkout ist oder git fehlschlägt.
+    """
+    return _run_git(base_path, ["rev-parse", "HEAD"]).decode("ascii").strip()
+
+
+def _split_paths(output):
+    return [p.decode("utf-8", errors="surrogateescape") for p in output.split(b"\0") if p]
+
+
+def walk_order_key(rel_path):
+    """
+    Sortierschlüssel, der die Reihenfolge des Verzeichnis-Walkers nachbildet:
+    in jedem Ordner zuerst die Dateien, danach die Unterordner, jeweils nach Namen.
+    """
+    parts = rel_path.split("/")
+    return tuple((1, part) for part in parts[:-1]) + ((0, parts[-1]),)
+
+
+def list_index_files(base_path, rel_roots, prune_dirs=(), keep_dirs=(), include_untracked=True):
+    """
+    Listet versionierte Dateien unterhalb der Startordner auf.
+
+    Args:
+        base_path (str): Der Basispfad (Projekt-Root).
+        rel_roots (list): Relative Startordner (POSIX).
+        prune_dirs (iterable): Ordnernamen, deren Inhalt übersprungen wird.
+        keep_dirs (iterable): Relative Ordner, die nie übersprungen werden.
+        include_untracked (bool): Auch neue, noch nicht hinzugefügte Dateien
+            aufnehmen, sofern sie nicht per .gitignore ausgeschlossen sind.
+
+    Returns:
+        list: (relativer Pfad, IndexEntry) in Walker-Reihenfolge.
+
+    Raises:
+        GitError: Wenn git nicht verfügbar oder base_path kein Checkout ist.
+    """
+    if not rel_roots:
+        return []
+    # Ohne --full-name sind die Pfade relativ zu base_path
+    args = ["ls-files", "-z", "--cached"]
+    if include_untracked:
+        args += ["--others", "--exclude-standard"]
+    output = _run_git(base_path, [*args, "--", *rel_roots])
+    prune_dirs = frozenset(prune_dirs or ())
+    keep_dirs = frozenset(keep_dirs)
+
+    paths = set()
+    for rel_path in _split_paths(output):
+        parts = rel_path.split("/")
+        pruned = False
+        for depth in range(1, len(parts)):
+            if parts[depth - 1] in prune_dirs and "/".join(parts[:depth]) not in keep_dirs:
+                pruned = True
+                break
+        if not pruned:
+            paths.add(rel_path)
+
+    entries = []
+    for rel_path in sorted(paths, key=walk_order_key):
+        entry = IndexEntry(os.path.join(base_path, rel_path))
+        # Im Index, aber im Arbeitsverzeichnis gelöscht: überspringen
+        if entry.is_file():
+            entries.append((rel_path, entry))
+    return entries
+
+
+def churn_counts(base_path, max_commits):
+    """
+    Zählt, in wie vielen der letzten max_commits Commits jede Datei geändert wurde.
+
+    Returns:
+        dict: Relativer Pfad (bezogen auf base_path) -> Anzahl der Commits.
+
+    Raises:
+        GitError: Wenn git nicht verfügbar oder base_path kein Checkout ist.
+    """
+    output = _run_git(base_path, ["log", f"-n{max_commits}", "--format=", "--name-only", "--relative", "-z"])
+    counts = {}
+    for rel_path in _split_paths(output):
+        rel_path = rel_path.lstrip("\n")  # Trennzeile zwischen zwei Commits
+        if rel_path:
+            counts[rel_path] = counts.get(rel_path, 0) + 1
+    return counts
+
+
+def changed_since(base_path, ref, rel_roots):
+    """
+    Ermittelt Dateien, die sich zwischen ref und dem Arbeitsverzeichnis geändert haben.
+    Unversionierte Dateien (außer per .gitignore ausgeschlossenen) zählen dazu,
+    da "git diff" sie nicht kennt.
+
+    Returns:
+        set: Relative Pfade (bezogen auf base_path).
+
+    Raises:
+        GitError: Wenn ref unbekannt ist oder git fehlschlägt.
+    """
+    output = _run_git(base_path, ["diff", "--name-only", "--relative", "-z", ref, "--", *rel_roots])
+    untracked = _run_git(base_path, ["ls-files", "-z", "--others", "--exclude-standard", "--", *rel_roots])
+    return set(_split_paths(output)) | set(_split_paths(untracked))
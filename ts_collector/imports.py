@@ -0,0 +1,362 @@
+"""
+Import-Graph für den Closure-Modus (--entry).
+
+Ausgehend von Einstiegsdateien werden import-/export-from-Anweisungen,
+dynamische import()-Aufrufe und require() ausgewertet und die Ziele wie
+TypeScript aufgelöst: relative Pfade, "paths"-Aliase und baseUrl aus der
+nächstgelegenen tsconfig.json sowie Workspace-Pakete unter packages/.
+Pakete aus node_modules gehören nicht zur Closure.
+
+Die Import-Angaben einer Datei hängen nur von ihrem Inhalt ab und werden
+deshalb unter dem Inhalts-Hash in .ts_collector_cache/imports.json
+gespeichert. Mit Snapshot-Cache wird der Hash über Größe und mtime
+ermittelt, unveränderte Dateien werden also nicht einmal geöffnet.
+"""
+import json
+import os
+import re
+from collections import deque
+
+from .cache import CACHE_DIR_NAME, _atomic_write, content_hash
+from .minify import minify_source
+from .reader import read_bytes
+
+IMPORTS_CACHE_NAME = "imports.json"
+IMPORTS_CACHE_VERSION = 1
+# Einträge aus früheren Läufen, die in diesem Lauf nicht besucht wurden,
+# werden nur bis zu dieser Gesamtzahl behalten.
+MAX_CACHED_FILES = 50_000
+
+# Reihenfolge wie bei der TypeScript-Modulauflösung
+RESOLVE_EXTENSIONS = (".ts", ".tsx", ".d.ts")
+CLOSURE_EXTENSIONS = (".ts", ".tsx", ".css")
+# Dateien, deren Import-Angaben record() für das Ranking aufnimmt
+IMPORT_EXTENSIONS = (".ts", ".tsx")
+WORKSPACE_PACKAGE_DIRS = ("packages",)
+
+_IMPORT_RE = re.compile(
+    r"""(?:^|[^\w$.])(?:import|export)\s+(?:type\s+)?(?:[\w$*{}\s,]+?\s+from\s+)?(['"])([^'"\n]+)\1"""
+    r"""|(?:^|[^\w$.])(?:import|require)\s*\(\s*(['"])([^'"\n]+)\3\s*\)""",
+)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+
+def parse_imports(text, rel_path):
+    """
+    Liefert die Modul-Angaben aller Importe einer Datei in Quelltextreihenfolge.
+    Auskommentierte Importe werden ignoriert.
+    """
+    extension = ".tsx" if rel_path.endswith(".tsx") else ".ts"
+    code = minify_source(text, extension)
+    specifiers = []
+    for match in _IMPORT_RE.finditer(code):
+        specifier = match.group(2) or match.group(4)
+        if specifier not in specifiers:
+            specifiers.append(specifier)
+    return specifiers
+
+
+def read_jsonc(path):
+    """
+    Liest JSON mit Kommentaren und abschließenden Kommas (tsconfig.json).
+
+    Raises:
+        OSError: Wenn die Datei nicht lesbar ist.
+        ValueError: Bei ungültigem Inhalt.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    return json.loads(_TRAILING_COMMA_RE.sub(r"\1", minify_source(text, ".ts")))
+
+
+def load_tsconfig(path):
+    """
+    Liest eine tsconfig.json (Kommentare und abschließende Kommas erlaubt)
+    und wertet "extends" für relative Pfade aus.
+
+    Returns:
+        dict: {"baseUrl": absoluter Pfad oder None, "paths": [(Muster, [absolute Ziele])]}
+    """
+    try:
+        data = read_jsonc(path)
+    except (OSError, ValueError):
+        return {"baseUrl": None, "paths": []}
+
+    config_dir = os.path.dirname(path)
+    config = {"baseUrl": None, "paths": []}
+    parent = data.get("extends")
+    if isinstance(parent, str) and parent.startswith("."):
+        parent_path = os.path.normpath(os.path.join(config_dir, parent))
+        if not parent_path.endswith(".json"):
+            parent_path += ".json"
+        config = load_tsconfig(parent_path)
+
+    options = data.get("compilerOptions") or {}
+    if "baseUrl" in options:
+        config["baseUrl"] = os.path.normpath(os.path.join(config_dir, options["baseUrl"]))
+    if "paths" in options:
+        # Ohne baseUrl sind die Ziele relativ zur tsconfig.json
+        paths_base = config["baseUrl"] or config_dir
+        config["paths"] = [
+            (pattern, [os.path.normpath(os.path.join(paths_base, target)) for target in targets])
+            for pattern, targets in options["paths"].items()
+        ]
+    return config
+
+
+def _match_path_pattern(pattern, specifier):
+    """Liefert den Teil, den "*" abdeckt ("" bei exaktem Treffer) oder None."""
+    if "*" not in pattern:
+        return "" if pattern == specifier else None
+    prefix, suffix = pattern.split("*", 1)
+    if specifier.startswith(prefix) and specifier.endswith(suffix) and len(specifier) >= len(prefix) + len(suffix):
+        return specifier[len(prefix):len(specifier) - len(suffix)]
+    return None
+
+
+def _probe(abs_path):
+    """Sucht die Datei zu einem Modulpfad: exakt, mit Endung oder als index-Datei."""
+    if abs_path.endswith(CLOSURE_EXTENSIONS) and os.path.isfile(abs_path):
+        return abs_path
+    for extension in RESOLVE_EXTENSIONS:
+        if os.path.isfile(abs_path + extension):
+            return abs_path + extension
+    for extension in RESOLVE_EXTENSIONS:
+        candidate = os.path.join(abs_path, "index" + extension)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+class ImportGraph:
+    """
+    Löst Importe auf und bildet die transitive Hülle von Einstiegsdateien.
+
+    Attributes:
+        edges (dict): Relativer Pfad -> aufgelöste relative Importziele
+            (nur für bereits besuchte Dateien).
+        parsed (int): Dateien, deren Importe neu ermittelt wurden.
+        reused (int): Dateien, deren Importe aus dem Cache kamen.
+    """
+
+    def __init__(self, base_path, snapshot_cache=None, cache_dir=None, persistent=True):
+        self.base_path = os.path.abspath(base_path)
+        self.snapshot_cache = snapshot_cache
+        if cache_dir is None:
+            cache_dir = snapshot_cache.cache_dir if snapshot_cache else os.path.join(self.base_path, CACHE_DIR_NAME)
+        self.cache_path = os.path.join(cache_dir, IMPORTS_CACHE_NAME)
+        self.persistent = persistent
+        self._specifiers = self._load() if persistent else {}
+        self._live = {}
+        self._tsconfigs = {}
+        self._workspace_packages = None
+        self.edges = {}
+        self.parsed = 0
+        self.reused = 0
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != IMPORTS_CACHE_VERSION:
+            return {}
+        return data.get("specifiers", {})
+
+    def save(self):
+        """Speichert die Import-Angaben der besuchten Dateien (plus ältere Einträge bis MAX_CACHED_FILES)."""
+        if not self.persistent:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        specifiers = dict(self._live)
+        for digest, entry in self._specifiers.items():
+            if len(specifiers) >= MAX_CACHED_FILES:
+                break
+            specifiers.setdefault(digest, entry)
+        data = {"version": IMPORTS_CACHE_VERSION, "specifiers": dict(sorted(specifiers.items()))}
+        _atomic_write(self.cache_path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    def _file_specifiers(self, rel_path):
+        abs_path = os.path.join(self.base_path, rel_path)
+        digest = None
+        st = None
+        if self.snapshot_cache is not None:
+            st = os.stat(abs_path)
+            digest = self.snapshot_cache.lookup(rel_path, st)
+        if digest is None or digest not in self._specifiers:
+            raw = read_bytes(abs_path)
+            digest = content_hash(raw)
+            if st is not None:
+                self.snapshot_cache.store(rel_path, st, raw)
+            if digest not in self._specifiers:
+                self.parsed += 1
+                self._specifiers[digest] = parse_imports(raw.decode("utf-8", errors="ignore"), rel_path)
+            else:
+                self.reused += 1
+        else:
+            self.reused += 1
+        self._live[digest] = self._specifiers[digest]
+        return self._live[digest]
+
+    def _tsconfig_for(self, abs_dir):
+        """Nächstgelegene tsconfig.json oberhalb von abs_dir (höchstens bis base_path)."""
+        if abs_dir in self._tsconfigs:
+            return self._tsconfigs[abs_dir]
+        candidate = os.path.join(abs_dir, "tsconfig.json")
+        if os.path.isfile(candidate):
+            config = load_tsconfig(candidate)
+        elif abs_dir == self.base_path or not abs_dir.startswith(self.base_path + os.sep):
+            config = {"baseUrl": None, "paths": []}
+        else:
+            config = self._tsconfig_for(os.path.dirname(abs_dir))
+        self._tsconfigs[abs_dir] = config
+        return config
+
+    def workspace_packages(self):
+        """Paketname -> absoluter Ordner für alle Pakete unter packages/."""
+        if self._workspace_packages is None:
+            self._workspace_packages = {}
+            for parent in WORKSPACE_PACKAGE_DIRS:
+                parent_dir = os.path.join(self.base_path, parent)
+                try:
+                    names = sorted(os.listdir(parent_dir))
+                except OSError:
+                    continue
+                for name in names:
+                    try:
+                        with open(os.path.join(parent_dir, name, "package.json"), "r", encoding="utf-8") as f:
+                            package_name = json.load(f).get("name")
+                    except (OSError, ValueError):
+                        continue
+                    if package_name:
+                        self._workspace_packages[package_name] = os.path.join(parent_dir, name)
+        return self._workspace_packages
+
+    def _resolve_workspace(self, specifier):
+        for package_name, package_dir in self.workspace_packages().items():
+            if specifier == package_name:
+                subpath = ""
+            elif specifier.startswith(package_name + "/"):
+                subpath = specifier[len(package_name) + 1:]
+            else:
+                continue
+            # Quelltext bevorzugen; dist/ enthält nur Build-Artefakte
+            for candidate in (os.path.join(package_dir, "src", subpath), os.path.join(package_dir, subpath)):
+                resolved = _probe(candidate.rstrip(os.sep))
+                if resolved:
+                    return resolved
+        return None
+
+    def resolve(self, specifier, importer_rel_path):
+        """
+        Löst eine Modul-Angabe auf.
+
+        Returns:
+            str | None: Relativer POSIX-Pfad der Zieldatei oder None
+                (externes Paket, nicht gefunden oder außerhalb von base_path).
+        """
+        importer_dir = os.path.dirname(os.path.join(self.base_path, importer_rel_path))
+        resolved = None
+        if specifier.startswith("."):
+            resolved = _probe(os.path.normpath(os.path.join(importer_dir, specifier)))
+        else:
+            config = self._tsconfig_for(importer_dir)
+            for pattern, targets in config["paths"]:
+                star = _match_path_pattern(pattern, specifier)
+                if star is None:
+                    continue
+                for target in targets:
+                    resolved = _probe(target.replace("*", star))
+                    if resolved:
+                        break
+                if resolved:
+                    break
+            if resolved is None and config["baseUrl"]:
+                resolved = _probe(os.path.join(config["baseUrl"], specifier))
+            if resolved is None:
+                resolved = self._resolve_workspace(specifier)
+        if resolved is None or not resolved.startswith(self.base_path + os.sep):
+            return None
+        return os.path.relpath(resolved, self.base_path).replace(os.sep, "/")
+
+    def _resolve_all(self, rel_path, specifiers):
+        targets = []
+        for specifier in specifiers:
+            target = self.resolve(specifier, rel_path)
+            if target is not None and target not in targets:
+                targets.append(target)
+        self.edges[rel_path] = targets
+        return targets
+
+    def targets(self, rel_path):
+        """
+        Aufgelöste Importziele einer Datei (relative Pfade, ohne Duplikate).
+
+        Raises:
+            OSError: Wenn die Datei nicht lesbar ist.
+        """
+        return self._resolve_all(rel_path, self._file_specifiers(rel_path))
+
+    def cached_targets(self, rel_path, st):
+        """
+        Wie targets(), aber nur aus dem Cache: Die Datei wird nicht gelesen.
+
+        Returns:
+            list | None: Die Importziele oder None, wenn der Snapshot-Cache
+                die Datei in diesem Stand nicht kennt oder imports.json keine
+                Import-Angaben zu ihrem Inhalt hat.
+        """
+        if self.snapshot_cache is None or st is None:
+            return None
+        digest = self.snapshot_cache.lookup(rel_path, st)
+        specifiers = self._specifiers.get(digest) if digest is not None else None
+        if specifiers is None:
+            return None
+        self.reused += 1
+        self._live[digest] = specifiers
+        return self._resolve_all(rel_path, specifiers)
+
+    def record(self, rel_path, digest, raw):
+        """Nimmt die Import-Angaben eines bereits gelesenen Inhalts auf (für spätere Läufe)."""
+        if not rel_path.endswith(IMPORT_EXTENSIONS):
+            return
+        if digest not in self._specifiers:
+            self.parsed += 1
+            # raw kann eine mmap-Abbildung sein (große Dateien, siehe reader.py)
+            self._specifiers[digest] = parse_imports(str(raw, "utf-8", "ignore"), rel_path)
+        self._live[digest] = self._specifiers[digest]
+
+    def closure(self, entry_paths):
+        """
+        Bildet die transitive Hülle der Einstiegsdateien (Breitensuche).
+
+        Args:
+            entry_paths (list): Relative Pfade der Einstiegsdateien.
+
+        Returns:
+            tuple: (Pfade in Entdeckungsreihenfolge, Fehlermeldungen)
+        """
+        order = []
+        errors = []
+        seen = set()
+        queue = deque()
+        for rel_path in entry_paths:
+            if rel_path not in seen:
+                seen.add(rel_path)
+                queue.append(rel_path)
+        while queue:
+            rel_path = queue.popleft()
+            order.append(rel_path)
+            if not rel_path.endswith((".ts", ".tsx")):
+                continue  # z.B. .css: keine Importe auswerten
+            try:
+                targets = self.targets(rel_path)
+            except OSError as e:
+                errors.append(f"FEHLER: Konnte Datei nicht lesen: {rel_path} - {e}")
+                continue
+            for target in targets:
+                if target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return order, errors
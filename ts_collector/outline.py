@@ -0,0 +1,410 @@
+"""
+Gliederungs-Modus (--outline): die Form des Codes statt vollständiger Inhalte.
+
+Aus .ts- und .tsx-Dateien werden Exporte, Deklarationen auf Modulebene,
+Klassen mit ihren Membern, Signaturen und Decorators übernommen.
+Funktions- und Methodenrümpfe werden zu {…} zusammengefasst, Initialwerte
+von Variablen und Properties zu "= …". Interfaces, Typ-Aliase und Enums
+bleiben vollständig erhalten, weil sie selbst die Form beschreiben.
+Importe und sonstige Anweisungen auf Modulebene entfallen.
+
+Die Gliederung hängt nur vom Dateiinhalt und der Endung ab (JSX gibt es nur
+in .tsx). Sie wird unter Inhalts-Hash und Endung in einer SQLite-Datenbank
+(.ts_collector_cache/outline.sqlite) abgelegt. Zusätzlich merkt sich der Index Größe und mtime jeder Datei,
+damit unveränderte Dateien gar nicht erst gelesen werden.
+"""
+import re
+
+from .minify import SCRIPT_EXTENSIONS, minify_source, tokenize
+from .sqlindex import SqliteIndex
+
+OUTLINE_DB_NAME = "outline.sqlite"
+# Bei Änderungen an der Extraktion erhöhen; der Index wird dann neu aufgebaut
+OUTLINE_VERSION = 3
+OUTLINE_EXTENSIONS = SCRIPT_EXTENSIONS
+BODY = "{…}"
+ELLIPSIS = "…"
+
+_PIECE_RE = re.compile(r"=>|[{}()\[\];,]|[=!<>+\-*%&|^?~:.]+|[^{}()\[\];,=!<>+\-*%&|^?~:.]+")
+_WORD_RE = re.compile(r"[\w$#]+")
+_DECORATORS_ONLY_RE = re.compile(r"(?:@[\w$.]+(?:\(\))?\s*)+")
+_REEXPORT_RE = re.compile(r"export\s+(?:type\s+)?[*{]")
+_MODIFIERS = frozenset({
+    "export", "default", "declare", "abstract", "async", "public", "private", "protected",
+    "static", "readonly", "override", "accessor",
+})
+_SCOPE_KEYWORDS = frozenset({"class", "namespace", "module", "global"})
+_DECLARATION_KEYWORDS = frozenset({"class", "interface", "type", "enum", "function", "namespace", "module", "global"})
+_VARIABLE_KEYWORDS = frozenset({"const", "let", "var"})
+# Eine Zeile, die so endet bzw. die nächste so beginnt, setzt die Anweisung fort
+_CONTINUE_AFTER = (",", "=", ":", "|", "&", "?", ".", "<", "=>")
+_CONTINUE_BEFORE = (".", "?", ":", "|", "&", "=", ")", "]", ",", ">", "{")
+_CONTINUE_WORDS = frozenset({"extends", "implements", "as", "satisfies"})
+
+
+def _pieces(code, jsx):
+    """Zerlegt minifizierten Code; Strings, Templates, reguläre Ausdrücke und JSX-Text bleiben am Stück."""
+    pieces = []
+    for kind, token in tokenize(code, jsx=jsx):
+        if kind == "ws":
+            pieces.append(" ")
+        elif kind == "code":
+            pieces.extend(_PIECE_RE.findall(token))
+        elif kind != "line_comment" and kind != "block_comment":
+            pieces.append(token)
+    return pieces
+
+
+class _Statement:
+    """Eine Anweisung bzw. Member-Deklaration, während sie gelesen wird."""
+
+    def __init__(self):
+        self.pieces = []
+        self.top = []  # Stücke auf Klammerebene 0; Inhalte von () und [] entfallen
+        self.depth = 0  # Verschachtelung von () und []
+        self.assign_at = None
+        self.arrow_at = None
+        self.decorating = None  # None: noch leer, True: bisher nur Decorators
+        self.decorators_end = 0
+        self.top_decorators_end = 0
+
+    def __bool__(self):
+        return bool(self.pieces)
+
+    def space(self):
+        if self.pieces and self.pieces[-1] not in (" ", "(", "["):
+            self.pieces.append(" ")
+            if self.depth == 0:
+                self.top.append(" ")
+
+    def add(self, piece):
+        if self.decorating is None:
+            self.decorating = piece.startswith("@")
+        if piece in (")", "]"):
+            # Zeilenumbrüche und abschließende Kommas in Parameterlisten entfallen
+            while self.pieces and self.pieces[-1] in (" ", ","):
+                self.pieces.pop()
+            self.depth = max(0, self.depth - 1)
+            self.pieces.append(piece)
+            if self.depth == 0:
+                self.top.append(piece)
+                self._check_decorators()
+            return
+        if self.depth == 0:
+            if piece == "=" and self.assign_at is None:
+                self.assign_at = len(self.pieces)
+            elif piece == "=>" and self.arrow_at is None:
+                self.arrow_at = len(self.pieces)
+            self.top.append(piece)
+        self.pieces.append(piece)
+        if piece in ("(", "["):
+            self.depth += 1
+        elif self.depth == 0 and (piece[0].isalnum() or piece[0] in "_$@#"):
+            self._check_decorators()
+
+    def _check_decorators(self):
+        if not self.decorating:
+            return
+        if _DECORATORS_ONLY_RE.fullmatch("".join(self.top).strip()):
+            self.decorators_end = len(self.pieces)
+            self.top_decorators_end = len(self.top)
+        else:
+            self.decorating = False
+
+    def only_decorators(self):
+        return bool(self.decorating) and self.decorators_end == len(self.pieces)
+
+    def header_text(self):
+        """Text auf Klammerebene 0 ohne Decorators, z.B. "export class Foo extends Bar"."""
+        return "".join(self.top[self.top_decorators_end:]).strip()
+
+    def keyword(self):
+        """
+        Returns:
+            tuple: (erstes Wort nach den Modifizierern, folgendes Wort, Modifizierer)
+        """
+        words = _WORD_RE.findall(self.header_text())
+        modifiers = []
+        for index, word in enumerate(words):
+            following = words[index + 1] if index + 1 < len(words) else ""
+            if word in _MODIFIERS or (word == "const" and following == "enum"):
+                modifiers.append(word)
+                continue
+            return word, following, modifiers
+        return "", "", modifiers
+
+    def decorators(self):
+        return "".join(self.pieces[:self.decorators_end]).strip()
+
+    def render(self, truncate_values):
+        """
+        Gibt die Deklaration ohne Decorators zurück. Mit truncate_values werden
+        Initialwerte zu "= …" und Ausdrucksrümpfe von Arrow-Funktionen zu "=> …".
+        """
+        pieces = self.pieces
+        if truncate_values and self.assign_at is not None:
+            if self.arrow_at is not None and self.arrow_at > self.assign_at:
+                if "".join(pieces[self.arrow_at + 1:]).strip().rstrip(";").strip() != BODY:
+                    pieces = pieces[:self.arrow_at + 1] + [" ", ELLIPSIS]
+            else:
+                pieces = pieces[:self.assign_at + 1] + [" ", ELLIPSIS]
+        return "".join(pieces[self.decorators_end:]).strip().rstrip(";").rstrip()
+
+
+class _OutlineParser:
+    """Erzeugt Gliederungszeilen aus den Stücken einer Datei."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.lines = []  # (Einrückung, Text)
+
+    def parse(self, i, scope, indent):
+        """Liest Anweisungen bis zur schließenden Klammer des Bereichs; liefert den Index dahinter."""
+        pieces = self.pieces
+        n = len(pieces)
+        stmt = _Statement()
+        while i < n:
+            piece = pieces[i]
+            if stmt.depth == 0:
+                if piece == "}":
+                    self._flush(stmt, scope, indent)
+                    return i + 1
+                if piece == ";":
+                    self._flush(stmt, scope, indent)
+                    stmt = _Statement()
+                    i += 1
+                    continue
+                if piece == "\n":
+                    if stmt and not self._continues(stmt, i):
+                        self._flush(stmt, scope, indent)
+                        stmt = _Statement()
+                    else:
+                        stmt.space()
+                    i += 1
+                    continue
+                if piece == "{":
+                    kind = self._brace_kind(stmt, scope)
+                    if kind == "scope":
+                        i = self._open_scope(stmt, i + 1, indent)
+                        stmt = _Statement()
+                    elif kind == "type":
+                        text, i = self._copy_block(i)
+                        stmt.add(text)
+                    else:
+                        stmt.add(BODY)
+                        i = self._skip_block(i)
+                    continue
+            if piece in (" ", "\n"):
+                stmt.space()
+            else:
+                stmt.add(piece)
+            i += 1
+        self._flush(stmt, scope, indent)
+        return i
+
+    def _next_piece(self, i):
+        for piece in self.pieces[i + 1:]:
+            if piece not in (" ", "\n"):
+                return piece
+        return None
+
+    def _continues(self, stmt, i):
+        """Entscheidet, ob die Anweisung über den Zeilenumbruch bei i hinweg weitergeht."""
+        if stmt.only_decorators():
+            return True
+        last = next((p for p in reversed(stmt.pieces) if p != " "), "")
+        if last in _CONTINUE_WORDS or last.endswith(_CONTINUE_AFTER):
+            return True
+        following = self._next_piece(i)
+        return following is not None and (following.startswith(_CONTINUE_BEFORE) or following in _CONTINUE_WORDS)
+
+    def _brace_kind(self, stmt, scope):
+        """"scope" (Klasse, Namespace), "type" (unverändert übernehmen) oder "body" (zusammenfassen)."""
+        if scope == "class" or not stmt.header_text():
+            return "body"
+        keyword, _, _ = stmt.keyword()
+        if keyword in _SCOPE_KEYWORDS and stmt.assign_at is None:
+            return "scope"
+        if keyword in ("interface", "enum", "import") or (keyword == "type" and stmt.assign_at is not None):
+            return "type"
+        if _REEXPORT_RE.match(stmt.header_text() + "{"):
+            return "type"
+        return "body"
+
+    def _skip_block(self, i):
+        depth = 0
+        n = len(self.pieces)
+        while i < n:
+            piece = self.pieces[i]
+            i += 1
+            if piece == "{":
+                depth += 1
+            elif piece == "}":
+                depth -= 1
+                if depth == 0:
+                    return i
+        return n
+
+    def _copy_block(self, i):
+        """Übernimmt einen {...}-Block unverändert, neu eingerückt. Liefert (Text, Index dahinter)."""
+        lines = [[]]
+        depth = 0
+        n = len(self.pieces)
+        while i < n:
+            piece = self.pieces[i]
+            i += 1
+            if piece == "\n":
+                lines.append([])
+                continue
+            if piece == " " and (not lines[-1] or lines[-1][-1] == " "):
+                continue
+            lines[-1].append(piece)
+            if piece == "{":
+                depth += 1
+            elif piece == "}":
+                depth -= 1
+                if depth == 0:
+                    break
+        out = []
+        depth = 0
+        for line in lines:
+            text = "".join(line).strip()
+            if not text:
+                continue
+            level = depth - 1 if text.startswith("}") else depth
+            out.append("  " * max(level, 0) + text)
+            depth += line.count("{") - line.count("}")
+        return "\n".join(out), i
+
+    def _open_scope(self, stmt, i, indent):
+        keyword, _, _ = stmt.keyword()
+        signature = stmt.render(truncate_values=False)
+        decorators = stmt.decorators()
+        header = f"{decorators} {signature}" if decorators else signature
+        self.lines.append((indent, header + " {"))
+        count = len(self.lines)
+        i = self.parse(i, "class" if keyword == "class" else "namespace", indent + 1)
+        if len(self.lines) == count:
+            self.lines[-1] = (indent, header + " {}")
+        else:
+            self.lines.append((indent, "}"))
+        return i
+
+    def _flush(self, stmt, scope, indent):
+        if not stmt or stmt.only_decorators():
+            return
+        if scope == "class":
+            signature = stmt.render(truncate_values=True)
+        else:
+            keyword, _, modifiers = stmt.keyword()
+            exported = "export" in modifiers or scope == "namespace"
+            if keyword == "import":
+                return
+            if _REEXPORT_RE.match(stmt.header_text()) or keyword in _DECLARATION_KEYWORDS:
+                signature = stmt.render(truncate_values=False)
+            elif keyword in _VARIABLE_KEYWORDS and exported:
+                signature = stmt.render(truncate_values=True)
+            elif "default" in modifiers:
+                # export default <Ausdruck>
+                pieces = stmt.pieces[stmt.decorators_end:stmt.pieces.index("default") + 1]
+                signature = "".join(pieces).strip() + " " + ELLIPSIS
+            elif exported:
+                signature = stmt.render(truncate_values=True)
+            else:
+                return
+        if not signature:
+            return
+        decorators = stmt.decorators()
+        self.lines.append((indent, f"{decorators} {signature}" if decorators else signature))
+
+
+def _extension(rel_path):
+    """Endung, nach der die Gliederung erstellt wird (JSX nur in .tsx)."""
+    return ".tsx" if rel_path.lower().endswith(".tsx") else ".ts"
+
+
+def extract_outline(text, rel_path):
+    """
+    Erstellt die Gliederung einer .ts- oder .tsx-Datei.
+
+    Args:
+        text (str): Dekodierter Dateiinhalt.
+        rel_path (str): Relativer Pfad (bestimmt die Endung).
+
+    Returns:
+        str: Gliederung als Text.
+    """
+    extension = _extension(rel_path)
+    parser = _OutlineParser(_pieces(minify_source(text, extension), extension == ".tsx"))
+    parser.parse(0, "file", 0)
+    lines = []
+    for indent, entry in parser.lines:
+        prefix = "  " * indent
+        lines.extend(prefix + line for line in entry.split("\n"))
+    return "\n".join(lines)
+
+
+class OutlineIndex(SqliteIndex):
+    """
+    Persistenter Gliederungs-Index (SQLite).
+
+    Tabellen:
+        files: Pfad -> Größe, mtime_ns, Prüfzeitpunkt, Inhalts-Hash
+        outlines: (Inhalts-Hash, Endung) -> Gliederung
+
+    Attributes:
+        reused (int): Gliederungen, die aus dem Index kamen.
+        extracted (int): Gliederungen, die neu erstellt wurden.
+    """
+
+    db_name = OUTLINE_DB_NAME
+    version = OUTLINE_VERSION
+    # symbols gab es bis Version 1; beim Neuaufbau wird sie mit entfernt
+    tables = ("outlines", "symbols")
+    schema = """
+        CREATE TABLE outlines (digest TEXT, extension TEXT, outline TEXT NOT NULL, PRIMARY KEY (digest, extension));
+    """
+
+    def __init__(self, base_path, cache_dir=None, persistent=True):
+        super().__init__(base_path, cache_dir, persistent)
+        self.reused = 0
+        self.extracted = 0
+
+    def _outline(self, digest, extension):
+        row = self._db.execute(
+            "SELECT outline FROM outlines WHERE digest = ? AND extension = ?", (digest, extension),
+        ).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, rel_path, st):
+        """
+        Liefert die Gliederung einer seit dem letzten Lauf unveränderten Datei.
+
+        Returns:
+            tuple | None: (Inhalts-Hash, Gliederung) oder None, wenn die Datei
+                gelesen werden muss.
+        """
+        digest = self.fresh_digest(rel_path, st)
+        if digest is None:
+            return None
+        outline = self._outline(digest, _extension(rel_path))
+        if outline is None:
+            return None
+        self.reused += 1
+        return digest, outline
+
+    def update(self, rel_path, st, digest, text):
+        """Liefert die Gliederung eines gelesenen Inhalts; neue Inhalte werden extrahiert und gespeichert."""
+        extension = _extension(rel_path)
+        outline = self._outline(digest, extension)
+        if outline is None:
+            outline = extract_outline(text, rel_path)
+            self._db.execute("INSERT OR REPLACE INTO outlines VALUES (?, ?, ?)", (digest, extension, outline))
+            self.extracted += 1
+        else:
+            self.reused += 1
+        self._remember(rel_path, st, digest)
+        return outline
+
+    def _collect_garbage(self):
+        self._db.execute("DELETE FROM outlines WHERE digest NOT IN (SELECT digest FROM files)")
@@ -0,0 +1,121 @@
+"""
+Benannte Profile für den Collector.
+
+Jedes Profil beschreibt, welche Ordner (relativ zum Projekt-Root) rekursiv
+durchsucht werden und welche Dateiendungen in das jeweilige Bundle gehören.
+Die Profile ersetzen die früheren, fast identischen copy_ts_code*.py-Skripte.
+"""
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    Beschreibt ein Bundle.
+
+    Attributes:
+        name (str): Eindeutiger Name des Profils (z.B. "backend").
+        directories (tuple): Relative Startordner, Schrägstriche als Trenner.
+        extensions (tuple): Dateiendungen in Kleinbuchstaben, z.B. (".ts",).
+        encoding_errors (str): Fehlerbehandlung beim Dekodieren ("strict" oder "ignore").
+    """
+    name: str
+    directories: tuple
+    extensions: tuple
+    encoding_errors: str = "strict"
+
+    def normalized_directories(self):
+        """Gibt die Startordner als normalisierte, relative POSIX-Pfade zurück."""
+        return tuple(normalize_rel_dir(d) for d in self.directories)
+
+
+def normalize_rel_dir(rel_dir):
+    """
+    Normalisiert einen relativen Ordnerpfad auf Schrägstriche ohne
+    führendes "./" und ohne abschließenden Trenner.
+    """
+    return os.path.normpath(rel_dir).replace("\\", "/")
+
+
+# --- Konfiguration ---
+# Fügen Sie hier neue Profile hinzu. Verwenden Sie Schrägstriche (/) als
+# Pfadtrenner, auch unter Windows. Die Reihenfolge der Ordner bestimmt die
+# Reihenfolge im Bundle.
+PROFILES = {
+    "default": Profile(
+        name="default",
+        directories=(
+            "apps/backend/src",
+            "apps/frontend/src",
+            "apps/frontend/app",
+            "packages/shared-types/src",
+            "apps/frontend-new/src",
+        ),
+        extensions=(".ts",),
+    ),
+    "small": Profile(
+        name="small",
+        directories=(
+            "apps/frontend/src/components/dashboard/category-management",
+            "apps/frontend/src/components/guild",
+            "apps/frontend/src/context",
+            "apps/frontend/src/lib",
+        ),
+        extensions=(".ts",),
+    ),
+    "backend": Profile(
+        name="backend",
+        directories=(
+            "apps/backend/src",
+            "packages/shared-types/src",
+        ),
+        extensions=(".ts", ".tsx", ".css"),
+        encoding_errors="ignore",
+    ),
+    "frontend": Profile(
+        name="frontend",
+        directories=(
+            "apps/frontend/src",
+            "packages/shared-types/src",
+        ),
+        extensions=(".ts", ".tsx", ".css"),
+        encoding_errors="ignore",
+    ),
+    "frontend-new": Profile(
+        name="frontend-new",
+        directories=(
+            "apps/frontend-new/src",
+        ),
+        extensions=(".ts", ".tsx", ".css"),
+        encoding_errors="ignore",
+    ),
+}
+# --- Ende der Konfiguration ---
+
+DEFAULT_PROFILE = "default"
+
+
+def get_profiles(names):
+    """
+    Löst Profilnamen in Profile-Objekte auf.
+
+    Args:
+        names (list): Liste von Profilnamen.
+
+    Returns:
+        list: Die Profile in der angefragten Reihenfolge (ohne Duplikate).
+
+    Raises:
+        KeyError: Wenn ein Profil unbekannt ist.
+    """
+    resolved = []
+    seen = set()
+    for name in names:
+        if name not in PROFILES:
+            raise KeyError(f"Unbekanntes Profil: {name} (verfügbar: {', '.join(PROFILES)})")
+        if name in seen:
+            continue
+        seen.add(name)
+        resolved.append(PROFILES[name])
+    return resolved
@@ -0,0 +1,293 @@
+"""
+Relevanz-Ranking für Bundles mit Größenbudget (--budget-bytes, --budget-tokens).
+
+Passt ein Profil nicht ins Budget, werden seine Dateien bewertet und in
+absteigender Reihenfolge aufgenommen, solange sie noch passen. Die
+ausgelassenen Dateien werden am Ende des Bundles aufgelistet.
+
+Alle Signale kommen aus Metadaten, Dateien werden dafür nicht gelesen:
+
+- focus:   Anteil der Suchbegriffe (--focus), die im Pfad vorkommen
+- imports: Anzahl der Dateien, die die Datei importieren (Import-Graph). Die
+           Import-Listen kommen nur über den Snapshot-Cache aus imports.json;
+           eine Datei, deren aktueller Inhalt dort fehlt, zählt als Datei
+           ohne Importe. Der Collector nimmt die Import-Listen der Dateien
+           auf, die er ohnehin liest, sodass sie beim nächsten Lauf bekannt
+           sind. Mit --no-cache entfällt das Signal.
+- churn:   Anzahl der letzten CHURN_COMMITS Commits, die die Datei geändert
+           haben (pro HEAD in .ts_collector_cache/churn.json gespeichert)
+- recent:  Alter der letzten Änderung (mtime) mit einer Halbwertszeit von
+           RECENT_HALF_LIFE_DAYS Tagen
+
+Bei einem Byte-Budget kommt die Größe einer Datei aus stat(). Bei einem
+Token-Budget werden die Kandidaten einmal gelesen und mit derselben Schätzung
+gezählt, mit der auch das Bundle gemessen wird (budget.estimate_tokens), siehe
+content_tokens. Minifizierung und Outline machen einen Block nur kleiner; für
+einen Dedupe-Verweis wird höchstens der längste mögliche Verweis angesetzt.
+Das Budget wird also nicht überschritten.
+"""
+import json
+import math
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+from .budget import estimate_tokens, utf8_len
+from .cache import CACHE_DIR_NAME, _atomic_write
+from .collector import is_under
+from .gitindex import GitError, churn_counts, current_commit
+from .imports import IMPORT_EXTENSIONS
+from .reader import SkippedFile, read_source
+from .sinks import format_duplicate, format_header
+
+CHURN_CACHE_NAME = "churn.json"
+CHURN_CACHE_VERSION = 1
+CHURN_COMMITS = 500
+RECENT_HALF_LIFE_DAYS = 14
+WEIGHTS = {"focus": 4.0, "imports": 2.0, "churn": 1.0, "recent": 1.0}
+MAX_RESERVE_ROUNDS = 8
+
+
+@dataclass
+class RankedFile:
+    """
+    Eine bewertete Datei.
+
+    Attributes:
+        path (str): Relativer Pfad.
+        size (int): Größe laut stat() in Bytes.
+        score (float): Gewichtete Summe der Signale.
+        signals (dict): Signalname -> Wert zwischen 0 und 1.
+    """
+    path: str
+    size: int
+    score: float = 0.0
+    signals: dict = field(default_factory=dict)
+
+
+@dataclass
+class Selection:
+    """
+    Auswahl eines Profils.
+
+    Attributes:
+        selected (list): Aufgenommene Pfade in Durchlaufreihenfolge.
+        omitted (list): Ausgelassene RankedFile, nach Score absteigend.
+        used (int): Geschätzter Verbrauch in der Budget-Einheit.
+        total (int): Geschätzter Umfang aller Kandidaten.
+    """
+    selected: list = field(default_factory=list)
+    omitted: list = field(default_factory=list)
+    used: int = 0
+    total: int = 0
+
+
+def focus_terms(text):
+    """Zerlegt --focus in Suchbegriffe (Leerzeichen oder Komma getrennt, Kleinschreibung)."""
+    return [term for term in re.split(r"[\s,]+", (text or "").lower()) if term]
+
+
+def load_churn(base_path, cache_dir=None, persistent=True, max_commits=CHURN_COMMITS):
+    """
+    Churn pro Datei (siehe gitindex.churn_counts), gespeichert pro HEAD.
+
+    Returns:
+        dict: Relativer Pfad -> Anzahl der Commits; leer ohne Git-Checkout.
+    """
+    try:
+        head = current_commit(base_path)
+    except GitError:
+        return {}
+    cache_path = os.path.join(os.path.abspath(cache_dir or os.path.join(base_path, CACHE_DIR_NAME)), CHURN_CACHE_NAME)
+    if persistent:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if (data.get("version"), data.get("head"), data.get("commits")) == (CHURN_CACHE_VERSION, head, max_commits):
+                return data["counts"]
+        except (OSError, ValueError, KeyError):
+            pass
+    try:
+        counts = churn_counts(base_path, max_commits)
+    except GitError:
+        return {}
+    if persistent:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        data = {"version": CHURN_CACHE_VERSION, "head": head, "commits": max_commits, "counts": counts}
+        _atomic_write(cache_path, json.dumps(data, separators=(",", ":")).encode("utf-8"))
+    return counts
+
+
+def import_in_degree(graph, files):
+    """
+    Zählt für jede Datei, wie viele Dateien aus files sie importieren. Es
+    zählen nur Import-Listen aus dem Cache (siehe ImportGraph.cached_targets).
+
+    Args:
+        files (list): (relativer Pfad, os.stat_result oder None).
+
+    Returns:
+        tuple: (dict relativer Pfad -> Anzahl, Anzahl der Dateien ohne Import-Liste im Cache)
+    """
+    in_degree = {}
+    uncached = 0
+    for rel_path, st in files:
+        if not rel_path.endswith(IMPORT_EXTENSIONS):
+            continue
+        targets = graph.cached_targets(rel_path, st)
+        if targets is None:
+            uncached += 1
+            continue
+        for target in targets:
+            if target != rel_path:
+                in_degree[target] = in_degree.get(target, 0) + 1
+    return in_degree, uncached
+
+
+def _log_scale(value, maximum):
+    return math.log1p(value) / math.log1p(maximum) if maximum else 0.0
+
+
+def rank_files(candidates, focus=(), in_degree=None, churn=None, now=None):
+    """
+    Bewertet Dateien.
+
+    Args:
+        candidates (list): (relativer Pfad, os.stat_result oder None).
+        focus (list): Suchbegriffe in Kleinschreibung (siehe focus_terms).
+
+    Returns:
+        list: RankedFile nach Score absteigend; bei Gleichstand in der
+            Reihenfolge von candidates.
+    """
+    now = time.time() if now is None else now
+    in_degree = in_degree or {}
+    churn = churn or {}
+    max_in_degree = max((in_degree.get(p, 0) for p, _ in candidates), default=0)
+    max_churn = max((churn.get(p, 0) for p, _ in candidates), default=0)
+    ranked = []
+    for rel_path, st in candidates:
+        lower_path = rel_path.lower()
+        age_days = max(0.0, now - st.st_mtime) / 86400 if st is not None else math.inf
+        signals = {
+            "focus": sum(term in lower_path for term in focus) / len(focus) if focus else 0.0,
+            "imports": _log_scale(in_degree.get(rel_path, 0), max_in_degree),
+            "churn": _log_scale(churn.get(rel_path, 0), max_churn),
+            "recent": 0.5 ** (age_days / RECENT_HALF_LIFE_DAYS),
+        }
+        score = sum(WEIGHTS[name] * value for name, value in signals.items())
+        ranked.append(RankedFile(rel_path, st.st_size if st is not None else 0, score, signals))
+    ranked.sort(key=lambda f: -f.score)  # stabil
+    return ranked
+
+
+def format_omitted(omitted):
+    """Liste der ausgelassenen Dateien für das Ende des Bundles."""
+    lines = "".join(f"- {f.path}\n" for f in omitted)
+    return f"Wegen des Größenbudgets ausgelassen ({len(omitted)} Datei(en)):\n{lines}"
+
+
+def content_tokens(base_path, paths, max_size=None):
+    """
+    Geschätzte Tokens des Inhalts jeder Datei (für ein Token-Budget).
+
+    Ungültiges UTF-8 wird ersetzt statt ausgelassen, die Zählung liegt also
+    nicht unter der des Bundles. Nicht lesbare oder übersprungene Dateien
+    zählen 0, sie erscheinen ohnehin nicht im Bundle.
+
+    Args:
+        base_path (str): Projekt-Root.
+        paths (iterable): Relative Pfade.
+        max_size (int): Größengrenze wie beim Sammeln (None = unbegrenzt).
+
+    Returns:
+        dict: Relativer Pfad -> Anzahl der Tokens.
+    """
+    tokens = {}
+    for rel_path in paths:
+        try:
+            raw = read_source(os.path.join(base_path, rel_path), max_size)
+        except (OSError, SkippedFile):
+            tokens[rel_path] = 0
+            continue
+        tokens[rel_path] = estimate_tokens(str(raw, "utf-8", "replace"))
+        del raw
+    return tokens
+
+
+def select_within_budget(ranked, budget, unit="bytes", order=None, tokens=None):
+    """
+    Nimmt Dateien in Score-Reihenfolge auf, solange sie ins Budget passen;
+    zu große Dateien werden übersprungen. Die Liste der ausgelassenen
+    Dateien zählt mit; für sie wird vorab Platz im Budget reserviert.
+
+    Args:
+        ranked (list): RankedFile nach Score absteigend.
+        budget (int): Budget in Bytes oder geschätzten Tokens.
+        unit (str): "bytes" oder "tokens".
+        order (list): Reihenfolge der aufgenommenen Pfade (Standard: Pfadsortierung).
+        tokens (dict): Relativer Pfad -> Tokens des Inhalts (siehe
+            content_tokens); nötig für unit="tokens".
+
+    Returns:
+        Selection
+    """
+    if unit == "tokens":
+        measure = estimate_tokens
+        sizes = tokens
+    else:
+        measure = utf8_len
+        sizes = {f.path: f.size for f in ranked}
+    # Ein Dedupe-Verweis ersetzt den Inhalt; er verweist auf einen der Kandidaten
+    duplicate = max((measure(format_duplicate(f.path)) for f in ranked), default=0)
+    separator = measure("\n\n")
+
+    costs = {f.path: measure(format_header(f.path)) + max(sizes[f.path], duplicate) + separator for f in ranked}
+    line_costs = {f.path: measure(f"- {f.path}\n") for f in ranked}
+
+    def fill(limit):
+        chosen, skipped, total = [], [], 0
+        for f in ranked:
+            if total + costs[f.path] <= limit:
+                chosen.append(f)
+                total += costs[f.path]
+            else:
+                skipped.append(f)
+        return chosen, skipped, total
+
+    def listing_cost(skipped):
+        return measure(format_omitted([])) + sum(line_costs[f.path] for f in skipped) if skipped else 0
+
+    # Platz für die Liste reservieren; mehr Reserve lässt mehr Dateien
+    # heraus, die Reserve wächst also nur, bis sie ausreicht.
+    reserve = 0
+    for _ in range(MAX_RESERVE_ROUNDS):
+        selected, omitted, used = fill(budget - reserve)
+        needed = listing_cost(omitted)
+        if used + needed <= budget:
+            break
+        reserve = max(needed, reserve + 1)
+    listing = listing_cost(omitted)
+    while selected and used + listing > budget:
+        dropped = selected.pop()
+        used -= costs[dropped.path]
+        omitted.append(dropped)
+        listing = listing_cost(omitted)
+    omitted.sort(key=lambda f: -f.score)
+
+    kept = {f.path for f in selected}
+    paths = order if order is not None else sorted(kept)
+    return Selection(
+        selected=[p for p in paths if p in kept],
+        omitted=omitted,
+        used=used + listing,
+        total=sum(costs.values()),
+    )
+
+
+def profile_candidates(profile, files):
+    """Die Dateien aus files (relativer Pfad, stat), die zum Profil gehören."""
+    dirs = profile.normalized_directories()
+    extensions = tuple(e.lower() for e in profile.extensions)
+    return [(p, st) for p, st in files if p.lower().endswith(extensions) and any(is_under(p, d) for d in dirs)]
@@ -0,0 +1,172 @@
+"""
+Lese-Stufe des Collectors.
+
+Dateien werden wahlweise nacheinander oder über einen Thread-Pool gelesen.
+Die Ergebnisse werden immer in der Reihenfolge der Eingabe zurückgegeben,
+damit die Bundles unabhängig von der Anzahl der Worker byteidentisch bleiben.
+
+Binärdateien (NUL-Byte am Anfang) und Dateien über der Größengrenze werden
+erkannt, bevor ihr Inhalt gelesen wird. Große Textdateien werden per mmap
+eingeblendet statt in einen eigenen Puffer kopiert; Hash, Cache und
+Dekodierung arbeiten direkt auf der Abbildung.
+"""
+import mmap
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+# Threads lohnen sich hier, weil das Lesen I/O-gebunden ist (kaltes
+# Dateisystem-Cache, Netzlaufwerke); open()/read() geben die GIL frei.
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) + 4)
+
+# Wie viele Dateien pro Worker höchstens im Voraus gelesen werden. Begrenzt
+# den Speicherbedarf, wenn der Verbraucher langsamer ist als die Worker.
+PREFETCH_PER_JOB = 4
+
+# Wie Git: ein NUL-Byte in den ersten 8000 Bytes kennzeichnet eine Binärdatei
+SNIFF_BYTES = 8000
+# Ab dieser Größe wird per mmap gelesen
+MMAP_THRESHOLD = 1024 * 1024
+DEFAULT_MAX_FILE_BYTES = 2 * 1024 * 1024
+
+
+class SkippedFile(Exception):
+    """Datei wurde bewusst nicht gelesen; der Text nennt den Grund."""
+
+
+@dataclass(frozen=True)
+class SourceFile:
+    """
+    Verweis auf eine geprüfte, aber nicht gelesene Quelldatei. Archiv-Sinks
+    kopieren den Inhalt direkt von Datei zu Datei (siehe archive.py).
+    """
+    abs_path: str
+    size: int
+
+
+def format_size(size):
+    """Größenangabe für Meldungen, z.B. "2.0 MiB"."""
+    if size < 1024:
+        return f"{size} Bytes"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def read_bytes(abs_path):
+    """Liest eine Datei vollständig als Bytes."""
+    with open(abs_path, "rb") as f:
+        return f.read()
+
+
+def read_source(abs_path, max_size=None):
+    """
+    Liest eine Quelldatei für das Bundle.
+
+    Args:
+        abs_path (str): Absoluter Pfad.
+        max_size (int): Größengrenze in Bytes (None = unbegrenzt).
+
+    Returns:
+        bytes | mmap.mmap: Inhalt; ab MMAP_THRESHOLD als schreibgeschützte Abbildung.
+
+    Raises:
+        SkippedFile: Bei Binärdateien und Dateien über max_size.
+        OSError: Bei Lesefehlern.
+    """
+    with open(abs_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if max_size is not None and size > max_size:
+            raise SkippedFile(f"zu groß ({format_size(size)} > {format_size(max_size)})")
+        if size >= MMAP_THRESHOLD:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                data = f.read()
+        else:
+            data = f.read()
+    if data.find(b"\0", 0, SNIFF_BYTES) != -1:
+        raise SkippedFile("Binärdatei")
+    return data
+
+
+def inspect_source(abs_path, max_size=None):
+    """
+    Prüft eine Quelldatei wie read_source, liest aber nur den Anfang.
+
+    Returns:
+        SourceFile: Pfad und Größe der Datei.
+
+    Raises:
+        SkippedFile: Bei Binärdateien und Dateien über max_size.
+        OSError: Bei Lesefehlern.
+    """
+    with open(abs_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if max_size is not None and size > max_size:
+            raise SkippedFile(f"zu groß ({format_size(size)} > {format_size(max_size)})")
+        if b"\0" in f.read(SNIFF_BYTES):
+            raise SkippedFile("Binärdatei")
+    return SourceFile(abs_path, size)
+
+
+def _read_or_error(abs_path, max_size=None, inspect_only=False):
+    started = time.perf_counter()
+    try:
+        data = inspect_source(abs_path, max_size) if inspect_only else read_source(abs_path, max_size)
+    except (OSError, SkippedFile) as e:
+        data = e
+    return data, time.perf_counter() - started
+
+
+def read_files(base_path, rel_paths, jobs=DEFAULT_JOBS, source_paths=None, max_size=None, timings=None,
+               inspect_only=False):
+    """
+    Liest mehrere Dateien und liefert sie in Eingabereihenfolge.
+
+    Die Pfadliste steht zu Beginn fest; mit jobs > 1 lesen die Worker bis zu
+    einem Vorlauffenster voraus, während der Aufrufer die bereits gelieferten
+    Dateien verarbeitet.
+
+    Args:
+        base_path (str): Der Basispfad (Projekt-Root).
+        rel_paths (iterable): Relative Pfade der zu lesenden Dateien.
+        jobs (int): Anzahl paralleler Leser; 1 liest sequentiell ohne Thread-Pool.
+        source_paths (dict): Optionale abweichende absolute Quellpfade je
+            relativem Pfad (z.B. Objekte aus dem Snapshot-Cache).
+        max_size (int): Größengrenze pro Datei in Bytes (None = unbegrenzt).
+        timings (dict): Wird, falls angegeben, mit relativem Pfad -> Lesesekunden gefüllt.
+        inspect_only (bool): Dateien nur prüfen und SourceFile statt des Inhalts liefern.
+
+    Yields:
+        tuple: (relativer Pfad, Inhalt bzw. SourceFile oder OSError/SkippedFile)
+    """
+    source_paths = source_paths or {}
+
+    def abs_path_for(rel_path):
+        return source_paths.get(rel_path) or os.path.join(base_path, rel_path)
+
+    def result(rel_path, outcome):
+        data, seconds = outcome
+        if timings is not None:
+            timings[rel_path] = seconds
+        return rel_path, data
+
+    if jobs <= 1:
+        for rel_path in rel_paths:
+            yield result(rel_path, _read_or_error(abs_path_for(rel_path), max_size, inspect_only))
+        return
+
+    window = jobs * PREFETCH_PER_JOB
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="ts-collector-read") as executor:
+        pending = deque()
+        for rel_path in rel_paths:
+            pending.append((rel_path, executor.submit(_read_or_error, abs_path_for(rel_path), max_size, inspect_only)))
+            if len(pending) >= window:
+                done_path, future = pending.popleft()
+                yield result(done_path, future.result())
+        while pending:
+            done_path, future = pending.popleft()
+            yield result(done_path, future.result())
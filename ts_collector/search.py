@@ -0,0 +1,318 @@
+"""
+Trigramm-Suchindex über die gesammelten Dateien (query-Unterbefehl, --index).
+
+Für jeden Dateiinhalt werden alle Byte-Trigramme (ASCII in Kleinschreibung)
+in einer SQLite-Datenbank (.ts_collector_cache/search.sqlite) abgelegt.
+Die Trigramme hängen nur vom Inhalt ab und werden unter dem Inhalts-Hash
+gespeichert; unveränderte Dateien erkennt der Index an Größe und mtime und
+liest sie nicht erneut.
+
+Eine Suche (Teilstring oder regulärer Ausdruck) bestimmt zuerst die
+Trigramme, die jeder Treffer enthalten muss, und holt aus dem Index nur die
+Dateien, die alle davon enthalten. Nur diese Kandidaten werden gelesen und
+zeilenweise geprüft.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+
+from .cache import content_hash
+from .collector import is_under, walk_profile_files
+from .reader import DEFAULT_JOBS, SkippedFile, read_files, read_source
+from .sqlindex import SqliteIndex
+from .walker import DEFAULT_PRUNE_DIRS
+
+SEARCH_DB_NAME = "search.sqlite"
+SEARCH_VERSION = 1
+DEFAULT_MAX_SNIPPETS = 3
+MAX_SNIPPET_CHARS = 160
+
+
+def trigrams(data):
+    """Menge der Trigramme eines Inhalts als Ganzzahlen (ASCII-Kleinschreibung)."""
+    data = bytes(data).lower()
+    return {(a << 16) | (b << 8) | c for a, b, c in set(zip(data, data[1:], data[2:]))}
+
+
+def _skip_class(pattern, i):
+    """Position hinter der Zeichenklasse [...], die bei i beginnt."""
+    i += 1
+    if pattern.startswith("^", i):
+        i += 1
+    if pattern.startswith("]", i):
+        i += 1
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+            continue
+        if pattern[i] == "]":
+            return i + 1
+        i += 1
+    return len(pattern)
+
+
+def _skip_group(pattern, i):
+    """Position hinter der Gruppe (...), die bei i beginnt."""
+    depth = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            i = _skip_class(pattern, i)
+            continue
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(pattern)
+
+
+def split_alternatives(pattern):
+    """Teilt einen regulären Ausdruck an den "|" der obersten Ebene."""
+    parts = []
+    start = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            i = _skip_class(pattern, i)
+            continue
+        if ch == "(":
+            i = _skip_group(pattern, i)
+            continue
+        if ch == "|":
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    parts.append(pattern[start:])
+    return parts
+
+
+def required_literals(pattern):
+    """
+    Liefert Teilstrings, die in jedem Treffer des regulären Ausdrucks (ohne
+    "|" auf oberster Ebene, siehe split_alternatives) vorkommen.
+
+    Die Auswertung ist bewusst vorsichtig: Gruppen und Zeichenklassen werden
+    übersprungen, ein Zeichen vor ?, * oder {0,n} gilt als optional.
+    """
+    literals = []
+    run = []
+
+    def cut():
+        if len(run) >= 3:
+            literals.append("".join(run))
+        run.clear()
+
+    i = 0
+    n = len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < n:
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped.isalnum():  # \d, \w, \b, Rückverweise, ...
+                cut()
+                continue
+            run.append(escaped)
+            continue
+        if ch == "[":
+            cut()
+            i = _skip_class(pattern, i)
+            continue
+        if ch == "(":
+            cut()
+            i = _skip_group(pattern, i)
+            continue
+        if ch in "?*":
+            if run:
+                run.pop()
+            cut()
+            i += 1
+            continue
+        if ch == "{":
+            end = pattern.find("}", i)
+            quantifier = pattern[i + 1:end] if end != -1 else ""
+            if end != -1 and re.fullmatch(r"\d*(?:,\d*)?", quantifier):
+                if quantifier.split(",")[0] in ("", "0") and run:
+                    run.pop()
+                cut()
+                i = end + 1
+                continue
+        elif ch in "+.^$":
+            cut()
+            i += 1
+            continue
+        run.append(ch)
+        i += 1
+    cut()
+    return literals
+
+
+@dataclass
+class SearchHit:
+    """
+    Treffer in einer Datei.
+
+    Attributes:
+        path (str): Relativer Pfad.
+        lines (list): (Zeilennummer, Ausschnitt) der ersten Treffer.
+        count (int): Anzahl aller Trefferzeilen.
+    """
+    path: str
+    lines: list = field(default_factory=list)
+    count: int = 0
+
+
+class SearchIndex(SqliteIndex):
+    """
+    Persistenter Trigramm-Index (SQLite).
+
+    Tabellen:
+        files: Pfad -> Größe, mtime_ns, Prüfzeitpunkt, Inhalts-Hash
+        contents: Inhalts-Hash -> laufende Nummer
+        postings: (Trigramm, Inhaltsnummer), sortiert nach Trigramm
+
+    Attributes:
+        indexed (int): Inhalte, die in diesem Lauf neu aufgenommen wurden.
+    """
+
+    db_name = SEARCH_DB_NAME
+    version = SEARCH_VERSION
+    tables = ("contents", "postings")
+    schema = """
+        CREATE TABLE contents (id INTEGER PRIMARY KEY, digest TEXT UNIQUE);
+        CREATE TABLE postings (trigram INTEGER, content_id INTEGER, PRIMARY KEY (trigram, content_id)) WITHOUT ROWID;
+    """
+
+    def __init__(self, base_path, cache_dir=None, persistent=True):
+        super().__init__(base_path, cache_dir, persistent)
+        self.indexed = 0
+
+    def update(self, rel_path, st, digest, raw):
+        """Nimmt einen gelesenen Inhalt auf, falls er noch nicht im Index steht."""
+        if self._db.execute("SELECT 1 FROM contents WHERE digest = ?", (digest,)).fetchone() is None:
+            content_id = self._db.execute("INSERT INTO contents (digest) VALUES (?)", (digest,)).lastrowid
+            self._db.executemany(
+                "INSERT INTO postings VALUES (?, ?)", ((trigram, content_id) for trigram in trigrams(raw)),
+            )
+            self.indexed += 1
+        self._remember(rel_path, st, digest)
+
+    def candidates(self, alternatives):
+        """
+        Pfade aller Dateien, deren Inhalt für mindestens eine der Alternativen
+        jedes ihrer Trigramme enthält. Eine leere Alternative passt auf alle Pfade.
+        """
+        if not all(alternatives):
+            return set(self.paths)
+        paths = set()
+        for required in alternatives:
+            placeholders = ",".join("?" * len(required))
+            rows = self._db.execute(
+                f"SELECT f.path FROM files f JOIN contents c ON c.digest = f.digest WHERE c.id IN ("
+                f"SELECT content_id FROM postings WHERE trigram IN ({placeholders}) "
+                f"GROUP BY content_id HAVING COUNT(*) = ?)",
+                [*required, len(required)],
+            )
+            paths.update(path for (path,) in rows)
+        return paths
+
+    def _collect_garbage(self):
+        self._db.execute(
+            "DELETE FROM postings WHERE content_id IN "
+            "(SELECT id FROM contents WHERE digest NOT IN (SELECT digest FROM files))"
+        )
+        self._db.execute("DELETE FROM contents WHERE digest NOT IN (SELECT digest FROM files)")
+
+
+def refresh_index(index, base_path, profiles, prune_dirs=DEFAULT_PRUNE_DIRS, use_ignore_files=True,
+                  jobs=DEFAULT_JOBS, max_file_size=None):
+    """
+    Gleicht den Index mit den aktuellen Dateien der Profile ab: geänderte und
+    neue Dateien werden gelesen, gelöschte entfernt.
+
+    Returns:
+        tuple: (alle Pfade der Profile in Durchlaufreihenfolge, Fehlermeldungen)
+    """
+    files, roots = walk_profile_files(base_path, profiles, prune_dirs, use_ignore_files)
+    paths = [rel_path for rel_path, _ in files]
+    file_stats = {rel_path: st for rel_path, st in files if st is not None}
+
+    seen = set(paths)
+    index.forget([p for p in index.paths if p not in seen and any(is_under(p, r) for r in roots)])
+    stale = [p for p in paths if index.fresh_digest(p, file_stats.get(p)) is None]
+    errors = []
+    for rel_path, raw in read_files(base_path, stale, jobs, max_size=max_file_size):
+        if isinstance(raw, SkippedFile):
+            continue
+        if isinstance(raw, OSError):
+            errors.append(f"FEHLER: Konnte Datei nicht lesen: {rel_path} - {raw}")
+            continue
+        index.update(rel_path, file_stats.get(rel_path), content_hash(raw), raw)
+    index.save()
+    return paths, errors
+
+
+def compile_query(pattern, regex=False, ignore_case=False):
+    """
+    Returns:
+        tuple: (kompilierter Ausdruck, Liste von Trigramm-Mengen: ein Treffer
+            enthält alle Trigramme mindestens einer Menge)
+
+    Raises:
+        re.error: Bei einem ungültigen regulären Ausdruck.
+    """
+    flags = re.IGNORECASE if ignore_case else 0
+    compiled = re.compile(pattern if regex else re.escape(pattern), flags)
+    if regex:
+        branches = [required_literals(part) for part in split_alternatives(pattern)]
+    else:
+        branches = [[pattern] if len(pattern) >= 3 else []]
+    alternatives = []
+    for literals in branches:
+        required = set()
+        for literal in literals:
+            required |= trigrams(literal.encode("utf-8"))
+        if ignore_case:
+            # Nicht-ASCII-Zeichen werden im Index nicht gefaltet
+            required = {t for t in required if t & 0x808080 == 0}
+        alternatives.append(required)
+    return compiled, alternatives
+
+
+def search(index, base_path, paths, compiled, alternatives, max_snippets=DEFAULT_MAX_SNIPPETS):
+    """
+    Sucht in den Dateien paths, die laut Index als Treffer in Frage kommen.
+
+    Returns:
+        tuple: (Liste von SearchHit in der Reihenfolge von paths, Anzahl der Kandidaten)
+    """
+    candidates = index.candidates(alternatives)
+    candidates = [p for p in paths if p in candidates]
+    hits = []
+    for rel_path in candidates:
+        try:
+            raw = read_source(os.path.join(base_path, rel_path))
+        except (OSError, SkippedFile):
+            continue
+        text = str(raw, "utf-8", "replace")
+        if not compiled.search(text):
+            continue
+        hit = SearchHit(rel_path)
+        for number, line in enumerate(text.splitlines(), 1):
+            if compiled.search(line):
+                hit.count += 1
+                if len(hit.lines) < max_snippets:
+                    hit.lines.append((number, line.strip()[:MAX_SNIPPET_CHARS]))
+        if hit.count:
+            hits.append(hit)
+    return hits, len(candidates)
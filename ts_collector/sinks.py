@@ -0,0 +1,377 @@
+"""
+Ausgabeziele (Sinks) für Bundles.
+
+Der Collector übergibt jede Datei einzeln an den Sink, sobald sie gelesen
+wurde. Die Sinks schreiben inkrementell, sodass der Speicherbedarf durch die
+größte Einzeldatei begrenzt bleibt und nicht durch das gesamte Bundle.
+
+Das Ergebnis ist byteidentisch zu "".join(blocks).strip() der früheren
+Implementierung: Leerraum am Ende wird zurückgehalten, bis klar ist, dass
+noch weiterer Inhalt folgt.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from .budget import split_to_budget, utf8_len
+
+# Wie viele Zeichen bei einem Fehler der Zwischenablage angezeigt werden
+PREVIEW_CHARS = 500
+
+
+class SinkError(Exception):
+    """Fehler beim Schreiben in einen Sink; preview enthält den Anfang des Inhalts."""
+
+    def __init__(self, message, preview=""):
+        super().__init__(message)
+        self.preview = preview
+
+
+def format_header(rel_path):
+    """Kopfzeile eines Dateiblocks im Bundle."""
+    return f"Path: {rel_path}\n\n"
+
+
+def format_duplicate(first_path):
+    """Inhalt des Blocks einer Datei, deren Inhalt schon unter first_path ausgegeben wurde."""
+    return f"[Inhalt identisch mit {first_path}]"
+
+
+def _trailing_whitespace_start(text):
+    end = len(text)
+    while end and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+class Sink:
+    """
+    Basisklasse für Ausgabeziele.
+
+    Unterklassen implementieren _open(), _emit(text) und _close(). Das
+    Ziel wird erst beim ersten Schreibzugriff geöffnet, damit bei leeren
+    Bundles keine leeren Dateien entstehen.
+    """
+
+    def __init__(self):
+        self.is_open = False
+        self.chars_written = 0
+        self.bytes_written = 0  # UTF-8, für Größenangaben (--workspace)
+        self.emit_seconds = 0.0  # Zeit in _emit/_close, für --stats
+        self._pending_ws = ""
+
+    def write_file(self, rel_path, content):
+        """Schreibt einen Dateiblock ("Path: ...\\n\\n{content}\\n\\n")."""
+        self.write_text(format_header(rel_path))
+        self.write_text(content)
+        self.write_text("\n\n")
+
+    def write_duplicate(self, rel_path, first_path):
+        """Schreibt statt des Inhalts einen einzeiligen Verweis auf die inhaltsgleiche Datei first_path."""
+        self.write_file(rel_path, format_duplicate(first_path))
+
+    def write_text(self, text):
+        """Schreibt Text; führender Leerraum am Anfang und Leerraum am Ende des Bundles entfällt."""
+        if not self.is_open:
+            text = text.lstrip()
+            if not text:
+                return
+            self._open()
+            self.is_open = True
+        end = _trailing_whitespace_start(text)
+        if end == 0:
+            self._pending_ws += text
+            return
+        if self._pending_ws:
+            self._write(self._pending_ws)
+            self._pending_ws = ""
+        if end == len(text):
+            self._write(text)
+        else:
+            self._write(text[:end])
+            self._pending_ws = text[end:]
+
+    def _write(self, text):
+        self.chars_written += len(text)
+        self.bytes_written += utf8_len(text)
+        started = time.perf_counter()
+        self._emit(text)
+        self.emit_seconds += time.perf_counter() - started
+
+    def close(self):
+        """
+        Schließt den Sink.
+
+        Returns:
+            str: Beschreibung des Ziels für die Erfolgsmeldung (leer, wenn nie geöffnet).
+        """
+        self._pending_ws = ""
+        if not self.is_open:
+            return ""
+        self.is_open = False
+        started = time.perf_counter()
+        try:
+            return self._close()
+        finally:
+            self.emit_seconds += time.perf_counter() - started
+
+    def _open(self):
+        pass
+
+    def _emit(self, text):
+        raise NotImplementedError
+
+    def _close(self):
+        return ""
+
+
+class BlockListSink(Sink):
+    """Sammelt die Blöcke im Speicher (für Aufrufer, die eine Liste erwarten)."""
+
+    def __init__(self, blocks):
+        super().__init__()
+        self.blocks = blocks
+
+    def write_file(self, rel_path, content):
+        self.write_text(f"{format_header(rel_path)}{content}\n\n")
+
+    def write_text(self, text):
+        self.blocks.append(text)
+        self.is_open = True
+
+    def _close(self):
+        return "im Speicher gesammelt"
+
+
+class MemorySink(Sink):
+    """Hält das Bundle als Text im Speicher (für den Daemon, siehe daemon.py)."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+
+    def _emit(self, text):
+        self._parts.append(text)
+
+    def getvalue(self):
+        """Das bisher geschriebene Bundle, byteidentisch zur Ausgabe von StdoutSink."""
+        return "".join(self._parts)
+
+    def _close(self):
+        return "im Speicher gehalten"
+
+
+class StdoutSink(Sink):
+    """Schreibt das Bundle auf die Standardausgabe."""
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+
+    def _emit(self, text):
+        self.stream.write(text)
+
+    def _close(self):
+        self.stream.flush()
+        return "auf die Standardausgabe geschrieben"
+
+
+class FileSink(Sink):
+    """Schreibt das Bundle in eine Datei (UTF-8, Zeilenenden unverändert)."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._file = None
+
+    def _open(self):
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8", newline="")
+
+    def _emit(self, text):
+        self._file.write(text)
+
+    def _close(self):
+        self._file.close()
+        self._file = None
+        return f"nach {self.path} geschrieben"
+
+
+class ChunkedFileSink(Sink):
+    """
+    Verteilt das Bundle auf nummerierte Dateien <prefix>.001.txt, <prefix>.002.txt, ...
+
+    Jeder Chunk bleibt unter einem Budget in Bytes oder geschätzten Tokens
+    (siehe budget.py) und beginnt mit einem Kopf, der die enthaltenen
+    Dateien auflistet. Dateien werden nur dann auf mehrere Chunks verteilt,
+    wenn sie allein größer als das Budget sind. Im Speicher liegt höchstens
+    ein Chunk, da der Kopf erst feststeht, wenn der Chunk voll ist.
+    """
+
+    def __init__(self, directory, prefix, budget, measure=utf8_len, unit_label="Bytes"):
+        super().__init__()
+        self.directory = directory
+        self.prefix = prefix
+        self.budget = budget
+        self.measure = measure
+        self.unit_label = unit_label
+        self.paths = []
+        self._texts = []
+        self._entries = []
+        self._used = 0
+
+    def _header(self, entries, used):
+        lines = [f"Chunk {len(self.paths) + 1}: {len(entries)} Datei(en), ca. {used} {self.unit_label}"]
+        lines.extend(f"- {entry}" for entry in entries)
+        return "\n".join(lines) + "\n\n"
+
+    def _fits(self, entry, text):
+        # Der Kopf nennt erst beim Schreiben den Verbrauch; das Budget ist eine obere Schranke dafür
+        header = self._header(self._entries + [entry], self.budget)
+        return self.measure(header) + self._used + self.measure(text) <= self.budget
+
+    def write_file(self, rel_path, content):
+        block = f"{format_header(rel_path)}{content}\n\n"
+        if self._entries and not self._fits(rel_path, block):
+            self._flush()
+        if self._fits(rel_path, block):
+            self._append(rel_path, block)
+            return
+
+        # Datei ist allein größer als das Budget: auf mehrere Chunks verteilen
+        reserve = self.measure(self._header([f"{rel_path} (Teil 999/999)"], self.budget))
+        reserve += self.measure(format_header(f"{rel_path} (Teil 999/999)")) + 2
+        parts = split_to_budget(content, self.budget - reserve, self.measure)
+        for index, part in enumerate(parts, start=1):
+            label = f"{rel_path} (Teil {index}/{len(parts)})"
+            if self._entries:
+                self._flush()
+            self._append(label, f"{format_header(label)}{part}\n\n")
+
+    def write_text(self, text):
+        if not self._entries and not text.strip():
+            return
+        self._texts.append(text)
+        self._used += self.measure(text)
+        self.is_open = True
+
+    def _append(self, entry, block):
+        self._entries.append(entry)
+        self._texts.append(block)
+        self._used += self.measure(block)
+        self.is_open = True
+
+    def _flush(self):
+        if not self._texts:
+            return
+        body = "".join(self._texts).strip()
+        header = self._header(self._entries, self._used)
+        if not self.paths:
+            os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.prefix}.{len(self.paths) + 1:03d}.txt")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            f.write(header)
+            f.write(body)
+        self.bytes_written += utf8_len(header) + utf8_len(body)
+        self.paths.append(path)
+        self._texts, self._entries, self._used = [], [], 0
+
+    def _close(self):
+        self._flush()
+        self._remove_stale_chunks()
+        return f"in {len(self.paths)} Datei(en) nach {self.directory} geschrieben ({self.prefix}.*.txt)"
+
+    def _remove_stale_chunks(self):
+        """Entfernt Chunks eines früheren, längeren Laufs mit demselben Präfix."""
+        index = len(self.paths) + 1
+        while True:
+            path = os.path.join(self.directory, f"{self.prefix}.{index:03d}.txt")
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                return
+            index += 1
+
+
+def _clipboard_command():
+    """Ermittelt ein Kommandozeilenwerkzeug, das die Zwischenablage von stdin füllt."""
+    if sys.platform == "darwin":
+        candidates = [["pbcopy"]]
+    elif sys.platform.startswith("linux"):
+        candidates = []
+        if os.environ.get("WAYLAND_DISPLAY"):
+            candidates.append(["wl-copy"])
+        if os.environ.get("DISPLAY"):
+            candidates += [["xclip", "-selection", "clipboard"], ["xsel", "--clipboard", "--input"]]
+    else:
+        candidates = []
+    for cmd in candidates:
+        if shutil.which(cmd[0]):
+            return cmd
+    return None
+
+
+class ClipboardSink(Sink):
+    """
+    Kopiert das Bundle in die Zwischenablage.
+
+    Wenn ein passendes Werkzeug (xclip, xsel, wl-copy, pbcopy) vorhanden ist,
+    wird der Inhalt direkt in dessen stdin gestreamt. Andernfalls wird
+    pyperclip verwendet; es wird erst hier importiert, damit Läufe ohne
+    Zwischenablage (z.B. auf CI) das Modul nicht benötigen.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._proc = None
+        self._buffer = None
+        self._preview = []
+        self._preview_len = 0
+
+    def _open(self):
+        cmd = _clipboard_command()
+        if cmd is not None:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        else:
+            self._buffer = []
+
+    def _emit(self, text):
+        if self._preview_len < PREVIEW_CHARS:
+            piece = text[:PREVIEW_CHARS - self._preview_len]
+            self._preview.append(piece)
+            self._preview_len += len(piece)
+        if self._proc is not None:
+            try:
+                self._proc.stdin.write(text.encode("utf-8"))
+            except BrokenPipeError as e:
+                raise SinkError(f"Konnte nicht in die Zwischenablage kopieren: {e}", "".join(self._preview))
+        else:
+            self._buffer.append(text)
+
+    def _close(self):
+        preview = "".join(self._preview)
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = self._proc.wait()
+            if returncode != 0:
+                raise SinkError(f"Konnte nicht in die Zwischenablage kopieren: Exit-Code {returncode}", preview)
+            return "in die Zwischenablage kopiert"
+
+        try:
+            import pyperclip  # Stellt sicher, dass Sie 'pip install pyperclip' ausgeführt haben
+        except ImportError as e:
+            raise SinkError(f"Konnte nicht in die Zwischenablage kopieren: {e}", preview)
+        content = "".join(self._buffer)
+        self._buffer = None
+        try:
+            pyperclip.copy(content)
+        except pyperclip.PyperclipException as e:
+            raise SinkError(f"Konnte nicht in die Zwischenablage kopieren: {e}", preview)
+        return "in die Zwischenablage kopiert"
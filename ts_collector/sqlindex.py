@@ -0,0 +1,110 @@
+"""
+Gemeinsame Grundlage der SQLite-Indizes (Gliederung, Suche).
+
+Jeder Index liegt als eigene Datenbank im Cache-Ordner und trägt seine
+Schema-Version in PRAGMA user_version; bei abweichender Version oder
+beschädigter Datei wird er neu aufgebaut. Die Tabelle files merkt sich
+Größe, mtime und Inhalts-Hash jeder Datei, damit unveränderte Dateien
+nicht erneut gelesen werden müssen.
+"""
+import os
+import sqlite3
+import time
+
+from .cache import CACHE_DIR_NAME
+
+FILES_SCHEMA = """
+    CREATE TABLE files (
+        path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, checked_ns INTEGER, digest TEXT
+    );
+    CREATE INDEX files_digest ON files (digest);
+"""
+
+
+class SqliteIndex:
+    """
+    Basisklasse: Verbindung, Schema-Version und Dateitabelle.
+
+    Unterklassen setzen db_name, version und schema (zusätzliche Tabellen)
+    und entfernen in _collect_garbage Daten, auf die keine Datei mehr verweist.
+    """
+
+    db_name = ""
+    version = 0
+    schema = ""
+    tables = ()
+
+    def __init__(self, base_path, cache_dir=None, persistent=True):
+        if persistent:
+            cache_dir = os.path.abspath(cache_dir or os.path.join(base_path, CACHE_DIR_NAME))
+            os.makedirs(cache_dir, exist_ok=True)
+            self.db_path = os.path.join(cache_dir, self.db_name)
+        else:
+            self.db_path = ":memory:"
+        # Dateien, die nach diesem Zeitpunkt geändert wurden, gelten beim nächsten Lauf als unsicher
+        self._started_ns = time.time_ns()
+        try:
+            self._db = self._open()
+        except sqlite3.DatabaseError:
+            # Beschädigte Datenbank: verwerfen und neu aufbauen
+            os.remove(self.db_path)
+            self._db = self._open()
+        self._files = {
+            path: (size, mtime_ns, checked_ns, digest)
+            for path, size, mtime_ns, checked_ns, digest in self._db.execute("SELECT * FROM files")
+        }
+
+    def _open(self):
+        db = sqlite3.connect(self.db_path)
+        if db.execute("PRAGMA user_version").fetchone()[0] != self.version:
+            drops = "".join(f"DROP TABLE IF EXISTS {table};\n" for table in ("files",) + tuple(self.tables))
+            db.executescript(drops + FILES_SCHEMA + self.schema)
+            db.execute(f"PRAGMA user_version = {self.version}")
+            db.commit()
+        return db
+
+    @property
+    def paths(self):
+        """Alle Pfade, die der Index kennt."""
+        return self._files.keys()
+
+    def fresh_digest(self, rel_path, st):
+        """
+        Liefert den gespeicherten Inhalts-Hash, wenn rel_path seit der
+        Aufnahme unverändert ist (gleiche Größe und mtime), sonst None.
+        Dateien, die während des damaligen Laufs geändert wurden, gelten als
+        unsicher.
+        """
+        entry = self._files.get(rel_path)
+        if entry is None or st is None:
+            return None
+        size, mtime_ns, checked_ns, digest = entry
+        if size != st.st_size or mtime_ns != st.st_mtime_ns or mtime_ns >= checked_ns:
+            return None
+        return digest
+
+    def _remember(self, rel_path, st, digest):
+        if st is None:
+            return
+        entry = (st.st_size, st.st_mtime_ns, self._started_ns, digest)
+        if self._files.get(rel_path) != entry:
+            self._files[rel_path] = entry
+            self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", (rel_path,) + entry)
+
+    def forget(self, rel_paths):
+        """Entfernt gelöschte Dateien aus dem Index."""
+        rel_paths = [p for p in rel_paths if p in self._files]
+        for rel_path in rel_paths:
+            del self._files[rel_path]
+        self._db.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in rel_paths])
+
+    def _collect_garbage(self):
+        pass
+
+    def save(self):
+        """Entfernt Daten ohne verweisende Datei und schreibt den Index."""
+        self._collect_garbage()
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,129 @@
+"""
+Zeit- und Mengenstatistik eines Collector-Laufs (--stats).
+
+Erfasst die Wandzeit je Phase (enumerate, read, decode, format, sink und
+ggf. closure/minify/outline), Dateien und Bytes je Startordner sowie die
+langsamsten und größten Dateien. Die Lesezeit wird pro Datei im Leser
+gemessen, bei parallelem Lesen also die Zeit des einzelnen Workers; die
+Phase "read" ist die Zeit, die der Collector auf Ergebnisse wartet.
+"""
+import json
+import time
+
+from .reader import format_size
+
+DEFAULT_TOP_FILES = 10
+# Feste Reihenfolge in der Ausgabe; weitere Phasen folgen in Erfassungsreihenfolge
+PHASE_ORDER = ("closure", "rank", "enumerate", "read", "decode", "minify", "outline", "format", "sink")
+
+
+class RunStats:
+    """
+    Sammelt die Messwerte eines Laufs.
+
+    Attributes:
+        phases (dict): Phasenname -> Sekunden.
+        files (list): (relativer Pfad, Bytes, Lesesekunden) je gelesener Datei.
+        roots (dict): Startordner -> [Dateien, Bytes].
+        top (int): Anzahl der langsamsten/größten Dateien im Bericht.
+    """
+
+    def __init__(self, top=DEFAULT_TOP_FILES):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.phases = {}
+        self.files = []
+        self.roots = {}
+        self.top = top
+        self._offer_seconds = 0.0
+        self._emit_during_offer = None
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def timed_iter(self, phase, iterable):
+        """Reicht iterable durch und bucht die Wartezeit auf jedes Element auf phase."""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(phase, time.perf_counter() - started)
+                return
+            self.add(phase, time.perf_counter() - started)
+            yield item
+
+    def add_offer(self, seconds):
+        """Zeit für die Übergabe an die Sinks (Formatieren plus Schreiben)."""
+        self._offer_seconds += seconds
+
+    def record_file(self, rel_path, root, size, read_seconds):
+        self.files.append((rel_path, size, read_seconds))
+        counts = self.roots.setdefault(root, [0, 0])
+        counts[0] += 1
+        counts[1] += size
+
+    def finish(self, sinks):
+        """
+        Teilt die Übergabezeit in "format" und "sink" auf. Der erste Aufruf
+        erfolgt am Ende des Sammelns; ein weiterer Aufruf nach dem Schließen
+        der Sinks zählt deren Schließzeit (z.B. Zwischenablage) mit.
+        """
+        emit_seconds = sum(getattr(sink, "emit_seconds", 0.0) for sink in sinks)
+        if self._emit_during_offer is None:
+            self._emit_during_offer = emit_seconds
+        self.phases["format"] = max(0.0, self._offer_seconds - self._emit_during_offer)
+        self.phases["sink"] = emit_seconds
+        self.finished = time.perf_counter()
+
+    def to_dict(self):
+        total = (self.finished or time.perf_counter()) - self.started
+        total_bytes = sum(size for _, size, _ in self.files)
+        order = [p for p in PHASE_ORDER if p in self.phases] + [p for p in self.phases if p not in PHASE_ORDER]
+        return {
+            "total_seconds": round(total, 6),
+            "phases": {p: round(self.phases[p], 6) for p in order},
+            "files": len(self.files),
+            "bytes": total_bytes,
+            "files_per_second": round(len(self.files) / total, 1) if total else None,
+            "bytes_per_second": round(total_bytes / total, 1) if total else None,
+            "roots": {root: {"files": c[0], "bytes": c[1]} for root, c in sorted(self.roots.items())},
+            "slowest": [
+                {"path": p, "read_seconds": round(t, 6), "bytes": s}
+                for p, s, t in sorted(self.files, key=lambda f: f[2], reverse=True)[:self.top]
+            ],
+            "largest": [
+                {"path": p, "bytes": s}
+                for p, s, _ in sorted(self.files, key=lambda f: f[1], reverse=True)[:self.top]
+            ],
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format_table(self):
+        data = self.to_dict()
+        total = data["total_seconds"]
+        lines = ["Statistik:", f"  {'Phase':<12} {'Zeit (s)':>10} {'Anteil':>8}"]
+        for phase, seconds in data["phases"].items():
+            share = f"{seconds / total * 100:.1f}%" if total else "-"
+            lines.append(f"  {phase:<12} {seconds:>10.4f} {share:>8}")
+        lines.append(f"  {'Gesamt':<12} {total:>10.4f}")
+        lines.append(
+            f"  {data['files']} Datei(en), {format_size(data['bytes'])}; "
+            f"{data['files_per_second'] or 0:.1f} Dateien/s, {format_size(int(data['bytes_per_second'] or 0))}/s"
+        )
+        if data["roots"]:
+            lines.append("Startordner:")
+            width = max(len(root) for root in data["roots"])
+            for root, counts in data["roots"].items():
+                lines.append(f"  {root:<{width}} {counts['files']:>7} Datei(en) {format_size(counts['bytes']):>12}")
+        if data["slowest"]:
+            lines.append(f"Langsamste Dateien (Lesen, Top {self.top}):")
+            for entry in data["slowest"]:
+                lines.append(f"  {entry['read_seconds']:>9.4f} s  {entry['path']}")
+            lines.append(f"Größte Dateien (Top {self.top}):")
+            for entry in data["largest"]:
+                lines.append(f"  {format_size(entry['bytes']):>12}  {entry['path']}")
+        return "\n".join(lines)
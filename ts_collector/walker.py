@@ -0,0 +1,248 @@
+"""
+Verzeichnis-Walker auf Basis von os.scandir.
+
+Schwere Ordner (node_modules, .next, dist, ...) werden bereits vor dem
+Abstieg verworfen, .gitignore-/.ignore-Regeln werden einmal pro Datei in
+reguläre Ausdrücke übersetzt und zwischengespeichert. Die DirEntry-Objekte
+werden an den Aufrufer weitergereicht, damit dieser den Stat-Cache von
+scandir nutzen kann, statt os.path.isfile o.ä. erneut aufzurufen.
+"""
+import os
+import re
+
+# --- Konfiguration ---
+# Ordnernamen, in die grundsätzlich nicht abgestiegen wird. Ein explizit
+# angegebener Startordner wird trotzdem durchsucht.
+DEFAULT_PRUNE_DIRS = frozenset({
+    ".git",
+    ".next",
+    ".turbo",
+    ".cache",
+    ".pnpm-store",
+    "__pycache__",
+    "build",
+    "coverage",
+    "dist",
+    "node_modules",
+    "out",
+})
+
+# Dateien, deren Regeln im jeweiligen Ordner (und darunter) gelten.
+IGNORE_FILE_NAMES = (".gitignore", ".ignore")
+# --- Ende der Konfiguration ---
+
+
+def _translate_glob(pattern):
+    """Übersetzt einen gitignore-Glob (ohne Anker/Negation) in einen Regex-String."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                # "**/" am Anfang oder in der Mitte: null oder mehr Ordner
+                if pattern.startswith("**/", i):
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def compile_ignore_rules(lines):
+    """
+    Übersetzt die Zeilen einer .gitignore-Datei in Regeln.
+
+    Args:
+        lines (iterable): Zeilen der Ignore-Datei.
+
+    Returns:
+        list: Tupel (compiled_regex, negated, dir_only) in Dateireihenfolge.
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip("\r")
+        if not line or line.startswith("#"):
+            continue
+        # Nicht maskierte Leerzeichen am Ende gehören nicht zum Muster
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        line = stripped
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # Ein Schrägstrich am Anfang oder in der Mitte verankert das Muster
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = _translate_glob(line)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        rules.append((re.compile(regex + r"\Z", re.DOTALL), negated, dir_only))
+    return rules
+
+
+class IgnoreMatcher:
+    """
+    Regeln einer einzelnen Ignore-Datei, bezogen auf deren Ordner.
+
+    Enthält die Datei keine Negationen, werden alle Muster zu je einem
+    kombinierten Regex für Dateien und Ordner zusammengefasst.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._combined = None
+        if rules and not any(negated for _, negated, _ in rules):
+            file_patterns = [r.pattern for r, _, dir_only in rules if not dir_only]
+            all_patterns = [r.pattern for r, _, _ in rules]
+            self._combined = (
+                re.compile("|".join(f"(?:{p})" for p in file_patterns), re.DOTALL) if file_patterns else None,
+                re.compile("|".join(f"(?:{p})" for p in all_patterns), re.DOTALL),
+            )
+
+    def match(self, rel_path, is_dir):
+        """
+        Prüft rel_path (relativ zum Ordner der Ignore-Datei).
+
+        Returns:
+            bool | None: True = ignoriert, False = explizit wieder aufgenommen,
+                None = keine Regel trifft zu.
+        """
+        if self._combined is not None:
+            regex = self._combined[1] if is_dir else self._combined[0]
+            return True if regex is not None and regex.match(rel_path) else None
+        decision = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                decision = not negated
+        return decision
+
+
+_matcher_cache = {}
+
+
+def load_ignore_matcher(abs_path):
+    """Liest und kompiliert eine Ignore-Datei; jede Datei wird nur einmal kompiliert."""
+    matcher = _matcher_cache.get(abs_path)
+    if matcher is None:
+        try:
+            with open(abs_path, "r", encoding="utf-8", errors="ignore") as f:
+                matcher = IgnoreMatcher(compile_ignore_rules(f))
+        except OSError:
+            matcher = IgnoreMatcher([])
+        _matcher_cache[abs_path] = matcher
+    return matcher
+
+
+def _is_ignored(matchers, rel_path, is_dir):
+    """Wertet alle aktiven Matcher aus; die tiefste zutreffende Regel gewinnt."""
+    ignored = False
+    for base_rel, matcher in matchers:
+        if base_rel == ".":
+            local = rel_path
+        else:
+            local = rel_path[len(base_rel) + 1:]
+        decision = matcher.match(local, is_dir)
+        if decision is not None:
+            ignored = decision
+    return ignored
+
+
+def _ancestor_matchers(base_path, rel_root):
+    """Sammelt die Ignore-Dateien vom Projekt-Root bis einschließlich rel_root."""
+    matchers = []
+    parts = [] if rel_root == "." else rel_root.split("/")
+    for depth in range(len(parts) + 1):
+        rel_dir = "/".join(parts[:depth]) or "."
+        for ignore_name in IGNORE_FILE_NAMES:
+            abs_ignore = os.path.join(base_path, rel_dir, ignore_name)
+            if os.path.isfile(abs_ignore):
+                matchers.append((rel_dir, load_ignore_matcher(abs_ignore)))
+    return matchers
+
+
+def walk_files(base_path, rel_root, prune_dirs=DEFAULT_PRUNE_DIRS, use_ignore_files=True, keep_dirs=()):
+    """
+    Durchläuft rel_root rekursiv und liefert alle regulären Dateien.
+
+    Die Reihenfolge entspricht os.walk (top-down) mit sortierten Namen:
+    zuerst die Dateien eines Ordners, danach dessen Unterordner.
+
+    Args:
+        base_path (str): Der Basispfad (Projekt-Root).
+        rel_root (str): Relativer, normalisierter Startordner (POSIX).
+        prune_dirs (iterable): Ordnernamen, die nicht betreten werden.
+        use_ignore_files (bool): .gitignore-/.ignore-Regeln berücksichtigen.
+        keep_dirs (iterable): Relative Ordner, die nie verworfen werden
+            (z.B. explizit konfigurierte Startordner und deren Elternordner).
+
+    Yields:
+        tuple: (relativer POSIX-Pfad, os.DirEntry)
+    """
+    prune_dirs = frozenset(prune_dirs or ())
+    keep_dirs = frozenset(keep_dirs)
+    root_matchers = _ancestor_matchers(base_path, rel_root) if use_ignore_files else []
+    stack = [(rel_root, root_matchers)]
+    while stack:
+        rel_dir, matchers = stack.pop()
+        abs_dir = base_path if rel_dir == "." else os.path.join(base_path, rel_dir)
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        if use_ignore_files and rel_dir != rel_root:
+            local = [e for e in entries if e.name in IGNORE_FILE_NAMES and e.is_file()]
+            if local:
+                matchers = matchers + [(rel_dir, load_ignore_matcher(e.path)) for e in local]
+
+        subdirs = []
+        for entry in entries:
+            rel_path = entry.name if rel_dir == "." else f"{rel_dir}/{entry.name}"
+            if entry.is_dir():
+                # Symlinks auf Ordner werden wie bei os.walk nicht betreten
+                if entry.is_symlink():
+                    continue
+                if rel_path not in keep_dirs:
+                    if entry.name in prune_dirs:
+                        continue
+                    if matchers and _is_ignored(matchers, rel_path, True):
+                        continue
+                subdirs.append((rel_path, matchers))
+            elif entry.is_file():
+                if matchers and _is_ignored(matchers, rel_path, False):
+                    continue
+                yield rel_path, entry
+        # Umgekehrt auf den Stack, damit die Ordner alphabetisch abgearbeitet werden
+        stack.extend(reversed(subdirs))
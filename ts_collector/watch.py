@@ -0,0 +1,237 @@
+"""
+Dateiüberwachung für den Watch-Modus (--watch).
+
+Unter Linux wird inotify direkt über die libc angesprochen (keine
+zusätzliche Abhängigkeit). Steht inotify nicht zur Verfügung, wird der
+Baum in kurzen Abständen per stat() abgefragt. Beide Varianten liefern
+relative Pfade der geänderten Dateien; Editoren, die beim Speichern
+mehrere Ereignisse erzeugen, werden über ein kurzes Ruhefenster
+zusammengefasst (debounce).
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# Ruhezeit nach dem letzten Ereignis, bevor neu gebündelt wird
+DEBOUNCE_SECONDS = 0.1
+# Spätestens nach dieser Zeit wird auch bei andauernden Ereignissen neu gebündelt
+MAX_DELAY_SECONDS = 0.5
+POLL_INTERVAL_SECONDS = 0.5
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0x00000800
+_IN_CLOEXEC = 0x00080000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def iter_dirs(base_path, rel_roots, prune_dirs=(), keep_dirs=()):
+    """Liefert die Startordner und alle Unterordner (relativ), ohne prune_dirs."""
+    prune_dirs = frozenset(prune_dirs or ())
+    stack = [root for root in reversed(rel_roots)]
+    while stack:
+        rel_dir = stack.pop()
+        yield rel_dir
+        try:
+            with os.scandir(os.path.join(base_path, rel_dir)) as it:
+                names = sorted(e.name for e in it if e.is_dir(follow_symlinks=False))
+        except OSError:
+            continue
+        for name in reversed(names):
+            child = name if rel_dir == "." else f"{rel_dir}/{name}"
+            if name in prune_dirs and child not in keep_dirs:
+                continue
+            stack.append(child)
+
+
+class InotifyWatcher:
+    """Rekursive Überwachung über Linux-inotify (ein Watch pro Ordner)."""
+
+    def __init__(self, base_path, rel_roots, prune_dirs=(), keep_dirs=()):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify ist nicht verfügbar")
+        self.base_path = base_path
+        self.rel_roots = list(rel_roots)
+        self.prune_dirs = prune_dirs
+        self.keep_dirs = keep_dirs
+        self._fd = -1
+        self._dirs = {}  # Watch-Deskriptor -> relativer Ordner
+        self._start()
+
+    def _start(self):
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1 fehlgeschlagen: {os.strerror(errno)}")
+        self._dirs = {}
+        for rel_dir in self.rel_roots:
+            self._add_tree(rel_dir)
+
+    def _add_tree(self, rel_root):
+        for rel_dir in iter_dirs(self.base_path, [rel_root], self.prune_dirs, self.keep_dirs):
+            path = os.fsencode(os.path.join(self.base_path, rel_dir))
+            wd = self._libc.inotify_add_watch(self._fd, path, _WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = rel_dir
+            elif rel_dir == rel_root and ctypes.get_errno() == 28:  # ENOSPC
+                raise OSError(28, "Zu viele inotify-Watches (fs.inotify.max_user_watches erhöhen)")
+
+    def restart(self):
+        """Baut alle Watches neu auf (nach Überlauf oder verschobenen Ordnern)."""
+        self.close()
+        self._start()
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def wait(self, timeout):
+        """
+        Wartet höchstens timeout Sekunden (None = unbegrenzt) auf Ereignisse.
+
+        Returns:
+            tuple: (Menge geänderter relativer Dateipfade, rescan). rescan ist
+                True, wenn einzelne Pfade nicht zuverlässig bekannt sind
+                (Ereignis-Überlauf, neue oder verschobene Ordner).
+        """
+        changed = set()
+        rescan = False
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed, rescan
+        try:
+            data = os.read(self._fd, 256 * 1024)
+        except BlockingIOError:
+            return changed, rescan
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            rel_dir = self._dirs.get(wd)
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if rel_dir is None or not name:
+                continue
+            rel_path = name if rel_dir == "." else f"{rel_dir}/{name}"
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._add_tree(rel_path)
+                rescan = True
+            else:
+                changed.add(rel_path)
+        return changed, rescan
+
+
+class PollingWatcher:
+    """Fallback ohne inotify: vergleicht Größe und mtime aller Dateien in festen Abständen."""
+
+    def __init__(self, base_path, rel_roots, prune_dirs=(), keep_dirs=(), interval=POLL_INTERVAL_SECONDS):
+        self.base_path = base_path
+        self.rel_roots = list(rel_roots)
+        self.prune_dirs = prune_dirs
+        self.keep_dirs = keep_dirs
+        self.interval = interval
+        self._next_scan = time.monotonic() + interval
+        self._state = self._scan()
+
+    def _scan(self):
+        state = {}
+        for rel_dir in iter_dirs(self.base_path, self.rel_roots, self.prune_dirs, self.keep_dirs):
+            try:
+                with os.scandir(os.path.join(self.base_path, rel_dir)) as it:
+                    for entry in it:
+                        if entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            rel_path = entry.name if rel_dir == "." else f"{rel_dir}/{entry.name}"
+                            state[rel_path] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                continue
+        return state
+
+    def restart(self):
+        self._state = self._scan()
+
+    def close(self):
+        pass
+
+    def wait(self, timeout):
+        """Wie InotifyWatcher.wait; Änderungen werden beim nächsten Abfragetakt erkannt."""
+        now = time.monotonic()
+        if timeout is not None and self._next_scan - now > timeout:
+            time.sleep(timeout)
+            return set(), False
+        time.sleep(max(0.0, self._next_scan - now))
+        self._next_scan = time.monotonic() + self.interval
+        state = self._scan()
+        changed = {p for p in state.keys() | self._state.keys() if state.get(p) != self._state.get(p)}
+        self._state = state
+        return changed, False
+
+
+def make_watcher(base_path, rel_roots, prune_dirs=(), keep_dirs=(), polling=False):
+    """
+    Erzeugt einen InotifyWatcher oder, falls inotify nicht nutzbar ist, einen PollingWatcher.
+
+    Returns:
+        tuple: (Watcher, Beschreibung für die Ausgabe)
+    """
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(base_path, rel_roots, prune_dirs, keep_dirs), "inotify"
+        except OSError as e:
+            print(f"WARNUNG: inotify nicht nutzbar ({e}), verwende Abfrage per stat().")
+    return PollingWatcher(base_path, rel_roots, prune_dirs, keep_dirs), "stat-Abfrage"
+
+
+def wait_for_changes(watcher, is_relevant, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+    """
+    Blockiert bis zur nächsten relevanten Änderung und fasst kurz aufeinander
+    folgende Ereignisse zusammen.
+
+    Args:
+        watcher: InotifyWatcher oder PollingWatcher.
+        is_relevant (callable): Filter für relative Dateipfade (z.B. nach Endung).
+
+    Returns:
+        tuple: (Menge geänderter relativer Pfade, rescan)
+    """
+    changed = set()
+    rescan = False
+    while not changed and not rescan:
+        paths, rescan = watcher.wait(None)
+        changed = {p for p in paths if is_relevant(p)}
+    deadline = time.monotonic() + max_delay
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        paths, more_rescan = watcher.wait(min(debounce, remaining))
+        paths = {p for p in paths if is_relevant(p)}
+        if not paths and not more_rescan:
+            break
+        changed |= paths
+        rescan = rescan or more_rescan
+    if rescan:
+        watcher.restart()
+    return changed, rescan
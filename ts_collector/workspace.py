@@ -0,0 +1,214 @@
+"""
+Pakete des pnpm-Workspaces als Profile (--workspace).
+
+Die Paketmuster kommen aus pnpm-workspace.yaml im Projekt-Root (Schlüssel
+"packages", z.B. 'apps/*'; Muster mit "!" schließen aus). Jeder Ordner mit
+package.json, auf den ein Muster passt, wird ein Paket. Seine Quellordner
+ergeben sich aus "include" der tsconfig.json des Pakets (z.B. "src/**/*" ->
+src); deckt ein Muster das ganze Paket ab ("**/*.ts") oder fehlt die
+tsconfig.json, gelten die üblichen Quellordner (src, app, lib, ...), die
+vorhanden sind.
+
+So bekommt eine neue App ihr Bundle, ohne dass profiles.py angepasst
+werden muss.
+"""
+import fnmatch
+import glob
+import json
+import os
+import re
+from dataclasses import dataclass
+
+from .imports import read_jsonc
+from .profiles import Profile
+from .walker import DEFAULT_PRUNE_DIRS
+
+WORKSPACE_FILE = "pnpm-workspace.yaml"
+WORKSPACE_EXTENSIONS = (".ts", ".tsx", ".css")
+# Übliche Quellordner, falls die tsconfig.json keine engeren Ordner nennt
+SOURCE_DIR_CANDIDATES = ("src", "app", "lib", "pages", "components")
+
+_COMMENT_RE = re.compile(r"(?:^|\s)#.*$")
+_GLOB_CHARS = frozenset("*?[{")
+
+
+class WorkspaceError(Exception):
+    """pnpm-workspace.yaml fehlt oder enthält keine Pakete."""
+
+
+@dataclass(frozen=True)
+class WorkspacePackage:
+    """
+    Ein Paket des Workspaces.
+
+    Attributes:
+        name (str): Name aus package.json (sonst der Ordnername).
+        directory (str): Relativer Paketordner, z.B. "apps/backend".
+        source_dirs (tuple): Relative Quellordner, z.B. ("apps/backend/src",).
+    """
+    name: str
+    directory: str
+    source_dirs: tuple
+
+    def profile_name(self):
+        """Name als Profil und Dateiname: "@scope/ui" -> "scope-ui"."""
+        return self.name.lstrip("@").replace("/", "-")
+
+
+def _unquote(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def read_workspace_patterns(base_path):
+    """
+    Liest die Paketmuster aus pnpm-workspace.yaml.
+
+    Ausgewertet wird nur der Schlüssel "packages" in Block- oder
+    Inline-Listenform; andere Schlüssel (catalog, onlyBuiltDependencies, ...)
+    werden übersprungen.
+
+    Returns:
+        list | None: Die Muster in Dateireihenfolge, None ohne pnpm-workspace.yaml.
+    """
+    try:
+        with open(os.path.join(base_path, WORKSPACE_FILE), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return None
+    patterns = []
+    in_packages = False
+    for line in lines:
+        line = _COMMENT_RE.sub("", line).rstrip()
+        if not line.strip():
+            continue
+        if not line[0].isspace() and not line.startswith("-"):
+            key, _, rest = line.partition(":")
+            in_packages = key.strip() == "packages"
+            rest = rest.strip()
+            if in_packages and rest.startswith("["):
+                patterns.extend(_unquote(item) for item in rest.strip("[]").split(",") if item.strip())
+            continue
+        item = line.strip()
+        if in_packages and item.startswith("-"):
+            patterns.append(_unquote(item[1:]))
+    return patterns
+
+
+def _static_prefix(pattern):
+    """Ordnerteil eines Glob-Musters vor dem ersten Platzhalter ("src/**/*" -> "src")."""
+    parts = []
+    for part in pattern.replace("\\", "/").split("/"):
+        if part in ("", "."):
+            continue
+        if _GLOB_CHARS & set(part):
+            return "/".join(parts), True
+        parts.append(part)
+    return "/".join(parts), False
+
+
+def package_source_dirs(base_path, package_dir):
+    """
+    Bestimmt die Quellordner eines Pakets (relativ zum Projekt-Root).
+
+    Returns:
+        tuple: Relative Ordner; der Paketordner selbst, wenn nichts Engeres passt.
+    """
+    abs_package = os.path.join(base_path, package_dir)
+    try:
+        include = read_jsonc(os.path.join(abs_package, "tsconfig.json")).get("include") or []
+    except (OSError, ValueError, AttributeError):
+        include = []
+
+    dirs = []
+    whole_package = not include
+    for pattern in include:
+        prefix, has_glob = _static_prefix(pattern)
+        if not prefix:
+            whole_package = whole_package or has_glob
+            continue
+        if not has_glob and not os.path.isdir(os.path.join(abs_package, prefix)):
+            continue  # einzelne Datei wie next-env.d.ts
+        if prefix.split("/")[0] in DEFAULT_PRUNE_DIRS:
+            continue  # Build-Ausgaben wie .next/types
+        if os.path.isdir(os.path.join(abs_package, prefix)) and prefix not in dirs:
+            dirs.append(prefix)
+    if whole_package:
+        dirs = [d for d in SOURCE_DIR_CANDIDATES if os.path.isdir(os.path.join(abs_package, d))] + [
+            d for d in dirs if d.split("/")[0] not in SOURCE_DIR_CANDIDATES
+        ]
+    if not dirs:
+        return (package_dir,)
+    return tuple(f"{package_dir}/{d}" for d in dirs)
+
+
+def discover_packages(base_path):
+    """
+    Findet alle Pakete des Workspaces, sortiert nach Ordner.
+
+    Raises:
+        WorkspaceError: Ohne pnpm-workspace.yaml oder wenn kein Paket passt.
+    """
+    patterns = read_workspace_patterns(base_path)
+    if patterns is None:
+        raise WorkspaceError(f"{WORKSPACE_FILE} nicht gefunden in {base_path}.")
+    include = [p for p in patterns if not p.startswith("!")]
+    exclude = [p[1:].rstrip("/") for p in patterns if p.startswith("!")]
+
+    package_dirs = set()
+    for pattern in include:
+        manifests = glob.glob(os.path.join(glob.escape(base_path), pattern, "package.json"), recursive=True)
+        for manifest in manifests:
+            rel_dir = os.path.relpath(os.path.dirname(manifest), base_path).replace(os.sep, "/")
+            if rel_dir == "." or "node_modules" in rel_dir.split("/"):
+                continue  # Das Root-Paket ist kein eigenes Bundle
+            if any(fnmatch.fnmatchcase(rel_dir, e) for e in exclude):
+                continue
+            package_dirs.add(rel_dir)
+
+    packages = []
+    for rel_dir in sorted(package_dirs):
+        try:
+            with open(os.path.join(base_path, rel_dir, "package.json"), "r", encoding="utf-8") as f:
+                name = json.load(f).get("name")
+        except (OSError, ValueError, AttributeError):
+            name = None
+        name = name or rel_dir.rsplit("/", 1)[-1]
+        packages.append(WorkspacePackage(name, rel_dir, package_source_dirs(base_path, rel_dir)))
+    if not packages:
+        raise WorkspaceError(f"Keine Pakete in {WORKSPACE_FILE} gefunden (Muster: {', '.join(patterns) or '-'}).")
+    return packages
+
+
+def workspace_profiles(base_path, names=None):
+    """
+    Ein Profil pro Paket (Endungen wie die Quellprofile in profiles.py).
+
+    Args:
+        names (list): Optional nur diese Pakete (Paket- oder Profilname).
+
+    Raises:
+        WorkspaceError: Siehe discover_packages; auch bei unbekannten Namen.
+    """
+    packages = discover_packages(base_path)
+    profiles = {}
+    for package in packages:
+        profile_name = package.profile_name()
+        if profile_name in profiles:
+            profile_name = package.directory.replace("/", "-")
+        profiles[profile_name] = (package, Profile(
+            name=profile_name,
+            directories=package.source_dirs,
+            extensions=WORKSPACE_EXTENSIONS,
+            encoding_errors="ignore",
+        ))
+    if not names:
+        return [profile for _, profile in profiles.values()]
+    by_name = {package.name: profile for package, profile in profiles.values()}
+    by_name.update({name: profile for name, (_, profile) in profiles.items()})
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise WorkspaceError(f"Unbekanntes Paket: {unknown[0]} (verfügbar: {', '.join(profiles)})")
+    return list({by_name[name].name: by_name[name] for name in names}.values())